@@ -0,0 +1,291 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Squeezebox Controller © Autolog 2023
+#
+
+# noinspection PyUnresolvedReferences
+# ============================== Native Imports ===============================
+import asyncio
+import collections
+import queue
+import sys
+import threading
+import traceback
+
+# ============================== Custom Imports ===============================
+try:
+    import indigo  # noqa
+except ImportError:
+    pass
+
+# ============================== Plugin Imports ===============================
+from cliEvents import CliEvent, cli_events
+from constants import *
+from heartbeat import Heartbeat, HEARTBEAT_PROBE, PROBE_COMMAND, PROBE_REPLY_PREFIX, tune_socket
+from lineFraming import LineFramer
+from reconnectBackoff import ReconnectBackoff
+
+REPLY_TIMEOUT = 20.0  # Seconds to wait for a reply to a command in flight (as the communicate thread socket timeout)
+LISTEN_TIMEOUT = 5.0  # Seconds to wait for a notification before checking the heartbeat (as the listen thread socket timeout)
+
+
+# noinspection PyUnresolvedReferences,PyPep8Naming
+class AsyncTransportEngine(threading.Thread):
+
+    # This class runs the command and listen connections of every Squeezebox server on a single asyncio event loop.
+    # It is the alternative to starting a ThreadCommunicateWithServer and a ThreadListenToServer per server: the thread
+    # count stays constant however many servers are defined. The interface to the rest of the plugin is unchanged,
+    # commands are taken from the per-server "command to send" queue and replies / notifications are put on the
+    # common "returned response" queue.
+
+    def __init__(self, plugin_globals):
+
+        threading.Thread.__init__(self)
+
+        self.globals = plugin_globals
+
+        self.name = "Squeezebox Async Transport"
+        self.daemon = True
+
+        self.asyncTransportLogger = logging.getLogger("Plugin.squeezeboxAsyncTransport")
+
+        self.loop = None
+        self.loop_ready = threading.Event()
+        self.server_tasks = dict()  # server dev_id -> [communicate task, listen task]
+
+    def exception_handler(self, exception_error_message, log_failing_statement):
+        filename, line_number, method, statement = traceback.extract_tb(sys.exc_info()[2])[-1]
+        module = filename.split("/")
+        log_message = f"'{exception_error_message}' in module '{module[-1]}', method '{method}'"
+        if log_failing_statement:
+            log_message = f"{log_message}\n   Failing statement [line {line_number}]: '{statement}'"
+        else:
+            log_message = f"{log_message} at line {line_number}"
+        self.asyncTransportLogger.error(log_message)
+
+    def run(self):
+        try:
+            self.loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self.loop)
+            self.loop_ready.set()
+            self.loop.run_forever()
+
+            # Loop stopped: cancel any remaining server connections and let them close
+            pending_tasks = asyncio.all_tasks(self.loop)
+            for pending_task in pending_tasks:
+                pending_task.cancel()
+            self.loop.run_until_complete(asyncio.gather(*pending_tasks, return_exceptions=True))
+            self.loop.close()
+
+        except Exception as exception_error:
+            self.exception_handler(exception_error, True)  # Log error and display failing statement
+
+    # The following methods are called from plugin threads and hand the work over to the event loop
+
+    def start_server(self, dev_id):
+        self.loop_ready.wait()
+        self.loop.call_soon_threadsafe(self._start_server, dev_id)
+
+    def stop_server(self, dev_id):
+        self.loop_ready.wait()
+        self.loop.call_soon_threadsafe(self._stop_server, dev_id)
+
+    def stop(self):
+        self.loop_ready.wait()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+    # The following methods run on the event loop
+
+    def _start_server(self, dev_id):
+        try:
+            self._stop_server(dev_id)  # In case of a restart
+
+            # Wake the communicate task whenever a command is queued for this server
+            commands_queued = asyncio.Event()
+            self.globals[QUEUES][COMMAND_TO_SEND][dev_id].put_callback = lambda: self.loop.call_soon_threadsafe(commands_queued.set)
+
+            self.server_tasks[dev_id] = [self.loop.create_task(self._supervise(dev_id, "commands", self._communicate, commands_queued)),
+                                         self.loop.create_task(self._supervise(dev_id, "listen", self._listen))]
+
+        except Exception as exception_error:
+            self.exception_handler(exception_error, True)  # Log error and display failing statement
+
+    def _stop_server(self, dev_id):
+        try:
+            for server_task in self.server_tasks.pop(dev_id, list()):
+                server_task.cancel()
+
+        except Exception as exception_error:
+            self.exception_handler(exception_error, True)  # Log error and display failing statement
+
+    async def _supervise(self, dev_id, connection_name, connection_coroutine, *args):
+        # As the communicate and listen threads: the connection is re-established after it is lost (with an increasing,
+        # randomised delay between attempts) until the server device is stopped
+        reconnect_backoff = ReconnectBackoff()
+        reconnecting = False
+        while self._keep_alive(dev_id):
+            await connection_coroutine(dev_id, reconnect_backoff, reconnecting, *args)
+            if not self._keep_alive(dev_id):
+                break
+            self._server_connection_lost(dev_id, connection_name)
+            reconnect_delay = reconnect_backoff.next_delay()
+            self.asyncTransportLogger.warning(f"Async transport will attempt to reconnect {connection_name} to Server [{indigo.devices[dev_id].name}] in {reconnect_delay:.1f} seconds")
+            await asyncio.sleep(reconnect_delay)
+            reconnecting = True
+
+    async def _communicate(self, dev_id, reconnect_backoff, reconnecting, commands_queued):
+        host = self.globals[SERVERS][dev_id][IP_ADDRESS]
+        port = self.globals[SERVERS][dev_id][PORT]
+        name = indigo.devices[dev_id].name
+        writer = None
+        in_flight = collections.deque()  # Each entry is (command, future to resolve with its reply or None)
+        try:
+            self.asyncTransportLogger.info(f"Async transport connecting commands for {name}: Host=[{host}], Port=[{port}]")
+            reader, writer = await asyncio.open_connection(host, int(port))
+            tune_socket(writer.get_extra_info("socket"))
+            self.asyncTransportLogger.info(f"Async transport commands initialised for {name}: Host=[{host}], Port=[{port}]")
+
+            if reconnecting and self.globals[SERVER_CONNECTIONS].restored(dev_id, "commands"):
+                self.globals[QUEUES][RETURNED_RESPONSE].put([dev_id, SERVER_RECONNECTED, ""])  # All connections are back: plugin resyncs the players
+
+            # As the communicate thread: up to 'pipeline_window' commands are written before waiting for replies,
+            # and each reply is matched to the oldest command still in flight.
+            pipeline_window = self.globals[SERVERS][dev_id][PIPELINE_WINDOW]
+            command_queue = self.globals[QUEUES][COMMAND_TO_SEND][dev_id]
+            reply_framer = LineFramer()
+            heartbeat = Heartbeat()  # As the communicate thread: an idle connection is probed
+
+            while self._keep_alive(dev_id):
+                send_messages = list()
+                while len(in_flight) + len(send_messages) < pipeline_window:
+                    if len(in_flight) + len(send_messages) == 0:
+                        commands_queued.clear()  # Cleared before checking so a put from here on is not missed
+                    try:
+                        send_message = command_queue.get_nowait()
+                    except queue.Empty:
+                        if len(in_flight) + len(send_messages) == 0:
+                            try:
+                                await asyncio.wait_for(commands_queued.wait(), heartbeat.seconds_until_probe())
+                            except asyncio.TimeoutError:
+                                if heartbeat.probe_due():
+                                    send_messages.append((PROBE_COMMAND, HEARTBEAT_PROBE))
+                                    heartbeat.probe_sent()
+                                    break
+                            continue
+                        break
+                    send_future = None
+                    if isinstance(send_message, list):
+                        if len(send_message) > 1:
+                            send_future = send_message[1]  # Queued by send_command
+                            if send_future.done():
+                                continue  # Timed out or cancelled before being sent
+                        send_message = send_message[0]
+                    send_messages.append((send_message, send_future))
+
+                if len(send_messages) > 0:
+                    writer.write(bytes("".join(f"{send_message}\n" for send_message, send_future in send_messages), "utf-8"))
+                    await writer.drain()
+                    in_flight.extend(send_messages)
+
+                # Wait for at least one complete reply, then dispatch every complete reply already received
+                response_lines = reply_framer.complete_lines()
+                while len(response_lines) == 0:
+                    data = await asyncio.wait_for(reader.read(reply_framer.receive_size), REPLY_TIMEOUT)
+                    if not data:
+                        raise ConnectionError("Connection closed by Squeezebox server")
+                    reply_framer.feed(data)
+                    response_lines = reply_framer.complete_lines()
+                heartbeat.activity()
+                for response_line in response_lines:
+                    reply_future = None
+                    if len(in_flight) > 0:
+                        reply_future = in_flight.popleft()[1]
+                    if reply_future is HEARTBEAT_PROBE:
+                        round_trip_time = heartbeat.probe_replied()
+                        self.asyncTransportLogger.debug(f"Async transport heartbeat for Server [{name}]: round trip {round_trip_time * 1000:.1f} ms (smoothed {heartbeat.round_trip_time * 1000:.1f} ms)")
+                        continue
+                    self.globals[QUEUES][RETURNED_RESPONSE].put([dev_id, REPLY_TO_SEND, CliEvent(response_line.strip()), reply_future])
+                reconnect_backoff.reset()  # Connection is working
+
+        except asyncio.CancelledError:
+            raise
+        except asyncio.TimeoutError:
+            self.asyncTransportLogger.error(f"Async transport detected Server [{name}] has timed out.")
+        except (ConnectionError, OSError) as exception_error:
+            self.asyncTransportLogger.error(f"Async transport detected Server [{name}] has disconnected: {exception_error}")
+        except Exception as exception_error:
+            self.exception_handler(exception_error, True)  # Log error and display failing statement
+        finally:
+            if writer is not None:
+                writer.close()
+            # Replies to commands still in flight will never arrive: fail any futures waiting for them
+            for send_message, send_future in in_flight:
+                if send_future is not None:
+                    self.globals[QUEUES][RETURNED_RESPONSE].put([dev_id, COMMAND_FAILED, f"Connection to Server [{name}] lost before reply to '{send_message}'", send_future])
+
+    async def _listen(self, dev_id, reconnect_backoff, reconnecting):
+        host = self.globals[SERVERS][dev_id][IP_ADDRESS]
+        port = self.globals[SERVERS][dev_id][PORT]
+        name = indigo.devices[dev_id].name
+        writer = None
+        try:
+            reader, writer = await asyncio.open_connection(host, int(port))
+            tune_socket(writer.get_extra_info("socket"))
+            writer.write(bytes(self.globals[SERVERS][dev_id][LISTEN_COMMAND] + "\n", "utf-8"))  # (Re-)subscribe to notifications: "listen 1" or "subscribe ..."
+            await writer.drain()
+
+            if reconnecting and self.globals[SERVER_CONNECTIONS].restored(dev_id, "listen"):
+                self.globals[QUEUES][RETURNED_RESPONSE].put([dev_id, SERVER_RECONNECTED, ""])  # All connections are back (notifications were missed): plugin resyncs the players
+
+            listen_framer = LineFramer()
+            heartbeat = Heartbeat()  # As the listen thread: a quiet connection is probed
+            while self._keep_alive(dev_id):
+                try:
+                    data = await asyncio.wait_for(reader.read(listen_framer.receive_size), LISTEN_TIMEOUT)
+                except asyncio.TimeoutError:
+                    if heartbeat.probe_overdue():
+                        raise ConnectionError(f"No reply to heartbeat within {heartbeat.probe_timeout:.0f} seconds")
+                    if heartbeat.probe_due():
+                        writer.write(bytes(PROBE_COMMAND + "\n", "utf-8"))
+                        await writer.drain()
+                        heartbeat.probe_sent()
+                    continue
+                if not data:
+                    raise ConnectionError("Connection closed by Squeezebox server")
+                listen_framer.feed(data)
+                reconnect_backoff.reset()  # Connection is working
+                heartbeat.activity()
+                for event in cli_events(self._notification_lines(listen_framer.complete_lines(), heartbeat)):
+                    self.globals[QUEUES][RETURNED_RESPONSE].put([dev_id, LISTEN_NOTIFICATION, event])
+
+        except asyncio.CancelledError:
+            raise
+        except (ConnectionError, OSError) as exception_error:
+            self.asyncTransportLogger.error(f"Async transport listen detected Server [{name}] has disconnected: {exception_error}")
+        except Exception as exception_error:
+            self.exception_handler(exception_error, True)  # Log error and display failing statement
+        finally:
+            if writer is not None:
+                writer.close()
+
+    @staticmethod
+    def _notification_lines(lines, heartbeat):
+        for line in lines:
+            if heartbeat.probe_outstanding() and line.startswith(PROBE_REPLY_PREFIX):
+                heartbeat.probe_replied()  # Heartbeat probe reply: not a notification
+                continue
+            yield line
+
+    def _keep_alive(self, dev_id):
+        server = self.globals[SERVERS].get(dev_id)  # Server device may have been stopped while awaiting
+        return server is not None and server[KEEP_THREAD_ALIVE]
+
+    def _server_connection_lost(self, dev_id, connection_name):
+        try:
+            # As the communicate and listen threads: only the first of the server's connections to be lost posts it
+            if self.globals[SERVER_CONNECTIONS].lost(dev_id, connection_name):
+                self.globals[QUEUES][RETURNED_RESPONSE].put([dev_id, SERVER_CONNECTION_LOST, ""])
+
+        except Exception as exception_error:
+            self.exception_handler(exception_error, True)  # Log error and display failing statement
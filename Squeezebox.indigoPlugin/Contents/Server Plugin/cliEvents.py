@@ -0,0 +1,73 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Squeezebox Controller © Autolog 2023
+#
+
+# noinspection PyUnresolvedReferences
+# ============================== Native Imports ===============================
+from urllib.parse import unquote
+
+# ============================== Plugin Imports ===============================
+from taggedResponse import TaggedResponse
+
+# Command families whose second word is a sub-command e.g. "mixer volume 40", "playlist newsong Title 3", "player id 0 ?"
+SUB_COMMAND_FAMILIES = frozenset(("button", "client", "mixer", "player", "playerpref", "playlist", "prefset"))
+
+PLAYER_EVENT = "player"  # Line starts with a player MAC address e.g. "00%3A04%3A20%3Aaa%3Abb%3Acc mode play"
+SERVER_EVENT = "server"  # e.g. "serverstatus ...", "syncgroups ...", "players ..."
+
+
+# noinspection PyPep8Naming
+class CliEvent:
+
+    # This class is a line received from the Squeezebox server CLI (a reply or a notification), tokenized once by the
+    # thread / task that received it so runConcurrentThread and the handlers don't split or unquote it again.
+    # The line is split on spaces and each item is unquoted exactly once; everything else is derived from those fields.
+    #   line   - the line as received (items still quoted) e.g. "00%3A04%3A20%3Aaa%3Abb%3Acc mixer volume 40"
+    #   fields - the unquoted items e.g. ("00:04:20:aa:bb:cc", "mixer", "volume", "40")
+    #   kind   - PLAYER_EVENT or SERVER_EVENT
+    #   mac    - the player MAC address for a player event, otherwise ""
+    #   path   - the command (and sub-command) e.g. ("mixer", "volume"), ("power",), ("serverstatus",)
+    #   args   - the unquoted items following the path e.g. ("40",)
+    #   tagged - read-only mapping of the "key:value" args, parsed lazily on first use; the first occurrence of a repeated
+    #            key wins (for replies made of records e.g. players, tracks use TaggedResponse(args, record_key))
+    #   text   - the line unquoted; words is text split on whitespace (as the handlers index it)
+    # Events are immutable: they can be shared between the coalescer, the session recorder and the handlers.
+
+    __slots__ = ("line", "fields", "kind", "mac", "path", "args", "tagged", "text", "words")
+
+    def __init__(self, line):
+        fields = tuple([unquote(item) for item in line.split(" ")])
+        if fields[0][2:3] == ":":  # i.e. the line is something like "00:04:20:aa:bb:cc mode play" and is for a Player
+            kind, mac, offset = PLAYER_EVENT, fields[0], 1
+        else:
+            kind, mac, offset = SERVER_EVENT, "", 0
+        path_length = 2 if len(fields) > offset + 1 and fields[offset] in SUB_COMMAND_FAMILIES else 1
+        args = fields[offset + path_length:]
+
+        text = " ".join(fields)
+        for name, value in (("line", line), ("fields", fields), ("kind", kind), ("mac", mac),
+                            ("path", fields[offset:offset + path_length]), ("args", args),
+                            ("tagged", TaggedResponse(args)), ("text", text), ("words", tuple(text.split()))):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"CliEvent is immutable: can't set '{name}'")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"CliEvent is immutable: can't delete '{name}'")
+
+    def __reduce__(self):
+        return CliEvent, (self.line,)  # Pickled (e.g. spilled by BoundedResponseQueue) as the line and re-parsed when loaded
+
+    def __repr__(self):
+        return f"CliEvent(kind={self.kind!r}, mac={self.mac!r}, path={self.path!r}, args={self.args!r})"
+
+
+def cli_events(lines):
+    # Generator stage: turns an iterable of received lines into CliEvents (empty lines are skipped)
+    for line in lines:
+        line = line.strip()
+        if line != "":
+            yield CliEvent(line)
@@ -0,0 +1,115 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Squeezebox Controller © Autolog 2023
+#
+
+# noinspection PyUnresolvedReferences
+# ============================== Native Imports ===============================
+import concurrent.futures
+import heapq
+import itertools
+import threading
+import time
+
+
+class CommandTimeoutError(TimeoutError):
+    pass
+
+
+class CommandConnectionError(ConnectionError):
+    pass
+
+
+# noinspection PyPep8Naming
+class CommandFutures:
+
+    # This class correlates CLI commands with their replies using concurrent.futures.Future objects.
+    #   - send_command queues [command, future] on the server's "command to send" queue.
+    #   - The communicate thread / asyncio engine keeps the future with the command while it is in flight and passes it on
+    #     with the reply (or the loss of the connection) through the "returned response" queue.
+    #   - runConcurrentThread resolves the future after the reply has been handled, so done callbacks run on that thread
+    #     in order with all other server responses and can safely update plugin state or queue further commands.
+    # A command sent with a timeout fails with CommandTimeoutError if its reply hasn't arrived in time (checked by expire).
+    # Never wait on a future (e.g. future.result() or wait_all) from runConcurrentThread: add a done callback instead.
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.deadlines = list()  # heap of (deadline, sequence, future)
+        self.sequence = itertools.count()
+
+    def send_command(self, command_queue, command, timeout=None, interactive=False):
+        future = concurrent.futures.Future()
+        future.command = command
+        if timeout is not None:
+            with self.lock:
+                heapq.heappush(self.deadlines, (time.monotonic() + timeout, next(self.sequence), future))
+        command_queue.put([command, future], interactive=interactive)
+        return future
+
+    def expire(self):
+        # Fail the futures whose deadline has passed; returns seconds until the next deadline (None if there is none)
+        now = time.monotonic()
+        expired_futures = list()
+        with self.lock:
+            while len(self.deadlines) > 0 and (self.deadlines[0][0] <= now or self.deadlines[0][2].done()):
+                deadline, sequence, future = heapq.heappop(self.deadlines)
+                if not future.done():
+                    expired_futures.append(future)
+            next_deadline = self.deadlines[0][0] - now if len(self.deadlines) > 0 else None
+        for future in expired_futures:
+            self.set_exception(future, CommandTimeoutError(f"No reply to '{future.command}'"))
+        return next_deadline
+
+    @staticmethod
+    def set_result(future, reply):
+        try:
+            future.set_result(reply)
+        except concurrent.futures.InvalidStateError:
+            pass  # Already timed out or cancelled
+
+    @staticmethod
+    def set_exception(future, exception):
+        try:
+            future.set_exception(exception)
+        except concurrent.futures.InvalidStateError:
+            pass  # Already resolved, timed out or cancelled
+
+
+def gather(futures):
+    # Return a future resolved with the list of replies (in order) once every future is done,
+    # or with the first exception. Callbacks on it run in the thread that resolved the last future.
+    gathered = concurrent.futures.Future()
+    futures = list(futures)
+    if len(futures) == 0:
+        gathered.set_result(list())
+        return gathered
+
+    remaining = [len(futures)]
+    remaining_lock = threading.Lock()
+
+    def one_done(_future):
+        with remaining_lock:
+            remaining[0] -= 1
+            if remaining[0] > 0:
+                return
+        for future in futures:
+            if future.cancelled():
+                gathered.set_exception(concurrent.futures.CancelledError(f"'{future.command}' cancelled"))
+                return
+            if future.exception() is not None:
+                gathered.set_exception(future.exception())
+                return
+        gathered.set_result([future.result() for future in futures])
+
+    for future in futures:
+        future.add_done_callback(one_done)
+    return gathered
+
+
+def wait_all(futures, timeout=None):
+    # Blocking form of gather for use from threads other than runConcurrentThread
+    try:
+        return gather(futures).result(timeout)
+    except concurrent.futures.TimeoutError:
+        raise CommandTimeoutError(f"Replies not received within {timeout} seconds")
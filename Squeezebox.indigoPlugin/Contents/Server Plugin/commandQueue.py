@@ -0,0 +1,238 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Squeezebox Controller © Autolog 2023
+#
+
+# noinspection PyUnresolvedReferences
+# ============================== Native Imports ===============================
+import collections
+import queue
+import re
+import threading
+import time
+
+# A player command starts with the player's MAC address e.g. "00:04:20:aa:bb:cc mode ?"; anything else is a server command
+PLAYER_COMMAND = re.compile(r"^([0-9a-fA-F]{2}(?::[0-9a-fA-F]{2}){5}) ")
+
+# Absolute setters: a newer one for the same player and key makes an older pending one redundant
+# e.g. "00:04:20:aa:bb:cc mixer volume 40", "00:04:20:aa:bb:cc power 1"
+SUPERSEDABLE_SETTER = re.compile(r"^(\S+) (power|mixer volume|mixer muting|playlist repeat|playlist shuffle|playerpref maintainSync) ([0-9]+)$")
+
+SERVER_LANE = ""
+
+
+# noinspection PyPep8Naming
+class CoalescingCommandQueue:
+
+    # This class replaces a plain queue.Queue as the per-server "command to send" queue (same put / get interface).
+    #   - A query (e.g. "syncgroups ?", "<mac> mode ?", "<mac> status - 1 tags:...") identical to one already pending is not queued again,
+    #     unless a command that may change the player's state (e.g. "<mac> pause") has been queued for that player since.
+    #   - An absolute setter (e.g. "<mac> mixer volume 40") supersedes an older pending setter for the same player and key.
+    #   - An "autolog..." step command is a barrier: commands queued before it are never merged with commands queued after it,
+    #     so the multi-step announcement flows still see every reply they rely on before their next step.
+    #   - Commands are held in one lane per player (plus one for server commands) and the lanes are drained round-robin,
+    #     so a burst for one player (e.g. a sync group refresh) cannot hold up another player's commands. A player's commands
+    #     are sent in the order queued; a server command (e.g. "syncgroups ?") is only sent once every player command queued
+    #     before it has been sent.
+    #   - A command queued with a future to resolve ([command, future], see commandFutures.py) is never coalesced or superseded.
+    #   - Commands put with interactive=True (user actions) have their lane served first, up to and including the command,
+    #     so they overtake other players' background commands but not commands queued before them for the same player.
+    #   - A barrier is only sent once every command queued before it has been sent, and commands queued after it wait for it.
+
+    def __init__(self):
+        self.mutex = threading.Lock()
+        self.not_empty = threading.Condition(self.mutex)
+        self.interactive_entries = collections.deque()  # Entries put with interactive=True, in the order queued
+        self.lanes = collections.OrderedDict()  # lane key (player mac or SERVER_LANE) -> deque of entries, in round-robin order
+        self.barriers = collections.deque()
+        self.sequence = 0
+        self.live_count = 0
+        self.pending_queries = dict()  # command -> entry
+        self.pending_setters = dict()  # (player mac, setter key) -> entry
+        self.coalesced_count = 0
+        self.superseded_count = 0
+        self.put_callback = None  # Optionally set by a consumer that cannot block in get() e.g. the asyncio transport engine
+        self.woken = False
+
+    @staticmethod
+    def command_of(item):
+        if isinstance(item, list):
+            return item[0]
+        return item
+
+    @staticmethod
+    def lane_of(command):
+        if isinstance(command, str):
+            player_command = PLAYER_COMMAND.match(command)
+            if player_command is not None:
+                return player_command.group(1)
+        return SERVER_LANE
+
+    @staticmethod
+    def is_query(command):
+        return command.endswith(" ?") or command.startswith("serverstatus ") or " status - 1 tags:" in command
+
+    def put(self, item, block=True, timeout=None, interactive=False):  # block and timeout retained for queue.Queue compatibility
+        with self.mutex:
+            command = self.command_of(item)
+            if isinstance(command, str):
+                if not self.is_query(command):
+                    self._forget_player_queries(command)
+                if " autolog" in command:
+                    self.pending_queries.clear()
+                    self.pending_setters.clear()
+                    entry = self._new_entry(item)
+                    self.barriers.append(entry)
+                    self._add_live()
+                    return
+                elif isinstance(item, list) and len(item) > 1:
+                    pass  # [command, future]: the caller is waiting for this command's own reply, so it is never merged
+                elif self.is_query(command):
+                    if command in self.pending_queries:
+                        self.coalesced_count += 1
+                        return
+                    entry = self._new_entry(item)
+                    self.pending_queries[command] = entry
+                    self._append(entry, command, interactive)
+                    return
+                else:
+                    setter = SUPERSEDABLE_SETTER.match(command)
+                    if setter is not None:
+                        setter_key = (setter.group(1), setter.group(2))
+                        superseded_entry = self.pending_setters.get(setter_key)
+                        if superseded_entry is not None:
+                            superseded_entry[1] = False
+                            self.live_count -= 1
+                            self.superseded_count += 1
+                        entry = self._new_entry(item)
+                        self.pending_setters[setter_key] = entry
+                        self._append(entry, command, interactive)
+                        return
+            self._append(self._new_entry(item), command, interactive)
+
+    def _forget_player_queries(self, command):
+        # A (possibly) state changing player command: a query for the player queued after it must be sent again rather than
+        # merged with one queued before it, whose reply would report the state from before the change.
+        # The pending queries are still sent; they just can't be merged with any longer.
+        lane_key = self.lane_of(command)
+        if lane_key != SERVER_LANE:
+            for query in [query for query in self.pending_queries if self.lane_of(query) == lane_key]:
+                del self.pending_queries[query]
+
+    def _new_entry(self, item):
+        self.sequence += 1
+        return [item, True, self.sequence]  # Each entry is [item, is_live, sequence]
+
+    def _append(self, entry, command, interactive):
+        lane_key = self.lane_of(command)
+        lane = self.lanes.get(lane_key)
+        if lane is None:
+            lane = self.lanes[lane_key] = collections.deque()
+        lane.append(entry)
+        if interactive:
+            self.interactive_entries.append(entry)
+        self._add_live()
+
+    def _add_live(self):
+        self.live_count += 1
+        self.not_empty.notify()
+        if self.put_callback is not None:
+            self.put_callback()
+
+    def _next_entry(self):
+        # Called with the mutex held and at least one live entry pending
+        barrier_sequence = self.barriers[0][2] if len(self.barriers) > 0 else None
+
+        while len(self.interactive_entries) > 0 and not self.interactive_entries[0][1]:
+            self.interactive_entries.popleft()  # Already sent or superseded
+        if len(self.interactive_entries) > 0:
+            lane_key = self.lane_of(self.command_of(self.interactive_entries[0][0]))
+            if self._lane_ready(lane_key, barrier_sequence):
+                return self._pop_lane(lane_key)
+
+        for lane_key in list(self.lanes):
+            if self._lane_ready(lane_key, barrier_sequence):
+                entry = self._pop_lane(lane_key)
+                if lane_key in self.lanes:
+                    self.lanes.move_to_end(lane_key)  # Next get starts with the following lane
+                return entry
+
+        return self.barriers.popleft()  # Everything queued before the barrier has been sent
+
+    def _lane_ready(self, lane_key, barrier_sequence):
+        # Called with the mutex held: True if the lane's next command can be sent i.e. it was queued before the next barrier
+        # and, for a server command, after every player command still to be sent. An emptied lane is removed.
+        lane = self.lanes[lane_key]
+        while len(lane) > 0 and not lane[0][1]:
+            lane.popleft()  # Discard superseded entries
+        if len(lane) == 0:
+            del self.lanes[lane_key]
+            return False
+        sequence = lane[0][2]
+        if barrier_sequence is not None and sequence > barrier_sequence:
+            return False
+        if lane_key == SERVER_LANE:
+            for player_lane_key, player_lane in self.lanes.items():
+                if player_lane_key != SERVER_LANE and next((entry[2] for entry in player_lane if entry[1]), sequence) < sequence:
+                    return False
+        return True
+
+    def _pop_lane(self, lane_key):
+        # Called with the mutex held, after _lane_ready
+        lane = self.lanes[lane_key]
+        entry = lane.popleft()
+        entry[1] = False  # Sent: no longer live, so it's dropped from interactive_entries
+        if len(lane) == 0:
+            del self.lanes[lane_key]
+        return entry
+
+    def get(self, block=True, timeout=None):
+        with self.not_empty:
+            if not block:
+                if self.live_count == 0:
+                    raise queue.Empty
+            elif timeout is None:
+                while self.live_count == 0:
+                    self._raise_if_woken()
+                    self.not_empty.wait()
+            else:
+                end_time = time.monotonic() + timeout
+                while self.live_count == 0:
+                    self._raise_if_woken()
+                    remaining = end_time - time.monotonic()
+                    if remaining <= 0.0:
+                        raise queue.Empty
+                    self.not_empty.wait(remaining)
+            entry = self._next_entry()
+            item = entry[0]
+            self.live_count -= 1
+            command = self.command_of(item)
+            if self.pending_queries.get(command) is entry:
+                del self.pending_queries[command]
+            elif isinstance(command, str):
+                setter = SUPERSEDABLE_SETTER.match(command)
+                if setter is not None and self.pending_setters.get((setter.group(1), setter.group(2))) is entry:
+                    del self.pending_setters[(setter.group(1), setter.group(2))]
+            return item
+
+    def _raise_if_woken(self):
+        if self.woken:
+            self.woken = False
+            raise queue.Empty
+
+    def wakeup(self):
+        # Make a blocked get() raise queue.Empty e.g. so the communicate thread notices it has been asked to stop
+        with self.mutex:
+            self.woken = True
+            self.not_empty.notify_all()
+
+    def get_nowait(self):
+        return self.get(block=False)
+
+    def qsize(self):
+        with self.mutex:
+            return self.live_count
+
+    def empty(self):
+        return self.qsize() == 0
@@ -4,17 +4,15 @@
 # Squeezebox Controller © Autolog 2023
 #
 
-# r = requests.get(url, json=data)
-# result = r.json()["result"]
-
 # noinspection PyUnresolvedReferences
 # ============================== Native Imports ===============================
-import datetime
+import collections
+import errno
+import queue
 import socket
 import sys
 import threading
 import traceback
-import urllib.parse
 
 # ============================== Custom Imports ===============================
 try:
@@ -23,7 +21,13 @@ except ImportError:
     pass
 
 # ============================== Plugin Imports ===============================
+from cliEvents import CliEvent
 from constants import *
+from heartbeat import Heartbeat, HEARTBEAT_PROBE, PROBE_COMMAND, tune_socket
+from lineFraming import LineFramer
+from reconnectBackoff import ReconnectBackoff
+
+CONNECTION_NAME = "commands"  # See ServerConnections
 
 
 # noinspection PyUnresolvedReferences,PyPep8Naming
@@ -46,8 +50,6 @@ class ThreadCommunicateWithServer(threading.Thread):
 
         self.threadStop = self.globals[THREADS][COMMUNICATE_WITH_SERVER][dev_id][EVENT]
 
-        self.message_id = 0
-
     def exception_handler(self, exception_error_message, log_failing_statement):
         filename, line_number, method, statement = traceback.extract_tb(sys.exc_info()[2])[-1]
         module = filename.split("/")
@@ -60,181 +62,135 @@ class ThreadCommunicateWithServer(threading.Thread):
 
     def run(self):
         try:
-            # keepThreadActive = True
-            # while keepThreadActive:
-
-            print(f"HELLO WORLD: {self.globals[SERVERS][self.dev_id][KEEP_THREAD_ALIVE]}")
-
-            try:
-                self.communicateLogger.info(f"ThreadSqueezeboxServer creating socket for {self.name}: Host=[{self.host}], Port=[{self.port}]")
-                self.squeezeboxReadWriteSocket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)  # create a TCP socket
-
-                self.communicateLogger.info(f"ThreadSqueezeboxServer Starting socket connect for {self.name}: Host=[{self.host}], Port=[{self.port}]")
-                self.squeezeboxReadWriteSocket.connect((self.host, int(self.port)))  # connect to server on the port
-                self.squeezeboxReadWriteSocket.settimeout(20)
-
-                self.communicateLogger.info(f"Communication Thread initialised for {self.name}: Host=[{self.host}], Port=[{self.port}]")
-
-                self.globals[SERVERS][self.dev_id][KEEP_THREAD_ALIVE] = True
-                while self.globals[SERVERS][self.dev_id][KEEP_THREAD_ALIVE]:
-                    self.sendMessage = self.globals[QUEUES][COMMAND_TO_SEND][self.dev_id].get()
+            # The connection is re-established after it is lost (with an increasing, randomised delay between attempts)
+            # until the thread is asked to stop i.e. the server device is stopped
+            reconnect_backoff = ReconnectBackoff()
+            reconnecting = False
+            while not self.threadStop.is_set():
+                self.communicate_with_server(reconnect_backoff, reconnecting)
+                if self.threadStop.is_set():
+                    break
+                self._server_connection_lost()
+                reconnect_delay = reconnect_backoff.next_delay()
+                self.communicateLogger.warning(f"Communication Thread will attempt to reconnect to Server [{self.name}] in {reconnect_delay:.1f} seconds")
+                self.threadStop.wait(reconnect_delay)
+                reconnecting = True
+
+        except Exception as exception_error:
+            self.exception_handler(exception_error, True)  # Log error and display failing statement
+
+        self.communicateLogger.debug(f"Communication Thread ended for {self.host}:{self.port} [{self.name}]")
+
+    def communicate_with_server(self, reconnect_backoff, reconnecting):
+        in_flight = collections.deque()  # Each entry is (command, future to resolve with its reply or None)
+        try:
+            self.communicateLogger.info(f"ThreadSqueezeboxServer creating socket for {self.name}: Host=[{self.host}], Port=[{self.port}]")
+            self.squeezeboxReadWriteSocket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)  # create a TCP socket
+
+            self.communicateLogger.info(f"ThreadSqueezeboxServer Starting socket connect for {self.name}: Host=[{self.host}], Port=[{self.port}]")
+            self.squeezeboxReadWriteSocket.settimeout(20)
+            self.squeezeboxReadWriteSocket.connect((self.host, int(self.port)))  # connect to server on the port
+            tune_socket(self.squeezeboxReadWriteSocket)
+
+            self.communicateLogger.info(f"Communication Thread initialised for {self.name}: Host=[{self.host}], Port=[{self.port}]")
+
+            if reconnecting and self.globals[SERVER_CONNECTIONS].restored(self.dev_id, CONNECTION_NAME):
+                self.globals[QUEUES][RETURNED_RESPONSE].put([self.dev_id, SERVER_RECONNECTED, ""])  # All connections are back: plugin resyncs the players
+
+            # The server replies to CLI commands strictly in the order they were sent, so up to 'pipeline_window' commands
+            # are written to the socket before waiting and each reply is matched to the oldest command still in flight.
+            pipeline_window = self.globals[SERVERS][self.dev_id][PIPELINE_WINDOW]
+            reply_framer = LineFramer(self.squeezeboxReadWriteSocket)
+            heartbeat = Heartbeat()  # A probe is sent when the connection has been idle; no reply within the socket timeout ends it
+
+            while not self.threadStop.is_set():
+                # Fill the window: only block waiting for a command when nothing is awaiting a reply
+                send_messages = list()
+                while len(in_flight) + len(send_messages) < pipeline_window:
+                    idle = len(in_flight) + len(send_messages) == 0
                     try:
-                        if isinstance(self.sendMessage, list) and self.sendMessage[0] == "WAKEUP":
-                            pass
-                            # self.globals[TIMERS][COMMAND_TO_SEND][self.dev_id] = threading.Timer(5.0, signalWakeupQueues, [self.globals[QUEUES][COMMAND_TO_SEND][self.dev_id]])
-                            # self.globals[TIMERS][COMMAND_TO_SEND][self.dev_id].start()
-                        else:
-                            testInstance = isinstance(self.sendMessage, list)
-                            # self.communicateLogger.info(f"self.sendMessage [Type={type(self.sendMessage)}][{testInstance}] = {self.sendMessage}")
-
-                            if isinstance(self.sendMessage, list):
-                                self.sendMessage = self.sendMessage[0]
-
-                            # self.sendMessage = f"{self.sendMessage.rstrip()} MSG:{self.message_id}"
-                            # self.message_id += 1
-
-                            # self.communicateLogger.error(f"Message sent to Server: {self.sendMessage}")  # TODO: DEBUG
-                            send_message_bytes = bytes(self.sendMessage + "\n", "utf-8")
-                            self.squeezeboxReadWriteSocket.sendall(send_message_bytes)
-                            response_bytes = self.squeezeboxReadWriteSocket.recv(1024)
-                            response_string = response_bytes.decode("utf-8")
-                            while response_string[-1:] != "\n":
-                                response_bytes = self.squeezeboxReadWriteSocket.recv(1024)
-                                response_string = response_string + response_bytes.decode("utf-8")
-                            self.response = response_string.strip()
-
-                            # self.communicateLogger.info(f"RECEIVED SERVER RESPONSE Type/Length =  [{type(self.response)}]/[{len(self.response)}]")
-
-                            # self.communicateLogger.info(f"RECEIVED SERVER RESPONSE = {urllib.parse.unquote(self.response.rstrip())}")
-
-                            self.globals[QUEUES][RETURNED_RESPONSE].put([self.dev_id, REPLY_TO_SEND, self.response])
-
-                    except socket.error as exception_error:
-                        # TODO: SORT THIS OUT FOR PYTHON 3
-                        if isinstance(exception_error.args, tuple):
-                            if exception_error[0] == errno.EPIPE:
-                                self.communicateLogger.error(f"Communication Thread detected Server [{self.name}] has disconnected.")
-                            elif exception_error[0] == errno.ECONNRESET:
-                                self.communicateLogger.error(f"Communication Thread detected Server [{self.name}] has reset connection.")
-                            elif exception_error[0] == errno.ETIMEDOUT:
-                                self.communicateLogger.error(f"Communication Thread detected Server [{self.name}] has timed out.")
-                            else:
-                                self.communicateLogger.error(f"Communication Thread detected error communicating with Server [{self.name}]. Has error code ='{exception_error[0]}'")
-                        else:
-                            self.exception_handler(exception_error, True)  # Log error and display failing statement
-                        break
-                    except Exception as exception_error:
-                        self.exception_handler(exception_error, True)  # Log error and display failing statement
+                        self.sendMessage = self.globals[QUEUES][COMMAND_TO_SEND][self.dev_id].get(block=idle, timeout=heartbeat.seconds_until_probe() if idle else None)
+                    except queue.Empty:
+                        if idle and heartbeat.probe_due() and not self.threadStop.is_set():
+                            send_messages.append((PROBE_COMMAND, HEARTBEAT_PROBE))
+                            heartbeat.probe_sent()
                         break
-
-            except Exception as exception_error:
-                self.exception_handler(exception_error, True)  # Log error and display failing statement
-
-        except Exception as e:
-            self.communicateLogger.error(f"Communication Thread unable to start: {self.host}:{self.port} [{self.name}] [Reason = {e}]")
+                    send_future = None
+                    if isinstance(self.sendMessage, list):
+                        if len(self.sendMessage) > 1:
+                            send_future = self.sendMessage[1]  # Queued by send_command
+                            if send_future.done():
+                                continue  # Timed out or cancelled before being sent
+                        self.sendMessage = self.sendMessage[0]
+                    send_messages.append((self.sendMessage, send_future))
+
+                if len(send_messages) > 0:
+                    # self.communicateLogger.error(f"Messages sent to Server: {send_messages}")  # TODO: DEBUG
+                    send_message_bytes = bytes("".join(f"{send_message}\n" for send_message, send_future in send_messages), "utf-8")
+                    self.squeezeboxReadWriteSocket.sendall(send_message_bytes)
+                    in_flight.extend(send_messages)
+
+                if len(in_flight) == 0:
+                    continue  # Woken (e.g. to stop) with nothing outstanding
+
+                # Wait for at least one complete reply, then dispatch every complete reply already received
+                for response_line in reply_framer.read_lines():
+                    heartbeat.activity()
+                    reply_future = None
+                    if len(in_flight) > 0:
+                        reply_future = in_flight.popleft()[1]
+                    if reply_future is HEARTBEAT_PROBE:
+                        round_trip_time = heartbeat.probe_replied()
+                        self.communicateLogger.debug(f"Communication Thread heartbeat for Server [{self.name}]: round trip {round_trip_time * 1000:.1f} ms (smoothed {heartbeat.round_trip_time * 1000:.1f} ms)")
+                        continue
+                    self.response = response_line.strip()
+
+                    # self.communicateLogger.info(f"RECEIVED SERVER RESPONSE = {urllib.parse.unquote(self.response.rstrip())}")
+
+                    self.globals[QUEUES][RETURNED_RESPONSE].put([self.dev_id, REPLY_TO_SEND, CliEvent(self.response), reply_future])
+                reconnect_backoff.reset()  # Connection is working
+
+            if len(in_flight) > 0:
+                self.communicateLogger.debug(f"Communication Thread stopping with {len(in_flight)} replies outstanding from Server [{self.name}]")
+
+        except TimeoutError:
+            self.communicateLogger.error(f"Communication Thread detected Server [{self.name}] has timed out.")
+        except OSError as exception_error:  # Includes ConnectionError e.g. connection closed by server
+            match exception_error.errno:
+                case errno.EPIPE:
+                    self.communicateLogger.error(f"Communication Thread detected Server [{self.name}] has disconnected.")
+                case errno.ECONNRESET:
+                    self.communicateLogger.error(f"Communication Thread detected Server [{self.name}] has reset connection.")
+                case errno.ECONNREFUSED:
+                    self.communicateLogger.error(f"Communication Thread detected Server [{self.name}] has refused connection.")
+                case errno.ETIMEDOUT:
+                    self.communicateLogger.error(f"Communication Thread detected Server [{self.name}] has timed out.")
+                case _:
+                    self.communicateLogger.error(f"Communication Thread detected error communicating with Server [{self.name}]: {exception_error}")
+        except Exception as exception_error:
+            self.exception_handler(exception_error, True)  # Log error and display failing statement
 
         try:
-            self.globals[SERVERS][self.dev_id][STATUS] = "unavailable"
-            indigo.devices[self.dev_id].updateStateOnServer(key="status", value=self.globals[SERVERS][self.dev_id][STATUS])
+            self.squeezeboxReadWriteSocket.close()
+        except Exception:
+            pass
 
-            for dev in indigo.devices.iter(filter="self"):
-                if dev.deviceTypeId == "squeezeboxPlayer" and dev.states["serverId"] == self.dev_id:  # dev_id is id of server
-                    self.globals[PLAYERS][dev.id][POWER_UI] = "disconnected"
-                    dev.updateStateOnServer(key="power", value=self.globals[PLAYERS][dev.id][POWER_UI])
-                    dev.updateStateOnServer(key="state", value=self.globals[PLAYERS][dev.id][POWER_UI])
-                    dev.updateStateImageOnServer(indigo.kStateImageSel.PowerOff)
+        # Replies to commands still in flight will never arrive: fail any futures waiting for them
+        for send_message, send_future in in_flight:
+            if send_future is not None:
+                self.globals[QUEUES][RETURNED_RESPONSE].put([self.dev_id, COMMAND_FAILED, f"Connection to Server [{self.name}] lost before reply to '{send_message}'", send_future])
 
-            self.globals[SERVERS][self.dev_id][KEEP_THREAD_ALIVE] = False
-
-            self.communicateLogger.error(f"Communication Thread ended for {self.host}:{self.port} [{self.name}]")
-
-        except Exception as e:
-            self.communicateLogger.error(f"Communication Thread unable to start: {self.host}:{self.port} [{self.name}] [Reason = {e}]")
+    def _server_connection_lost(self):
+        try:
+            # Only the first of the server's connections to be lost posts it: the plugin marks the server and its players disconnected
+            if self.globals[SERVER_CONNECTIONS].lost(self.dev_id, CONNECTION_NAME):
+                self.globals[QUEUES][RETURNED_RESPONSE].put([self.dev_id, SERVER_CONNECTION_LOST, ""])
 
-            # thread.exit()
+        except Exception as exception_error:
+            self.exception_handler(exception_error, True)  # Log error and display failing statement
 
 # http://192.168.1.8:9000/imageproxy/http%3A%2F%2Fstatic.qobuz.com%2Fimages%2Fcovers%2F95%2F34%2F0884463063495_600.jpg/image.jpg
 
 # http://192.168.1.8:9000/imageproxy/http%3A%2F%2Fstatic.qobuz.com%2Fimages%2Fcovers%2F76%2F20%2F0822189012076_600.jpg/image.jpg
 
 #                         imageproxy/http%3A%2F%2Fstatic.qobuz.com%2Fimages%2Fcovers%2F76%2F20%2F0822189012076_600.jpg/image_96x96_p.jpg
-
-    # def squeezebox_api_call(self, is_post_api_call, api_url):
-    #     try:
-    #         error_code = None
-    #         error_message_ui = ""
-    #         try:
-    #             status_code = -1
-    #             if is_post_api_call:
-    #                 post_data = dict()
-    #                 post_data["id"] = 1
-    #                 post_data["method"] = "slim.request"
-    #                 post_data["params"] = parameter_list
-    #                 headers = {"Content-type": "application/json;charset=UTF-8"}
-    #                 reply = requests.post(api_url, headers=headers, data=post_data)
-    #             else:
-    #                 headers = {"Content-type": "application/json;charset=UTF-8"}
-    #                 reply = requests.get(api_url, headers=headers)
-    #             reply.raise_for_status()  # raise an HTTP error if one coccurred
-    #             status_code = reply.status_code
-    #             # print(f"Reply Status: {reply.status_code}, Text: {reply.text}")
-    #             if status_code == 200:
-    #                 pass
-    #             # elif status_code == 400 or status_code == 401:
-    #             #     error_details = reply.json()
-    #             #     error_code = error_details["code"]
-    #             #     error_message_ui = error_details["message"]
-    #             # elif status_code == 404:
-    #             #     error_code = "Not Found"
-    #             #     error_message_ui = "Starling Hub not found"
-    #             else:
-    #                 error_code = "Unknown Error"
-    #                 error_message_ui = f"unknown connection error: {status_code}"
-    #         except requests.exceptions.HTTPError as error_message:
-    #             error_code = "HTTP Error"
-    #             error_message_ui = f"Access Smappee failed: {error_message}"
-    #             # print(f"HTTP ERROR: {error_message}")
-    #             if error_code != previous_status_message:
-    #                 self.smappeeInterfaceLogger.error(error_message_ui)
-    #             return False, [error_code, error_message_ui]
-    #         except requests.exceptions.Timeout as error_message:
-    #             error_code = "Timeout Error"
-    #             error_message_ui = f"Access Smappee failed with a timeout error. Retrying . . ."
-    #             if error_code != previous_status_message:
-    #                 self.smappeeInterfaceLogger.error(error_message_ui)
-    #             return False, [error_code, error_message_ui]
-    #         except requests.exceptions.ConnectionError as error_message:
-    #             error_code = "Connection Error"
-    #             error_message_ui = f"Access Smappee failed with a connection error. Retrying . . ."
-    #             if error_code != previous_status_message:
-    #                 self.smappeeInterfaceLogger.error(error_message_ui)
-    #             return False, [error_code, error_message_ui]
-    #         except requests.exceptions.RequestException as error_message:
-    #             error_code = "OOps: Unknown error"
-    #             if error_code != previous_status_message:
-    #                 error_message_ui = f"Access Smappee failed with an unknown error. Retrying . . ."
-    #                 self.smappeeInterfaceLogger.info(error_message_ui)
-    #             return False, [error_code, error_message_ui]
-    #
-    #         if status_code == 200:
-    #             reply = reply.json()  # decode JSON
-    #             # # Check Filter
-    #             # if FILTERS in self.globals:
-    #             #     if len(self.globals[FILTERS]) > 0 and self.globals[FILTERS] != ["-0-"]:
-    #             #         self.nest_filter_log_processing(starling_hub_dev.id, starling_hub_dev.name, control_api, reply)
-    #
-    #             return_ok = True
-    #             return return_ok, reply  # noqa [reply might be referenced before assignment]
-    #
-    #         else:
-    #             # TODO: Sort this out!
-    #             return_ok = False
-    #             if error_message_ui is "":
-    #                 self.smappeeInterfaceLogger.error(f"Error [{status_code}] accessing Smappee '{starling_hub_dev.name}': {error_code}")
-    #             else:
-    #                 self.smappeeInterfaceLogger.error(f"Error [{status_code}] accessing Smappee '{starling_hub_dev.name}': {error_code} - {error_message_ui}")
-    #             return return_ok, [error_code, error_message_ui]
-    #
-    #     except Exception as exception_error:
-    #         self.exception_handler(exception_error, True)  # Log error and display failing statement
-    #         return False, [255, exception_error]
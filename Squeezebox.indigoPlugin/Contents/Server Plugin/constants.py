@@ -43,6 +43,9 @@ except ImportError:
 # CF_BUNDLE_IDENTIFIER = "com.indigodomoX.indigoplugin.autologsqueezeboxcontroller"
 ANNOUNCEMENTS_SUB_FOLDER = "autolog_squeezebox_announcements"
 COVER_ART_SUB_FOLDER = "autolog_squeezebox_cover_art"
+SESSIONS_SUB_FOLDER = "autolog_squeezebox_sessions"
+STATUS_REFRESH_TAGS = "adglKu"  # Player status tags: artist, duration, genre, album, artwork url, url
+SUBSCRIBE_COMMANDS_DEFAULT = "client,favorites,mixer,mode,pause,play,playerpref,playlist,power,prefset,stop,sync,time"  # Notifications handled by the plugin
 
 # noinspection Duplicates
 
@@ -53,12 +56,12 @@ SPEECH = constant_id("SPEECH")
 REQUEST = constant_id("REQUEST")
 INITIALISE = constant_id("INITIALISE")
 SAVE_STATE = constant_id("SAVE_STATE")
-PLAY = constant_id("SAVE_STATE")
+PLAY = constant_id("PLAY")
 
 
 ACTIVE = constant_id("ACTIVE")
 ADDRESS = constant_id("ADDRESS")
-ALBUM = constant_id("ARTIST")
+ALBUM = constant_id("ALBUM")
 ANNOUNCEMENT = constant_id("ANNOUNCEMENT")
 ANNOUNCEMENT_PLAYLIST_NO_PLAY = constant_id("ANNOUNCEMENT_PLAYLIST_NO_PLAY")
 ANNOUNCEMENT_PLAY_ACTIVE = constant_id("ANNOUNCEMENT_PLAY_ACTIVE")
@@ -66,8 +69,11 @@ ANNOUNCEMENT_PLAY_INITIALISED = constant_id("ANNOUNCEMENT_PLAY_INITIALISED")
 ANNOUNCEMENT_UNIQUE_KEY = constant_id("ANNOUNCEMENT_UNIQUE_KEY")
 API_VERSION = constant_id("API_VERSION")
 APPEND = constant_id("APPEND")
-ARTIST = constant_id("CONNECTED")
+ARTIST = constant_id("ARTIST")
+ASYNC_TRANSPORT = constant_id("ASYNC_TRANSPORT")
 BASE_FOLDER = constant_id("BASE_FOLDER")
+COMMAND_FAILED = constant_id("COMMAND_FAILED")
+COMMAND_FUTURES = constant_id("COMMAND_FUTURES")
 COMMAND_TO_SEND = constant_id("COMMAND_TO_SEND")
 COMMUNICATE_WITH_SERVER = constant_id("COMMUNICATE_WITH_SERVER")
 CONNECTED = constant_id("CONNECTED")
@@ -78,26 +84,34 @@ COVER_ART_NO_FILE = constant_id("COVER_ART_NO_FILE")
 COVER_ART_NO_FILE_URL = constant_id("COVER_ART_NO_FILE_URL")
 COVER_ART_URL = constant_id("COVER_ART_URL")
 DATE_TIME_STARTED = constant_id("DATE_TIME_STARTED")
+DISPATCH_MODE = constant_id("DISPATCH_MODE")
+DISPATCH_STATISTICS = constant_id("DISPATCH_STATISTICS")
+DISPATCH_TABLES = constant_id("DISPATCH_TABLES")
 DURATION = constant_id("DURATION")
 DURATION_UI = constant_id("DURATION_UI")
 EDITED = constant_id("EDITED")
 EVENT = constant_id("EVENT")
+EVENT_COALESCER = constant_id("EVENT_COALESCER")
 FILE = constant_id("FILE")
 FILE_CHECK_OK = constant_id("FILE_CHECK_OK")
 GENRE = constant_id("GENRE")
+HTTP_PORT = constant_id("HTTP_PORT")
 INDIGO_SERVER_ADDRESS = constant_id("INDIGO_SERVER_ADDRESS")
 INITIALISED = constant_id("INITIALISED")
 IP_ADDRESS = constant_id("IP_ADDRESS")
 IP_ADDRESS_PORT = constant_id("IP_ADDRESS_PORT")
 IP_ADDRESS_PORT_NAME = constant_id("IP_ADDRESS_PORT_NAME")
 IS_SYNC_MASTER = constant_id("IS_SYNC_MASTER")
-IS_SYNC_SLAVE = constant_id("CONNECTED")
+IS_SYNC_SLAVE = constant_id("IS_SYNC_SLAVE")
+JSON_RPC_RESULT = constant_id("JSON_RPC_RESULT")
+JSON_RPC_TRANSPORT = constant_id("JSON_RPC_TRANSPORT")
 KEEP_THREAD_ALIVE = constant_id("KEEP_THREAD_ALIVE")
 LAST_SCAN = constant_id("LAST_SCAN")
+LISTEN_COMMAND = constant_id("LISTEN_COMMAND")
 LISTEN_NOTIFICATION = constant_id("LISTEN_NOTIFICATION")
 LISTEN_TO_SERVER = constant_id("LISTEN_TO_SERVER")
 MAC = constant_id("MAC")
-MAINTAIN_SYNC = constant_id("IS_SYNC_SLAVE")
+MAINTAIN_SYNC = constant_id("MAINTAIN_SYNC")
 MASTER_PLAYER_ADDRESS = constant_id("MASTER_PLAYER_ADDRESS")
 MASTER_PLAYER_ID = constant_id("MASTER_PLAYER_ID")
 MASTER_PLAYER_NAME = constant_id("MASTER_PLAYER_NAME")
@@ -106,9 +120,11 @@ MODEL = constant_id("MODEL")
 NAME = constant_id("NAME")
 OPTION = constant_id("OPTION")
 PATH = constant_id("PATH")
+PIPELINE_WINDOW = constant_id("PIPELINE_WINDOW")
 PLAYERS = constant_id("PLAYERS")
 PLAYER_COUNT = constant_id("PLAYER_COUNT")
 PLAYER_ID = constant_id("PLAYER_ID")
+PLAYER_INDEX = constant_id("PLAYER_INDEX")
 PLAYER_MAC = constant_id("PLAYER_MAC")
 PLAYLIST_TRACKS_TOTAL = constant_id("PLAYLIST_TRACKS_TOTAL")
 PLAYLIST_TRACKS_UI = constant_id("PLAYLIST_TRACKS_UI")
@@ -126,7 +142,12 @@ PREPEND = constant_id("PREPEND")
 QUEUES = constant_id("QUEUES")
 REMOTE_STREAM = constant_id("REMOTE_STREAM")
 REPEAT = constant_id("REPEAT")
+REPLAY_FINISHED = constant_id("REPLAY_FINISHED")
 REPLY_TO_SEND = constant_id("REPLY_TO_SEND")
+RESPONSE_QUEUE_POLICY = constant_id("RESPONSE_QUEUE_POLICY")
+RESPONSE_QUEUE_SIZE = constant_id("RESPONSE_QUEUE_SIZE")
+RESYNC_PENDING = constant_id("RESYNC_PENDING")
+RESYNC_PLAYER_IDS = constant_id("RESYNC_PLAYER_IDS")
 RETURNED_RESPONSE = constant_id("RETURNED_RESPONSE")
 SAVED_MAINTAIN_SYNC = constant_id("SAVED_MAINTAIN_SYNC")
 SAVED_MODE = constant_id("SAVED_MODE")
@@ -138,13 +159,22 @@ SAVED_VOLUME = constant_id("SAVED_VOLUME")
 SERVERS = constant_id("SERVERS")
 SERVER_ID = constant_id("SERVER_ID")
 SERVER_NAME = constant_id("SERVER_NAME")
+SERVER_CONNECTIONS = constant_id("SERVER_CONNECTIONS")
+SERVER_CONNECTION_LOST = constant_id("SERVER_CONNECTION_LOST")
+SERVER_DISPATCHER = constant_id("SERVER_DISPATCHER")
+SERVER_LOCKS = constant_id("SERVER_LOCKS")
+SERVER_RECONNECTED = constant_id("SERVER_RECONNECTED")
+SESSION_RECORDER = constant_id("SESSION_RECORDER")
+SHARED_STATE_LOCK = constant_id("SHARED_STATE_LOCK")
 SHUFFLE = constant_id("SHUFFLE")
 SLAVE_PLAYER_IDS = constant_id("SLAVE_PLAYER_IDS")
 SONG_URL = constant_id("SONG_URL")
 SPEECH_TEXT = constant_id("SPEECH_TEXT")
 STATE = constant_id("STATE")
+STATE_CACHE = constant_id("STATE_CACHE")
 STATUS = constant_id("STATUS")
 STEP = constant_id("STEP")
+SYNC_GROUPS = constant_id("SYNC_GROUPS")
 SYNC_MASTER_NUMBER_OF_SLAVES = constant_id("SYNC_MASTER_NUMBER_OF_SLAVES")
 SYNC_MASTER_SLAVE_1_ADDRESS = constant_id("SYNC_MASTER_SLAVE_1_ADDRESS")
 SYNC_MASTER_SLAVE_1_ID = constant_id("SYNC_MASTER_SLAVE_1_ID")
@@ -163,12 +193,12 @@ THREAD = constant_id("THREAD")
 THREADS = constant_id("THREADS")
 THREAD_ACTIVE = constant_id("THREAD_ACTIVE")
 TIME = constant_id("TIME")
-TIMERS = constant_id("TIMERS")
 TITLE = constant_id("TITLE")
 TOTAL_ALBUMS = constant_id("TOTAL_ALBUMS")
 TOTAL_ARTISTS = constant_id("TOTAL_ARTISTS")
 TOTAL_GENRES = constant_id("TOTAL_GENRES")
 TOTAL_SONGS = constant_id("TOTAL_SONGS")
+TRANSPORT_ENGINE = constant_id("TRANSPORT_ENGINE")
 VERSION = constant_id("VERSION")
 VOICE = constant_id("VOICE")
 VOLUME = constant_id("VOLUME")
@@ -0,0 +1,44 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Squeezebox Controller © Autolog 2023
+#
+
+# noinspection PyUnresolvedReferences
+# ============================== Native Imports ===============================
+
+
+# noinspection PyPep8Naming
+class DispatchTable:
+
+    # This class routes a CliEvent to its handler by the event's command path (see CliEvent.path) with a dict lookup,
+    # instead of a chain of match / case statements on the response words.
+    # A handler is registered for an exact path e.g. ("playlist", "newsong") or for a whole command family e.g. ("mixer",)
+    # which then receives every sub-command ("mixer volume", "mixer muting", ...) not registered exactly.
+    # Handlers can be registered (or replaced) at any time e.g. by an extension handling notifications of an LMS plugin.
+
+    def __init__(self, name):
+        self.name = name
+        self.handlers = dict()  # path tuple -> handler
+
+    def register(self, path, handler):
+        if isinstance(path, str):
+            path = (path,)
+        self.handlers[tuple(path)] = handler
+
+    def unregister(self, path):
+        if isinstance(path, str):
+            path = (path,)
+        self.handlers.pop(tuple(path), None)
+
+    def lookup(self, path):
+        handler = self.handlers.get(path)
+        if handler is None and len(path) > 1:
+            handler = self.handlers.get(path[:1])  # Handler for the whole command family
+        return handler
+
+    def __contains__(self, path):
+        return self.lookup(path) is not None
+
+    def __repr__(self):
+        return f"DispatchTable({self.name!r}, {len(self.handlers)} handlers)"
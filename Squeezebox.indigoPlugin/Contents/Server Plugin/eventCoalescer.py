@@ -0,0 +1,78 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Squeezebox Controller © Autolog 2023
+#
+
+# noinspection PyUnresolvedReferences
+# ============================== Native Imports ===============================
+import collections
+import time
+
+# ============================== Plugin Imports ===============================
+from constants import *
+
+# Player notifications that only report the latest value of a state, so a burst of them can be reduced to the last one
+# e.g. a volume ramp ("prefset server volume 41", "... 42", ...), seeking ("time 93.2", ...), skipping through a playlist
+COALESCIBLE_PATHS = frozenset((("mixer", "volume"), ("playlist", "index"), ("playlist", "newsong"), ("prefset", "server"), ("time",)))
+KEYED_BY_FIRST_ARG = frozenset(("prefset",))  # e.g. "prefset server volume 40" and "prefset server mute 1" are different states
+
+
+# noinspection PyPep8Naming
+class EventCoalescer:
+
+    # This class sits between the returned response queue and the dispatcher in runConcurrentThread. Coalescible listen
+    # notifications are held for up to 'window' seconds and only the latest one per (server, player, state) is dispatched.
+    # Every other response (replies, client / sync notifications, announcement steps, ...) first releases the held
+    # notifications and is then dispatched unchanged, so nothing is reordered relative to an ordering-sensitive response.
+
+    def __init__(self, window=0.05):
+        self.window = window  # Seconds; 0 disables coalescing
+        self.pending = collections.OrderedDict()  # coalesce key -> latest returned response
+        self.flush_time = None
+        self.coalesced_count = 0
+
+    @staticmethod
+    def coalesce_key(returned_response):
+        if returned_response[1] != LISTEN_NOTIFICATION or (len(returned_response) > 3 and returned_response[3] is not None):
+            return None
+        event = returned_response[2]
+        if event.mac == "" or event.path not in COALESCIBLE_PATHS:
+            return None
+        if event.path[0] in KEYED_BY_FIRST_ARG:
+            if len(event.args) == 0:
+                return None
+            return returned_response[0], event.mac, event.path, event.args[0]
+        return returned_response[0], event.mac, event.path
+
+    def add(self, returned_response):
+        # Returns the responses to dispatch now, in order
+        key = self.coalesce_key(returned_response) if self.window > 0 else None
+        if key is None:
+            ready = self.flush()
+            ready.append(returned_response)
+            return ready
+
+        if key in self.pending:
+            del self.pending[key]  # Superseded: the latest value is dispatched in its place
+            self.coalesced_count += 1
+        self.pending[key] = returned_response
+        if self.flush_time is None:
+            self.flush_time = time.monotonic() + self.window
+        return self.flush_due()
+
+    def seconds_until_flush(self):
+        if self.flush_time is None:
+            return None
+        return max(0.0, self.flush_time - time.monotonic())
+
+    def flush_due(self):
+        if self.flush_time is not None and time.monotonic() >= self.flush_time:
+            return self.flush()
+        return list()
+
+    def flush(self):
+        ready = list(self.pending.values())
+        self.pending.clear()
+        self.flush_time = None
+        return ready
@@ -0,0 +1,49 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Squeezebox Controller © Autolog 2023
+#
+
+# noinspection PyUnresolvedReferences
+# ============================== Native Imports ===============================
+
+
+# noinspection PyPep8Naming
+class HandlerContext:
+
+    # This class holds the state of the response being handled and is passed explicitly to every handler (and the
+    # _playerUpdate... methods they call) instead of being kept in attributes of the Plugin object. Each response gets its
+    # own context, so handlers are reentrant and can run on several dispatcher threads at once.
+    #   serverEvent     - the CliEvent being handled (None for a JSON-RPC result)
+    #   currentTime     - Indigo server time when handling started
+    #   replyPlayer...  - the player the response is for (set by Plugin._playerSetReplyContext)
+    #   masterPlayer... - the sync master of that player, or the player itself if not synced
+
+    __slots__ = ("serverEvent", "currentTime", "replyPlayerMAC", "replyPlayerId", "masterPlayerMAC", "masterPlayerId")
+
+    def __init__(self, serverEvent=None, currentTime=None):
+        self.serverEvent = serverEvent
+        self.currentTime = currentTime
+        self.replyPlayerMAC = ""
+        self.replyPlayerId = 0
+        self.masterPlayerMAC = ""
+        self.masterPlayerId = 0
+
+    @property
+    def responseFromSqueezeboxServer(self):
+        return self.serverEvent.text  # The response unquoted
+
+    @property
+    def serverResponse(self):
+        return self.serverEvent.words  # The response unquoted and split on whitespace
+
+    @property
+    def serverResponseKeyword(self):
+        return self.serverEvent.words[0]
+
+    @property
+    def serverResponseKeyword2(self):
+        return self.serverEvent.words[1] if len(self.serverEvent.words) > 1 else ""
+
+    def __repr__(self):
+        return f"HandlerContext({self.serverEvent!r}, replyPlayerId={self.replyPlayerId}, masterPlayerId={self.masterPlayerId})"
@@ -0,0 +1,81 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Squeezebox Controller © Autolog 2023
+#
+
+# noinspection PyUnresolvedReferences
+# ============================== Native Imports ===============================
+import socket
+import time
+
+HEARTBEAT_INTERVAL = 30.0  # Seconds without anything received from the server before a probe is sent
+PROBE_TIMEOUT = 10.0  # Seconds to wait for the reply to a probe before the connection is considered dead
+PROBE_COMMAND = "version ?"  # Cheap CLI query: the reply is a single short line
+PROBE_REPLY_PREFIX = "version "
+
+HEARTBEAT_PROBE = object()  # Stands in for the future of a probe in the list of commands in flight: its reply is not passed on
+
+KEEPALIVE_IDLE = 60  # Seconds idle before the OS starts sending TCP keepalive packets
+KEEPALIVE_INTERVAL = 10  # Seconds between unanswered keepalive packets
+KEEPALIVE_COUNT = 3  # Unanswered keepalive packets before the OS drops the connection
+
+
+def tune_socket(squeezebox_socket):
+    # Commands are short lines that should be sent immediately rather than held back by Nagle's algorithm,
+    # and TCP keepalive lets the OS detect a server that has gone away without closing the connection
+    squeezebox_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    squeezebox_socket.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    keepalive_idle_option = getattr(socket, "TCP_KEEPIDLE", getattr(socket, "TCP_KEEPALIVE", None))  # macOS names it TCP_KEEPALIVE
+    for option, value in ((keepalive_idle_option, KEEPALIVE_IDLE),
+                          (getattr(socket, "TCP_KEEPINTVL", None), KEEPALIVE_INTERVAL),
+                          (getattr(socket, "TCP_KEEPCNT", None), KEEPALIVE_COUNT)):
+        if option is not None:
+            try:
+                squeezebox_socket.setsockopt(socket.IPPROTO_TCP, option, value)
+            except OSError:
+                pass  # Not supported on this platform: the OS defaults apply
+
+
+# noinspection PyPep8Naming
+class Heartbeat:
+
+    # This class decides when a connection that has been idle for HEARTBEAT_INTERVAL should be probed and measures the
+    # round trip time of the probes. A connection whose probe isn't replied to within PROBE_TIMEOUT is dead, so a lost
+    # server is detected within HEARTBEAT_INTERVAL + PROBE_TIMEOUT seconds. The owner of the connection sends the probe
+    # and calls activity / probe_sent / probe_replied; no timer threads are used.
+
+    def __init__(self, interval=HEARTBEAT_INTERVAL, probe_timeout=PROBE_TIMEOUT):
+        self.interval = interval
+        self.probe_timeout = probe_timeout
+        self.last_activity = time.monotonic()
+        self.probe_sent_time = None
+        self.round_trip_time = None  # Smoothed round trip time (seconds) of the probes
+
+    def activity(self):
+        self.last_activity = time.monotonic()
+
+    def seconds_until_probe(self):
+        return max(0.0, self.last_activity + self.interval - time.monotonic())
+
+    def probe_due(self):
+        return self.probe_sent_time is None and self.seconds_until_probe() == 0.0
+
+    def probe_sent(self):
+        self.probe_sent_time = time.monotonic()
+
+    def probe_outstanding(self):
+        return self.probe_sent_time is not None
+
+    def probe_overdue(self):
+        return self.probe_sent_time is not None and time.monotonic() - self.probe_sent_time > self.probe_timeout
+
+    def probe_replied(self):
+        round_trip_time = time.monotonic() - self.probe_sent_time
+        if self.round_trip_time is None:
+            self.round_trip_time = round_trip_time
+        else:
+            self.round_trip_time = 0.875 * self.round_trip_time + 0.125 * round_trip_time  # As TCP's smoothed RTT (RFC 6298)
+        self.probe_sent_time = None
+        self.activity()
+        return round_trip_time
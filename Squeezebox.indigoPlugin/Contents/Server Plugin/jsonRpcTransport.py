@@ -0,0 +1,136 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Squeezebox Controller © Autolog 2023
+#
+
+# noinspection PyUnresolvedReferences
+# ============================== Native Imports ===============================
+import concurrent.futures
+import http.client
+import json
+import queue
+import sys
+import threading
+import traceback
+from urllib.parse import quote
+
+# ============================== Plugin Imports ===============================
+from constants import *
+
+JSON_RPC_PATH = "/jsonrpc.js"
+JSON_RPC_TIMEOUT = 20.0  # Seconds, as the CLI reply timeout
+
+
+# noinspection PyUnresolvedReferences,PyPep8Naming
+class JsonRpcTransport:
+
+    # This class sends "slim.request" JSON-RPC calls to a Squeezebox server's HTTP interface (default port 9000).
+    # Replies are structured JSON, so large responses (e.g. status with its playlist, library queries) need no CLI text parsing.
+    # HTTP/1.1 keep-alive connections are pooled and reused; a batch of requests is spread over the pooled connections.
+    # Results are either returned directly or put on the common "returned response" queue as JSON_RPC_RESULT messages.
+    # If a submitted request fails (e.g. the HTTP interface is disabled), the same command is sent over the CLI instead.
+
+    def __init__(self, plugin_globals, dev_id, host, port, pool_size=2):
+
+        self.globals = plugin_globals
+
+        self.dev_id = dev_id
+        self.host = host
+        self.port = int(port)
+        self.pool_size = pool_size
+
+        self.jsonRpcLogger = logging.getLogger("Plugin.squeezeboxJsonRpc")
+
+        self.idle_connections = queue.LifoQueue()  # Most recently used connection first, as it is the most likely to still be open
+        self.connection_count = 0
+        self.connection_count_lock = threading.Lock()
+        self.request_id = 0
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix=f"Squeezebox JSON-RPC {dev_id}")
+
+    def exception_handler(self, exception_error_message, log_failing_statement):
+        filename, line_number, method, statement = traceback.extract_tb(sys.exc_info()[2])[-1]
+        module = filename.split("/")
+        log_message = f"'{exception_error_message}' in module '{module[-1]}', method '{method}'"
+        if log_failing_statement:
+            log_message = f"{log_message}\n   Failing statement [line {line_number}]: '{statement}'"
+        else:
+            log_message = f"{log_message} at line {line_number}"
+        self.jsonRpcLogger.error(log_message)
+
+    def _acquire_connection(self):
+        try:
+            return self.idle_connections.get_nowait()
+        except queue.Empty:
+            pass
+        with self.connection_count_lock:
+            if self.connection_count < self.pool_size:
+                self.connection_count += 1
+                return http.client.HTTPConnection(self.host, self.port, timeout=JSON_RPC_TIMEOUT)
+        return self.idle_connections.get()  # Pool fully in use: wait for a connection to be released
+
+    def _release_connection(self, connection):
+        self.idle_connections.put(connection)
+
+    def slim_request(self, player_mac, command):
+        # e.g. slim_request("00:04:20:aa:bb:cc", ["status", "-", "1", "tags:adglKu"]) -> {"mode": "play", "power": 1, ...}
+        # Use "-" as the player_mac for server commands e.g. slim_request("-", ["serverstatus", "0", "0"])
+        with self.connection_count_lock:
+            self.request_id += 1
+            request_id = self.request_id
+        request_body = json.dumps({"id": request_id, "method": "slim.request", "params": [player_mac, command]})
+        headers = {"Content-Type": "application/json;charset=UTF-8", "Connection": "keep-alive"}
+
+        connection = self._acquire_connection()
+        try:
+            for attempt in range(2):
+                try:
+                    connection.request("POST", JSON_RPC_PATH, body=request_body, headers=headers)
+                    reply = connection.getresponse()
+                    reply_body = reply.read()  # Always read fully so the connection can be reused
+                    if reply.status != 200:
+                        raise http.client.HTTPException(f"HTTP status {reply.status} {reply.reason}")
+                    return json.loads(reply_body)["result"]
+                except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                    connection.close()  # Idle keep-alive connection closed by the server: reconnect and retry once
+                    if attempt == 1:
+                        raise
+        except Exception:
+            connection.close()  # Don't reuse a connection left in an unknown state; it reconnects on next use
+            raise
+        finally:
+            self._release_connection(connection)
+
+    def slim_request_batch(self, requests):
+        # requests is a list of (player_mac, command); the results are returned in the same order
+        return list(self.executor.map(lambda request: self.slim_request(*request), requests))
+
+    def submit(self, player_mac, command):
+        # Send without waiting: the result is handled by runConcurrentThread like any other server response
+        return self.executor.submit(self._request_and_post, player_mac, command)
+
+    def _request_and_post(self, player_mac, command):
+        try:
+            result = self.slim_request(player_mac, command)
+            self.globals[QUEUES][RETURNED_RESPONSE].put([self.dev_id, JSON_RPC_RESULT, [player_mac, command, result]])
+        except (OSError, http.client.HTTPException, ValueError, KeyError) as exception_error:
+            self.jsonRpcLogger.error(f"JSON-RPC request {command} for '{player_mac}' to {self.host}:{self.port} failed: {exception_error}")
+            self._send_over_cli(player_mac, command)
+        except Exception as exception_error:
+            self.exception_handler(exception_error, True)  # Log error and display failing statement
+
+    def _send_over_cli(self, player_mac, command):
+        # Fallback for a failed request: its reply is then handled as a CLI response, as if JSON-RPC wasn't enabled
+        command_queue = self.globals[QUEUES][COMMAND_TO_SEND].get(self.dev_id)
+        if command_queue is None:
+            return  # Server stopped in the meantime
+        words = command if player_mac == "-" else [player_mac] + list(command)
+        command_queue.put([" ".join(quote(str(word), safe=":-") for word in words)])
+
+    def close(self):
+        self.executor.shutdown(wait=False)
+        while True:
+            try:
+                self.idle_connections.get_nowait().close()
+            except queue.Empty:
+                break
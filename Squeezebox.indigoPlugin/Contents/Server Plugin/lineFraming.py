@@ -0,0 +1,53 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Squeezebox Controller © Autolog 2023
+#
+
+# noinspection PyPep8Naming
+class LineFramer:
+
+    # This class frames the byte stream received from a Squeezebox server socket into complete CLI lines.
+    # Received bytes are appended to a growable buffer; complete lines are decoded once and any trailing
+    # partial line is kept for the next receive, so several replies arriving in one chunk are never lost.
+
+    def __init__(self, squeezebox_socket=None, receive_size=65536):
+        self.socket = squeezebox_socket
+        self.receive_size = receive_size
+        self.buffer = bytearray()
+        self.scan_position = 0  # Bytes at the start of the buffer already known not to contain a line end
+
+    def feed(self, data):
+        self.buffer += data
+
+    def complete_lines(self):
+        lines = list()
+        start = 0
+        position = self.scan_position
+        with memoryview(self.buffer) as view:
+            while True:
+                end = self.buffer.find(b"\n", position)
+                if end == -1:
+                    break
+                lines.append(str(view[start:end], "utf-8", "replace").rstrip("\r"))
+                start = position = end + 1
+        if start > 0:
+            del self.buffer[:start]  # Single compaction per receive rather than per line
+        self.scan_position = len(self.buffer)
+        return lines
+
+    def read_lines(self):
+        # Return at least one complete line, receiving from the socket as required
+        lines = self.complete_lines()
+        while len(lines) == 0:
+            data = self.socket.recv(self.receive_size)
+            if not data:
+                raise ConnectionError("Connection closed by Squeezebox server")
+            self.feed(data)
+            lines = self.complete_lines()
+        return lines
+
+    def iter_lines(self):
+        while True:
+            for line in self.read_lines():
+                yield line
@@ -6,7 +6,6 @@
 
 # noinspection PyUnresolvedReferences
 # ============================== Native Imports ===============================
-import datetime
 import socket
 import sys
 import threading
@@ -19,7 +18,13 @@ except ImportError:
     pass
 
 # ============================== Plugin Imports ===============================
+from cliEvents import cli_events
 from constants import *
+from heartbeat import Heartbeat, PROBE_COMMAND, PROBE_REPLY_PREFIX, tune_socket
+from lineFraming import LineFramer
+from reconnectBackoff import ReconnectBackoff
+
+CONNECTION_NAME = "listen"  # See ServerConnections
 
 
 # noinspection PyUnresolvedReferences,PyPep8Naming
@@ -54,80 +59,87 @@ class ThreadListenToServer(threading.Thread):
 
     def run(self):
         try:
-            # keepThreadActive = True
-            # while keepThreadActive:
-            # self.listenLogger.error(f"listen Thread starting socket listen for {self.host}:{self.port} [{self.name}]")  # TODO: DEBUG
-
-            self.squeezeboxListenSocket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)  # create a TCP socket
-            self.squeezeboxListenSocket.connect((self.host, int(self.port)))  # connect to server on the port
-
-            try:
-                # self.listenLogger.error(f"Listen Thread initialised for {self.host}:{self.port} [{self.name}]")  # TODO: DEBUG
-                self.squeezeboxListenSocket.settimeout(5)
-                send_message_bytes = bytes("listen 1" + "\n", "utf-8")
-                self.squeezeboxListenSocket.sendall(send_message_bytes)
-                while self.globals[SERVERS][self.dev_id][KEEP_THREAD_ALIVE]:
-                    loopTimeCheck = indigo.server.getTime()
-                    try:
-                        a = 1
-                        b = a + 1
-                        # self.listenLogger.debug("TIMEOUT LISTEN THREAD TEST")
-                        for line in self.squeezeboxListenSocket.makefile("rbw"):
-                            line = line.decode("utf-8")
-                            self.globals[QUEUES][RETURNED_RESPONSE].put([self.dev_id, LISTEN_NOTIFICATION, line])
-                            try:
-                                self.listenLogger.error(f"{urllib.unquote(line.rstrip())}")
-                            except:
-                                pass
-                        if len(self.line) < 10:
-                            pass
-
-
-                    except ConnectionError as exception_error:
-                        self.exception_handler(exception_error, True)
-                        break
-
-                    except TimeoutError as exception_error:
-                        loopTimeCheck = loopTimeCheck + datetime.timedelta(seconds=3)
-                        if indigo.server.getTime() > loopTimeCheck:
-                            # self.listenLogger.warning(f"Listen Thread detected Server [{self.name}] has timed out but will continue.")
-                            continue
-                        self.exception_handler(exception_error, True)
-                        break
-
-                    except Exception as exception_error:
-                        self.exception_handler(exception_error, True)  # Log error and display failing statement
-                        break
-
-            except Exception as exception_error:
-                self.exception_handler(exception_error, True)  # Log error and display failing statement
+            # The connection is re-established after it is lost (with an increasing, randomised delay between attempts)
+            # until the thread is asked to stop i.e. the server device is stopped
+            reconnect_backoff = ReconnectBackoff()
+            reconnecting = False
+            while not self.threadStop.is_set():
+                self.listen_to_server(reconnect_backoff, reconnecting)
+                if self.threadStop.is_set():
+                    break
+                self._server_connection_lost()
+                reconnect_delay = reconnect_backoff.next_delay()
+                self.listenLogger.warning(f"Listen Thread will attempt to reconnect to Server [{self.name}] in {reconnect_delay:.1f} seconds")
+                self.threadStop.wait(reconnect_delay)
+                reconnecting = True
 
         except Exception as exception_error:
-            exception_message = f"Listen Thread unable to start: {self.host}:{self.port} [{self.name}] [Reason = {exception_error}]"
-            self.exception_handler(exception_message, True)  # Log error and display failing statement
+            self.exception_handler(exception_error, True)  # Log error and display failing statement
 
+        self.listenLogger.debug(f"Listen Thread ended for {self.host}:{self.port} [{self.name}]")
+
+    def listen_to_server(self, reconnect_backoff, reconnecting):
         try:
-            self.globals[SERVERS][self.dev_id][STATUS] = "unavailable"
-            indigo.devices[self.dev_id].updateStateOnServer(key="status", value=self.globals[SERVERS][self.dev_id][STATUS])
+            # self.listenLogger.error(f"listen Thread starting socket listen for {self.host}:{self.port} [{self.name}]")  # TODO: DEBUG
 
-            for dev in indigo.devices.iter(filter="self"):
-                if dev.deviceTypeId == "squeezeboxPlayer" and dev.states["serverId"] == self.dev_id:  # dev_id is id of server
-                    self.globals[PLAYERS][dev.id][POWER_UI] = "disconnected"
-                    dev.updateStateOnServer(key="power", value=self.globals[PLAYERS][dev.id][POWER_UI])
-                    dev.updateStateOnServer(key="state", value=self.globals[PLAYERS][dev.id][POWER_UI])
-                    dev.updateStateImageOnServer(indigo.kStateImageSel.PowerOff)
+            self.squeezeboxListenSocket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)  # create a TCP socket
+            self.squeezeboxListenSocket.settimeout(5)
+            self.squeezeboxListenSocket.connect((self.host, int(self.port)))  # connect to server on the port
+            tune_socket(self.squeezeboxListenSocket)
 
-            # time.sleep(15)
-            # indigo.device.enable(self.dev_id, value=False)
-            # indigo.device.enable(self.dev_id, value=True)
+            # self.listenLogger.error(f"Listen Thread initialised for {self.host}:{self.port} [{self.name}]")  # TODO: DEBUG
+            send_message_bytes = bytes(self.globals[SERVERS][self.dev_id][LISTEN_COMMAND] + "\n", "utf-8")  # (Re-)subscribe to notifications: "listen 1" or "subscribe ..."
+            self.squeezeboxListenSocket.sendall(send_message_bytes)
 
-            self.listenLogger.debug(f"Listen Thread ended for {self.host}:{self.port} [{self.name}]")
+            if reconnecting and self.globals[SERVER_CONNECTIONS].restored(self.dev_id, CONNECTION_NAME):
+                self.globals[QUEUES][RETURNED_RESPONSE].put([self.dev_id, SERVER_RECONNECTED, ""])  # All connections are back (notifications were missed): plugin resyncs the players
 
-        except Exception as exception_error:
-            exception_message = f"Listen Thread unable to start: {self.host}:{self.port} [{self.name}] [Reason = {exception_error}]"
-            self.exception_handler(exception_message, True)  # Log error and display failing statement
+            # One persistent pipeline for the life of the connection: received lines -> parsed CliEvents -> returned response queue
+            for event in cli_events(self._received_lines(reconnect_backoff)):
+                self.globals[QUEUES][RETURNED_RESPONSE].put([self.dev_id, LISTEN_NOTIFICATION, event])
 
-        self.globals[SERVERS][self.dev_id][KEEP_THREAD_ALIVE] = False
+        except OSError as exception_error:  # Includes ConnectionError e.g. connection closed by server
+            self.listenLogger.error(f"Listen Thread detected error listening to Server [{self.name}]: {exception_error}")
+        except Exception as exception_error:
+            self.exception_handler(exception_error, True)  # Log error and display failing statement
 
-        # thread.exit()
+        try:
+            self.squeezeboxListenSocket.close()
+        except Exception:
+            pass
+
+    def _received_lines(self, reconnect_backoff):
+        # Generator stage: yields the notification lines received until the thread is asked to stop or the connection is dead.
+        # Partial lines are retained by the framer across receive timeouts; heartbeat probe replies are consumed here.
+        listen_framer = LineFramer(self.squeezeboxListenSocket)
+        heartbeat = Heartbeat()  # Notifications may not arrive for hours: probe the connection when it has been quiet
+        while not self.threadStop.is_set():
+            try:
+                lines = listen_framer.read_lines()
+            except TimeoutError:
+                # No notifications: the receive timeout allows a stop request to be noticed and the connection to be probed
+                if heartbeat.probe_overdue():
+                    self.listenLogger.error(f"Listen Thread detected Server [{self.name}] has not replied to heartbeat within {heartbeat.probe_timeout:.0f} seconds.")
+                    return
+                if heartbeat.probe_due():
+                    self.squeezeboxListenSocket.sendall(bytes(PROBE_COMMAND + "\n", "utf-8"))
+                    heartbeat.probe_sent()
+                continue
+
+            reconnect_backoff.reset()  # Connection is working
+            heartbeat.activity()
+            for line in lines:
+                if heartbeat.probe_outstanding() and line.startswith(PROBE_REPLY_PREFIX):
+                    round_trip_time = heartbeat.probe_replied()
+                    self.listenLogger.debug(f"Listen Thread heartbeat for Server [{self.name}]: round trip {round_trip_time * 1000:.1f} ms (smoothed {heartbeat.round_trip_time * 1000:.1f} ms)")
+                    continue
+                yield line
+
+    def _server_connection_lost(self):
+        try:
+            # Only the first of the server's connections to be lost posts it: the plugin marks the server and its players disconnected
+            if self.globals[SERVER_CONNECTIONS].lost(self.dev_id, CONNECTION_NAME):
+                self.globals[QUEUES][RETURNED_RESPONSE].put([self.dev_id, SERVER_CONNECTION_LOST, ""])
 
+        except Exception as exception_error:
+            self.exception_handler(exception_error, True)  # Log error and display failing statement
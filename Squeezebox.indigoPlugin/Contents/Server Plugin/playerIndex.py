@@ -0,0 +1,61 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Squeezebox Controller © Autolog 2023
+#
+
+# noinspection PyUnresolvedReferences
+# ============================== Native Imports ===============================
+import threading
+
+
+# noinspection PyPep8Naming
+class PlayerIndex:
+
+    # This class indexes the started player devices by MAC address and by device id (with the id of the server they are
+    # connected to), so the player a response is for is found with a dict lookup rather than by iterating the devices.
+    # It is maintained by deviceStartComm / deviceStopComm, deviceUpdated (address change) and whenever a player's server
+    # id is set. MAC addresses are looked up case insensitively (LMS reports them in lower case).
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.mac_to_dev_id = dict()
+        self.dev_id_to_mac = dict()
+        self.dev_id_to_server_id = dict()
+
+    def add(self, dev_id, mac, server_id=0):
+        with self.lock:
+            self._remove(dev_id)
+            self.mac_to_dev_id[mac.lower()] = dev_id
+            self.dev_id_to_mac[dev_id] = mac
+            self.dev_id_to_server_id[dev_id] = server_id
+
+    def remove(self, dev_id):
+        with self.lock:
+            self._remove(dev_id)
+
+    def _remove(self, dev_id):
+        mac = self.dev_id_to_mac.pop(dev_id, None)
+        if mac is not None and self.mac_to_dev_id.get(mac.lower()) == dev_id:
+            del self.mac_to_dev_id[mac.lower()]
+        self.dev_id_to_server_id.pop(dev_id, None)
+
+    def set_server(self, dev_id, server_id):
+        with self.lock:
+            if dev_id in self.dev_id_to_mac:
+                self.dev_id_to_server_id[dev_id] = server_id
+
+    def dev_id(self, mac):
+        return self.mac_to_dev_id.get(mac.lower(), 0)  # 0 if no started player has this MAC address
+
+    def mac(self, dev_id):
+        return self.dev_id_to_mac.get(dev_id, "")
+
+    def server_id(self, dev_id):
+        return self.dev_id_to_server_id.get(dev_id, 0)
+
+    def __contains__(self, mac):
+        return mac.lower() in self.mac_to_dev_id
+
+    def __len__(self):
+        return len(self.dev_id_to_mac)
@@ -33,8 +33,30 @@ except ImportError:
 
 # ============================== Plugin Imports ===============================
 from constants import *
+from asyncTransport import AsyncTransportEngine
+from cliEvents import PLAYER_EVENT
+from commandFutures import CommandConnectionError, CommandFutures, gather
+from commandQueue import CoalescingCommandQueue
 from communicateWithServer import ThreadCommunicateWithServer
+from dispatchTable import DispatchTable
+from eventCoalescer import EventCoalescer
+from handlerContext import HandlerContext
+from jsonRpcTransport import JsonRpcTransport
 from listenToServer import ThreadListenToServer
+from playerIndex import PlayerIndex
+from responseQueue import BoundedResponseQueue
+from stateCache import NOT_CACHED, StateCache
+from serverConnections import ServerConnections
+from serverDispatcher import ThreadServerDispatcher
+from sessionRecorder import DispatchStatistics, SessionRecorder, ThreadSessionReplay
+from stateRecords import PlayerState, ServerState
+from syncGroups import SyncGroupGraph
+from taggedResponse import PLAYERS_RECORD_KEY, SERVERSTATUS_RECORD_KEY, STATUS_RECORD_KEY, TaggedResponse
+
+# Patterns used for every response are compiled once
+READDIRECTORY_TAG_PATTERN = re.compile(r"(\w+:)")
+SUBSCRIBE_COMMANDS_PATTERN = re.compile(r"^[A-Za-z_]+(,[A-Za-z_]+)*$")
+MAC_ADDRESS_PATTERN = re.compile("[0-9a-f]{2}([-:])[0-9a-f]{2}(\\1[0-9a-f]{2}){4}$")
 
 
 # noinspection PyTypeChecker
@@ -74,17 +96,21 @@ class Plugin(indigo.PluginBase):
         self.globals[THREADS] = dict()
         self.globals[THREADS][COMMUNICATE_WITH_SERVER] = dict()
         self.globals[THREADS][LISTEN_TO_SERVER] = dict()
+        self.globals[THREADS][ASYNC_TRANSPORT] = None  # Set-up in plugin start if the asyncio transport engine is selected
+        self.globals[THREADS][SERVER_DISPATCHER] = dict()  # Per server dispatch mode: one per server, created by runConcurrentThread
 
         self.globals[QUEUES] = dict()
         self.globals[QUEUES][RETURNED_RESPONSE] = ""  # Set-up in plugin start (a common returned response queue for all servers)
         self.globals[QUEUES][COMMAND_TO_SEND] = dict()  # There will be one "commandToSend" queue for each server - set-up in device start
         self.globals[QUEUES][ANNOUNCEMENT] = ""  # Set-up in plugin start (a common announcement queue for all servers)
 
-        self.globals[TIMERS] = dict()
-        self.globals[TIMERS][COMMAND_TO_SEND] = dict()
+        self.globals[COMMAND_FUTURES] = CommandFutures()  # Correlates commands sent with send_command to their replies
 
         self.globals[SERVERS] = dict()
+        self.globals[SERVER_CONNECTIONS] = ServerConnections()  # Which of each server's connections are down (see serverConnections.py)
         self.globals[PLAYERS] = dict()
+        self.globals[PLAYER_INDEX] = PlayerIndex()  # Started players by MAC address / device id (see playerIndex.py)
+        self.globals[SYNC_GROUPS] = SyncGroupGraph()  # Sync groups of each server (see syncGroups.py)
 
         self.globals[ANNOUNCEMENT] = dict()
         self.globals[ANNOUNCEMENT][ACTIVE] = NO
@@ -92,11 +118,76 @@ class Plugin(indigo.PluginBase):
         self.globals[ANNOUNCEMENT][FILE_CHECK_OK] = True
         self.globals[ANNOUNCEMENT][TEMPORARY_FOLDER] = ""
 
+        self.globals[TRANSPORT_ENGINE] = plugin_prefs.get("transportEngine", "threads")  # Only applied at plugin start: "threads" | "asyncio"
+        try:
+            self.globals[RESPONSE_QUEUE_SIZE] = int(plugin_prefs.get("responseQueueSize", "10000"))  # Only applied at plugin start
+        except ValueError:
+            self.globals[RESPONSE_QUEUE_SIZE] = 10000
+        self.globals[RESPONSE_QUEUE_POLICY] = plugin_prefs.get("responseQueuePolicy", "block")  # Only applied at plugin start: "block" | "drop_oldest" | "spill"
+        self.globals[DISPATCH_MODE] = plugin_prefs.get("dispatchMode", "single")  # Only applied at plugin start: "single" | "per_server"
+        self.globals[STATE_CACHE] = StateCache()  # Last values written to the Indigo server (see deviceStateWrite)
+        self.globals[SERVER_LOCKS] = dict()  # server device id -> lock held while one of its responses is handled (see _serverLock)
+        self.globals[SHARED_STATE_LOCK] = threading.Lock()  # Held while players / servers are added, removed or iterated (see _serverLock)
+        self.globals[EVENT_COALESCER] = EventCoalescer()  # Window set from the plugin config in validatePrefsConfigUi
+        self.globals[SESSION_RECORDER] = None  # Set while a session is being recorded
+        self.globals[DISPATCH_STATISTICS] = None  # Set while a recorded session is being replayed
+        self.globals[DISPATCH_TABLES] = dict()
+        self.globals[DISPATCH_TABLES][SERVERS] = DispatchTable("server")  # Server responses: handler(ctx, devServer)
+        self.globals[DISPATCH_TABLES][PLAYERS] = DispatchTable("player")  # Player responses: handler(ctx, devServer, devPlayer)
+        self.registerResponseHandlers()
+
         self.validatePrefsConfigUi(plugin_prefs)  # Validate the Plugin Config before plugin initialisation
 
     def __del__(self):
 
         indigo.PluginBase.__del__(self)
+
+    def registerResponseHandlers(self):
+        # Routing of server responses / notifications by command path (see handleSqueezeboxServerResponse and _handle_player_detail)
+        # Server handlers are called as handler(ctx, devServer) and player handlers as handler(ctx, devServer, devPlayer)
+        serverHandlers = self.globals[DISPATCH_TABLES][SERVERS]
+        serverHandlers.register("serverstatus", self._handle_serverstatus)
+        serverHandlers.register("syncgroups", self._handle_syncgroups)
+        serverHandlers.register("players", self._handle_players)
+        serverHandlers.register(("player", "id"), self._handle_player_id)
+        serverHandlers.register("readdirectory", self._handle_readdirectory)
+
+        playerHandlers = self.globals[DISPATCH_TABLES][PLAYERS]
+        playerHandlers.register("sync", self._handle_player_detail_sync)
+        playerHandlers.register("songinfo", self._handle_player_detail_songinfo)
+        playerHandlers.register("favorites", self._handle_player_detail_favorites)
+        playerHandlers.register(("playlist", "open"), self._handle_player_detail_playlist_open)
+        playerHandlers.register(("playlist", "newsong"), self._handle_player_detail_playlist_newsong)
+        playerHandlers.register(("playlist", "pause"), self._handle_player_detail_playlist_pause)
+        playerHandlers.register(("playlist", "name"), self._handle_player_detail_playlist_name)
+        playerHandlers.register(("playlist", "index"), self._handle_player_detail_playlist_index)
+        playerHandlers.register(("playlist", "tracks"), self._handle_player_detail_playlist_tracks)
+        playerHandlers.register(("playlist", "repeat"), self._handle_player_detail_playlist_repeat)
+        playerHandlers.register(("playlist", "shuffle"), self._handle_player_detail_playlist_shuffle)
+        playerHandlers.register(("playlist", "load_done"), self._handle_player_detail_playlist_load_done)
+        playerHandlers.register(("playlist", "stop"), self._handle_player_detail_playlist_stop)
+        playerHandlers.register("pause", self._handle_player_detail_pause)
+        playerHandlers.register("play", self._handle_player_detail_play)
+        playerHandlers.register("prefset", self._handle_player_detail_prefset)  # All "prefset ..." sub-commands
+        playerHandlers.register("mixer", self._handle_player_detail_mixer)  # All "mixer ..." sub-commands
+        playerHandlers.register("playerpref", self._handle_player_detail_playerpref)  # All "playerpref ..." sub-commands
+        playerHandlers.register("maintainSync", self._handle_player_detail_maintainSync)
+        playerHandlers.register("artist", self._handle_player_detail_artist)
+        playerHandlers.register("album", self._handle_player_detail_album)
+        playerHandlers.register("title", self._handle_player_detail_title)
+        playerHandlers.register("genre", self._handle_player_detail_genre)
+        playerHandlers.register("duration", self._handle_player_detail_duration)
+        playerHandlers.register("remote", self._handle_player_detail_remote)
+        playerHandlers.register("client", self._handle_player_detail_client)  # All "client ..." sub-commands
+        playerHandlers.register("power", self._handle_player_detail_power)
+        playerHandlers.register("mode", self._handle_player_detail_mode)
+        playerHandlers.register("time", self._handle_player_detail_time)
+        playerHandlers.register("status", self._handle_player_detail_status)
+        playerHandlers.register("autologAnnouncementRequest", self._handle_player_detail_autologAnnouncementRequest)
+        playerHandlers.register("autologAnnouncementSaveState", self._handle_player_detail_autologAnnouncementSaveState)
+        playerHandlers.register("autologAnnouncementPlay", self._handle_player_detail_autologAnnouncementPlay)
+        playerHandlers.register("autologAnnouncementRestartPlaying", self._handle_player_detail_autologAnnouncementRestartPlaying)
+        playerHandlers.register("autologAnnouncementEnded", self._handle_player_detail_autologAnnouncementEnded)
     
     def display_plugin_information(self):
         try:
@@ -121,6 +212,89 @@ class Plugin(indigo.PluginBase):
         except Exception as exception_error:
             self.exception_handler(exception_error, True)  # Log error and display failing statement
 
+    def display_response_queue_statistics(self):
+        try:
+            statistics_message_ui = "Response Queue Statistics:\n"
+            statistics_message_ui += f"{'':={'^'}80}\n"
+            for statistic, value in self.globals[QUEUES][RETURNED_RESPONSE].statistics().items():
+                statistics_message_ui += f"{statistic.capitalize() + ':':<30} {value}\n"
+            statistics_message_ui += f"{'Notifications coalesced:':<30} {self.globals[EVENT_COALESCER].coalesced_count}\n"
+            statistics_message_ui += f"{'State writes:':<30} {self.globals[STATE_CACHE].written_count}\n"
+            statistics_message_ui += f"{'State writes suppressed:':<30} {self.globals[STATE_CACHE].suppressed_count} (unchanged)\n"
+            statistics_message_ui += f"{'State writes batched:':<30} {self.globals[STATE_CACHE].batched_count} in {self.globals[STATE_CACHE].flush_count} Indigo server calls\n"
+            statistics_message_ui += f"{'':={'^'}80}\n"
+
+            self.logger.info(statistics_message_ui)
+
+        except Exception as exception_error:
+            self.exception_handler(exception_error, True)  # Log error and display failing statement
+
+    def start_session_recording(self):
+        try:
+            if self.globals[SESSION_RECORDER] is not None:
+                self.logger.warning(f"Session already being recorded to '{self.globals[SESSION_RECORDER].path}'")
+                return
+
+            path = f"{self.globals[PLUGIN_PREFS_FOLDER]}/{SESSIONS_SUB_FOLDER}"
+            os.makedirs(path, exist_ok=True)
+            sessionFile = f"{path}/session-{datetime.datetime.now().strftime('%Y%m%d-%H%M%S')}.tsv.gz"
+            self.globals[SESSION_RECORDER] = SessionRecorder(sessionFile)
+            self.globals[QUEUES][RETURNED_RESPONSE].recorder = self.globals[SESSION_RECORDER]
+            self.logger.info(f"Recording Squeezebox server session to '{sessionFile}'")
+
+        except Exception as exception_error:
+            self.exception_handler(exception_error, True)  # Log error and display failing statement
+
+    def stop_session_recording(self):
+        try:
+            sessionRecorder = self.globals[SESSION_RECORDER]
+            if sessionRecorder is None:
+                self.logger.warning("No session is being recorded")
+                return
+
+            self.globals[QUEUES][RETURNED_RESPONSE].recorder = None
+            self.globals[SESSION_RECORDER] = None
+            sessionRecorder.close()
+            self.logger.info(f"Recorded {sessionRecorder.recorded_count} lines to '{sessionRecorder.path}'")
+
+        except Exception as exception_error:
+            self.exception_handler(exception_error, True)  # Log error and display failing statement
+
+    def replay_session(self, valuesDict, typeId):
+        try:
+            sessionFile = valuesDict.get("sessionFile", "").strip()
+            if sessionFile == "":  # Default to the most recent recording
+                path = f"{self.globals[PLUGIN_PREFS_FOLDER]}/{SESSIONS_SUB_FOLDER}"
+                sessionFiles = sorted(entry for entry in os.listdir(path) if entry.endswith(".tsv.gz")) if os.path.isdir(path) else list()
+                if len(sessionFiles) == 0:
+                    errorDict = indigo.Dict()
+                    errorDict["sessionFile"] = "No recorded sessions found"
+                    errorDict["showAlertText"] = "No recorded sessions found, please record a session first or specify a session file."
+                    return False, valuesDict, errorDict
+                sessionFile = f"{path}/{sessionFiles[-1]}"
+            elif not os.path.isfile(sessionFile):
+                errorDict = indigo.Dict()
+                errorDict["sessionFile"] = "File does not exist"
+                errorDict["showAlertText"] = "Session file does not exist, please specify a valid file."
+                return False, valuesDict, errorDict
+
+            if self.globals[DISPATCH_STATISTICS] is not None:
+                errorDict = indigo.Dict()
+                errorDict["showAlertText"] = "A session is already being replayed."
+                return False, valuesDict, errorDict
+
+            replaySpeed = float(valuesDict.get("replaySpeed", "1"))
+            serverDevId = int(valuesDict["replayServer"]) if valuesDict.get("replayAsServer", False) and valuesDict.get("replayServer", "") != "" else None
+
+            self.logger.info(f"Replaying Squeezebox server session '{sessionFile}' at {'maximum speed' if replaySpeed == 0 else f'x{replaySpeed:g} speed'}")
+            self.globals[DISPATCH_STATISTICS] = DispatchStatistics()
+            ThreadSessionReplay(self.globals, sessionFile, replaySpeed, self.globals[DISPATCH_STATISTICS], serverDevId).start()
+
+            return True
+
+        except Exception as exception_error:
+            self.exception_handler(exception_error, True)  # Log error and display failing statement
+
     def exception_handler(self, exception_error_message, log_failing_statement):
         filename, line_number, method, statement = traceback.extract_tb(sys.exc_info()[2])[-1]
         module = filename.split("/")
@@ -146,11 +320,15 @@ class Plugin(indigo.PluginBase):
             self.globals[COVER_ART][COVER_ART_NO_FILE] = str(f"{indigo.server.getInstallFolderPath()}/Plugins/Squeezebox.indigoPlugin/Contents/Resources/nocoverart.jpg")
             self.globals[COVER_ART][COVER_ART_NO_FILE_URL] = str(f"file://{self.globals[COVER_ART][COVER_ART_NO_FILE]}")
     
-            self.globals[QUEUES][RETURNED_RESPONSE] = queue.Queue()  # noqa - For server responses and UI commands
+            # For server responses: bounded, with the overload policy applied if runConcurrentThread falls behind
+            self.globals[QUEUES][RETURNED_RESPONSE] = BoundedResponseQueue(self.globals[RESPONSE_QUEUE_SIZE], self.globals[RESPONSE_QUEUE_POLICY], self.globals[PLUGIN_PREFS_FOLDER])
     
             self.globals[QUEUES][ANNOUNCEMENT] = queue.Queue()  # noqa - For queued announcements (Announcements are queued when one is already active)
     
-            self.signalWakeupQueues(self.globals[QUEUES][RETURNED_RESPONSE])
+            if self.globals[TRANSPORT_ENGINE] == "asyncio":
+                self.globals[THREADS][ASYNC_TRANSPORT] = AsyncTransportEngine(self.globals)  # One event loop thread for all servers
+                self.globals[THREADS][ASYNC_TRANSPORT].start()
+                self.logger.info("Squeezebox servers will be connected using the asyncio transport engine")
     
             self.deviceFolderName = "Squeezebox"
             if self.deviceFolderName not in indigo.devices.folders:
@@ -168,13 +346,11 @@ class Plugin(indigo.PluginBase):
 
         self.logger.debug("shutdown called")
 
-    def signalWakeupQueues(self, queueToWakeup):
-        try:
-            self.logger.debug(f"=================> signalWakeupQueues invoked for {queueToWakeup} <========================")
-            queueToWakeup.put(["WAKEUP"])
+        if self.globals[THREADS][ASYNC_TRANSPORT] is not None:
+            self.globals[THREADS][ASYNC_TRANSPORT].stop()
 
-        except Exception as exception_error:
-            self.exception_handler(exception_error, True)  # Log error and display failing statement
+        if self.globals[SESSION_RECORDER] is not None:
+            self.stop_session_recording()
 
     def validatePrefsConfigUi(self, values_dict):
         try:
@@ -223,6 +399,21 @@ class Plugin(indigo.PluginBase):
 
             values_dict["announcementTempFolderResolved"] = path
             self.logger.info(f"Announcement Temp Folder: {path}")
+
+            eventCoalesceWindow = values_dict.get("eventCoalesceWindow", "50")
+            if not eventCoalesceWindow.isdigit() or not 0 <= int(eventCoalesceWindow) <= 1000:
+                error_dict = indigo.Dict()
+                error_dict["eventCoalesceWindow"] = "The value of this field must be between 0 and 1000 inclusive."
+                error_dict["showAlertText"] = "Invalid Notification Coalescing Window specified."
+                return False, values_dict, error_dict
+            self.globals[EVENT_COALESCER].window = int(eventCoalesceWindow) / 1000.0
+
+            responseQueueSize = values_dict.get("responseQueueSize", "10000")
+            if not responseQueueSize.isdigit() or not 100 <= int(responseQueueSize) <= 1000000:
+                error_dict = indigo.Dict()
+                error_dict["responseQueueSize"] = "The value of this field must be between 100 and 1000000 inclusive."
+                error_dict["showAlertText"] = "Invalid Response Queue Size specified."
+                return False, values_dict, error_dict
     
             return True
         
@@ -231,32 +422,109 @@ class Plugin(indigo.PluginBase):
 
     def runConcurrentThread(self):
         try:
-            while True:
-                returned_response = self.globals[QUEUES][RETURNED_RESPONSE].get()
-                # self.logger.warning(f"Returned response: {returned_response}")
+            while not self.stopThread:
+                # Wait for a server response, waking at least every 5 seconds to check for a plugin shutdown request,
+                # in time to fail any command sent with send_command whose reply is overdue and to release coalesced notifications
+                timeout = 5.0
+                for deadline in (self.globals[COMMAND_FUTURES].expire(), self.globals[EVENT_COALESCER].seconds_until_flush()):
+                    if deadline is not None:
+                        timeout = min(timeout, deadline)
                 try:
-                    if returned_response[0] != "WAKEUP":
-                        # self.logger.warning(f"RUN_CONCURRENT_THREAD - Returned response: {returned_response}")  # TODO: DEBUG
-                        server_dev_id = returned_response[0]  # Indigo device id of Logitech Media Server
-                        message_type = returned_response[1]  # LISTEN_NOTIFICATION | REPLY_TO_SEND
-                        message = returned_response[2]  # Message received from Logitech Media Server
-                        self.handleSqueezeboxServerResponse(indigo.devices[server_dev_id], message_type, message)
+                    returned_response = self.globals[QUEUES][RETURNED_RESPONSE].get(timeout=timeout)
+                    ready_responses = self.globals[EVENT_COALESCER].add(returned_response)
+                except queue.Empty:
+                    ready_responses = self.globals[EVENT_COALESCER].flush_due()
+
+                for returned_response in ready_responses:
+                    if self.globals[DISPATCH_MODE] == "per_server":
+                        self._routeReturnedResponse(returned_response)
                     else:
-                        if self.stopThread:
-                            pass
-                            # raise self.StopThread         # Plugin shutdown request.
-                        else:
-                            self.globals[TIMERS][RETURNED_RESPONSE] = threading.Timer(5.0, self.signalWakeupQueues, [self.globals[QUEUES][RETURNED_RESPONSE]])
-                            self.globals[TIMERS][RETURNED_RESPONSE].start()
-
-                except Exception as exception_error:
-                    self.exception_handler(exception_error, True)  # Log error and display failing statement
+                        self._dispatchReturnedResponse(returned_response)
 
         except self.StopThread:
             pass
         except Exception as exception_error:
             self.exception_handler(exception_error, True)  # Log error and display failing statement
 
+        for serverDispatcher in self.globals[THREADS][SERVER_DISPATCHER].values():
+            serverDispatcher.stop()
+
+    def _routeReturnedResponse(self, returned_response):
+        try:
+            # Per server dispatch mode: hand the response to the dispatcher thread of its server, which handles that server's
+            # responses in the order received. The dispatchers are only created and looked up here, by runConcurrentThread.
+            server_dev_id = returned_response[0]
+            if server_dev_id in self.globals[SERVERS]:
+                if server_dev_id not in self.globals[THREADS][SERVER_DISPATCHER]:
+                    self.globals[THREADS][SERVER_DISPATCHER][server_dev_id] = ThreadServerDispatcher(self.globals, server_dev_id, self._dispatchReturnedResponse)
+                    self.globals[THREADS][SERVER_DISPATCHER][server_dev_id].start()
+                self.globals[THREADS][SERVER_DISPATCHER][server_dev_id].put(returned_response)
+            else:
+                if returned_response[1] == REPLAY_FINISHED:
+                    for serverDispatcher in self.globals[THREADS][SERVER_DISPATCHER].values():
+                        serverDispatcher.drain()  # Report the replay statistics once every replayed response has been handled
+                self._dispatchReturnedResponse(returned_response)
+
+        except Exception as exception_error:
+            self.exception_handler(exception_error, True)  # Log error and display failing statement
+
+    def _dispatchReturnedResponse(self, returned_response):
+        # A server's responses are handled one at a time, holding the server's lock, whichever thread handles them
+        # (runConcurrentThread or, in per server dispatch mode, the server's dispatcher thread), so the responses of
+        # different servers are handled concurrently in per server dispatch mode.
+        # The device states changed by the handlers are written to the Indigo server once the response has been handled
+        with self._serverLock(returned_response[0]):
+            self.globals[STATE_CACHE].begin_batch()
+            try:
+                if self.globals[DISPATCH_STATISTICS] is None:
+                    self._handleReturnedResponse(returned_response)
+                else:
+                    dispatch_start = time.perf_counter()  # Replaying a recorded session: time each handler
+                    self._handleReturnedResponse(returned_response)
+                    self.globals[DISPATCH_STATISTICS].record_dispatch(returned_response, time.perf_counter() - dispatch_start)
+            finally:
+                self.deviceStatesFlush()
+
+    def _serverLock(self, serverId):
+        # A server's lock is held while one of its responses is handled and while the server, or one of its players, is started,
+        # stopped or updated, so a handler sees a consistent view of its own server and players. Players and servers are added
+        # to / removed from the shared state (PLAYERS, SERVERS, PLAYER_INDEX, SYNC_GROUPS) holding SHARED_STATE_LOCK too, and a
+        # handler iterating all players or servers does so over a copy taken holding it. Locks are taken in that order.
+        return self.globals[SERVER_LOCKS].setdefault(serverId, threading.Lock())
+
+    def _handleReturnedResponse(self, returned_response):
+        try:
+            # self.logger.warning(f"RUN_CONCURRENT_THREAD - Returned response: {returned_response}")  # TODO: DEBUG
+            server_dev_id = returned_response[0]  # Indigo device id of Logitech Media Server
+            message_type = returned_response[1]  # LISTEN_NOTIFICATION | REPLY_TO_SEND | JSON_RPC_RESULT | SERVER_CONNECTION_LOST | SERVER_RECONNECTED | COMMAND_FAILED
+            message = returned_response[2]  # Message received from Logitech Media Server
+            future = returned_response[3] if len(returned_response) > 3 else None  # Future of a command queued by send_command
+            if message_type == REPLAY_FINISHED:
+                self.logger.info(message.report())  # message is the DispatchStatistics of the replay
+                self.globals[DISPATCH_STATISTICS] = None
+            elif message_type == JSON_RPC_RESULT:
+                self.handleSqueezeboxServerJsonResult(indigo.devices[server_dev_id], message)
+            elif message_type == SERVER_CONNECTION_LOST:
+                self.handleSqueezeboxServerConnectionLost(indigo.devices[server_dev_id])
+            elif message_type == SERVER_RECONNECTED:
+                self.handleSqueezeboxServerReconnected(indigo.devices[server_dev_id])
+            elif message_type == COMMAND_FAILED:
+                CommandFutures.set_exception(future, CommandConnectionError(message))
+            else:
+                self.handleSqueezeboxServerResponse(indigo.devices[server_dev_id], message_type, message)  # message is a CliEvent
+                if future is not None:
+                    CommandFutures.set_result(future, message.line)  # Done callbacks run here, after the reply has updated the plugin state
+
+        except Exception as exception_error:
+            self.exception_handler(exception_error, True)  # Log error and display failing statement
+
+    def send_command(self, serverId, command, timeout=None, interactive=False):
+        # Queue a command and return a concurrent.futures.Future resolved with its reply line (as received, still quoted).
+        # Add a done callback to act on the reply: it runs in runConcurrentThread once the reply has been handled as usual.
+        # The future fails with CommandConnectionError if the connection is lost before the reply arrives and, if a timeout
+        # (seconds) is given, with CommandTimeoutError if the reply is overdue.
+        return self.globals[COMMAND_FUTURES].send_command(self.globals[QUEUES][COMMAND_TO_SEND][serverId], command, timeout, interactive)
+
     def _serverConnectedTest(self, dev, plugin_action):
         try:
             if dev is None:
@@ -293,27 +561,31 @@ class Plugin(indigo.PluginBase):
 
     def processPowerOnAll(self, pluginAction, dev):  # Dev is a Squeezebox Server
         try:
-            for selectedPlayerId in self.globals[PLAYERS]:
+            with self.globals[SHARED_STATE_LOCK]:
+                selectedPlayerIds = list(self.globals[PLAYERS])
+            for selectedPlayerId in selectedPlayerIds:
                 self.logger.debug(f"Player [{selectedPlayerId}] has Mac Address '{self.globals[PLAYERS][selectedPlayerId][MAC]}'")
                 if self.globals[PLAYERS][selectedPlayerId][POWER_UI] != "disconnected":   
-                    self.globals[QUEUES][COMMAND_TO_SEND][dev.id].put([self.globals[PLAYERS][selectedPlayerId][MAC] + " power 1"])
+                    self.globals[QUEUES][COMMAND_TO_SEND][dev.id].put([self.globals[PLAYERS][selectedPlayerId][MAC] + " power 1"], interactive=True)
 
         except Exception as exception_error:
             self.exception_handler(exception_error, True)  # Log error and display failing statement
 
     def processPowerOffAll(self, pluginAction, dev):  # Dev is a Squeezebox Server
         try:
-            for selectedPlayerId in self.globals[PLAYERS]:
+            with self.globals[SHARED_STATE_LOCK]:
+                selectedPlayerIds = list(self.globals[PLAYERS])
+            for selectedPlayerId in selectedPlayerIds:
                 self.logger.debug(f"Player [{selectedPlayerId}] has Mac Address '{self.globals[PLAYERS][selectedPlayerId][MAC]}'")
                 if self.globals[PLAYERS][selectedPlayerId][POWER_UI] != "disconnected":
-                    self.globals[QUEUES][COMMAND_TO_SEND][dev.id].put([self.globals[PLAYERS][selectedPlayerId][MAC] + " power 0"])
+                    self.globals[QUEUES][COMMAND_TO_SEND][dev.id].put([self.globals[PLAYERS][selectedPlayerId][MAC] + " power 0"], interactive=True)
         except Exception as exception_error:
             self.exception_handler(exception_error, True)  # Log error and display failing statement
 
     def processPowerOn(self, pluginAction, dev):  # Dev is a Squeezebox Player
         try:
             if self._playerConnectedTest(dev, pluginAction):
-                self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][dev.id][SERVER_ID]].put([self.globals[PLAYERS][dev.id][MAC] + " power 1"])
+                self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][dev.id][SERVER_ID]].put([self.globals[PLAYERS][dev.id][MAC] + " power 1"], interactive=True)
 
         except Exception as exception_error:
             self.exception_handler(exception_error, True)  # Log error and display failing statement
@@ -321,7 +593,7 @@ class Plugin(indigo.PluginBase):
     def processPowerOff(self, pluginAction, dev):  # Dev is a Squeezebox Player
         try:
             if self._playerConnectedTest(dev, pluginAction):
-                self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][dev.id][SERVER_ID]].put([self.globals[PLAYERS][dev.id][MAC] + " power 0"])
+                self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][dev.id][SERVER_ID]].put([self.globals[PLAYERS][dev.id][MAC] + " power 0"], interactive=True)
 
         except Exception as exception_error:
             self.exception_handler(exception_error, True)  # Log error and display failing statement
@@ -329,7 +601,7 @@ class Plugin(indigo.PluginBase):
     def processPowerToggleOnOff(self, pluginAction, dev):  # Dev is a Squeezebox Player
         try:
             if self._playerConnectedTest(dev, pluginAction):
-                self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][dev.id][SERVER_ID]].put([self.globals[PLAYERS][dev.id][MAC] + " power"])
+                self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][dev.id][SERVER_ID]].put([self.globals[PLAYERS][dev.id][MAC] + " power"], interactive=True)
 
         except Exception as exception_error:
             self.exception_handler(exception_error, True)  # Log error and display failing statement
@@ -337,28 +609,28 @@ class Plugin(indigo.PluginBase):
     def processPlay(self, pluginAction, dev):  # Dev is a Squeezebox Player
         try:
             if self._playerConnectedTest(dev, pluginAction):
-                self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][dev.id][SERVER_ID]].put([self.globals[PLAYERS][dev.id][MAC] + " play"])
+                self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][dev.id][SERVER_ID]].put([self.globals[PLAYERS][dev.id][MAC] + " play"], interactive=True)
         except Exception as exception_error:
             self.exception_handler(exception_error, True)  # Log error and display failing statement
 
     def processStop(self, pluginAction, dev):  # Dev is a Squeezebox Player
         try:
             if self._playerConnectedTest(dev, pluginAction):
-                self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][dev.id][SERVER_ID]].put([self.globals[PLAYERS][dev.id][MAC] + " stop"])
+                self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][dev.id][SERVER_ID]].put([self.globals[PLAYERS][dev.id][MAC] + " stop"], interactive=True)
         except Exception as exception_error:
             self.exception_handler(exception_error, True)  # Log error and display failing statement
 
     def processPause(self, pluginAction, dev):  # Dev is a Squeezebox Player
         try:
             if self._playerConnectedTest(dev, pluginAction):
-                self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][dev.id][SERVER_ID]].put([self.globals[PLAYERS][dev.id][MAC] + " pause"])
+                self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][dev.id][SERVER_ID]].put([self.globals[PLAYERS][dev.id][MAC] + " pause"], interactive=True)
         except Exception as exception_error:
             self.exception_handler(exception_error, True)  # Log error and display failing statement
 
     def processForward(self, pluginAction, dev):  # Dev is a Squeezebox Player
         try:
             if self._playerConnectedTest(dev, pluginAction):
-                self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][dev.id][SERVER_ID]].put([self.globals[PLAYERS][dev.id][MAC] + " button fwd"])
+                self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][dev.id][SERVER_ID]].put([self.globals[PLAYERS][dev.id][MAC] + " button fwd"], interactive=True)
 
         except Exception as exception_error:
             self.exception_handler(exception_error, True)  # Log error and display failing statement
@@ -366,7 +638,7 @@ class Plugin(indigo.PluginBase):
     def processRewind(self, pluginAction, dev):  # Dev is a Squeezebox Player
         try:
             if self._playerConnectedTest(dev, pluginAction):
-                self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][dev.id][SERVER_ID]].put([self.globals[PLAYERS][dev.id][MAC] + " button rew"])
+                self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][dev.id][SERVER_ID]].put([self.globals[PLAYERS][dev.id][MAC] + " button rew"], interactive=True)
 
         except Exception as exception_error:
             self.exception_handler(exception_error, True)  # Log error and display failing statement
@@ -376,7 +648,7 @@ class Plugin(indigo.PluginBase):
             if self._playerConnectedTest(dev, pluginAction):
                 volume = pluginAction.props.get("volumeSetValue")
                 if self._validateVolume(volume):
-                    self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][dev.id][SERVER_ID]].put([self.globals[PLAYERS][dev.id][MAC] + " mixer volume " + volume])
+                    self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][dev.id][SERVER_ID]].put([self.globals[PLAYERS][dev.id][MAC] + " mixer volume " + volume], interactive=True)
                 else:
                     self.logger.error(f"Set volume of '{dev.name}' to value of '{volume}' is invalid")
         except Exception as exception_error:
@@ -406,7 +678,7 @@ class Plugin(indigo.PluginBase):
                             if (volume % volumeIncreaseValue) != 0:
                                 volumeIncreaseValue = volumeIncreaseValue - (volume % volumeIncreaseValue)
 
-                    self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][dev.id][SERVER_ID]].put([self.globals[PLAYERS][dev.id][MAC] + " mixer volume +" + str(volumeIncreaseValue)])
+                    self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][dev.id][SERVER_ID]].put([self.globals[PLAYERS][dev.id][MAC] + " mixer volume +" + str(volumeIncreaseValue)], interactive=True)
 
         except Exception as exception_error:
             self.exception_handler(exception_error, True)  # Log error and display failing statement
@@ -425,7 +697,7 @@ class Plugin(indigo.PluginBase):
                         if (volume % volumeDecreaseValue) != 0:
                             volumeDecreaseValue = (volume % volumeDecreaseValue)
 
-                    self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][dev.id][SERVER_ID]].put([self.globals[PLAYERS][dev.id][MAC] + " mixer volume -" + str(volumeDecreaseValue)])
+                    self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][dev.id][SERVER_ID]].put([self.globals[PLAYERS][dev.id][MAC] + " mixer volume -" + str(volumeDecreaseValue)], interactive=True)
 
         except Exception as exception_error:
             self.exception_handler(exception_error, True)  # Log error and display failing statement
@@ -434,9 +706,11 @@ class Plugin(indigo.PluginBase):
         try:
             if self._playerConnectedTest(dev, pluginAction):
                 if pluginAction.props.get("volumeMuteAll", False):
-                    self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][dev.id][SERVER_ID]].put([self.globals[PLAYERS][dev.id][MAC] + " autologMixerMuteAll"])
+                    # Refresh the sync groups first so that every player currently synced with this one is processed
+                    syncGroupsFuture = self.send_command(self.globals[PLAYERS][dev.id][SERVER_ID], "syncgroups ?", interactive=True)
+                    syncGroupsFuture.add_done_callback(lambda future, devId=dev.id: self._playerMixerMutingAll(future, devId, "1"))
                 else:
-                    self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][dev.id][SERVER_ID]].put([self.globals[PLAYERS][dev.id][MAC] + " mixer muting 1"])
+                    self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][dev.id][SERVER_ID]].put([self.globals[PLAYERS][dev.id][MAC] + " mixer muting 1"], interactive=True)
 
         except Exception as exception_error:
             self.exception_handler(exception_error, True)  # Log error and display failing statement
@@ -445,9 +719,11 @@ class Plugin(indigo.PluginBase):
         try:
             if self._playerConnectedTest(dev, pluginAction):
                 if pluginAction.props.get("volumeUnmuteAll", False):
-                    self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][dev.id][SERVER_ID]].put([self.globals[PLAYERS][dev.id][MAC] + " autologMixerUnmuteAll"])
+                    # Refresh the sync groups first so that every player currently synced with this one is processed
+                    syncGroupsFuture = self.send_command(self.globals[PLAYERS][dev.id][SERVER_ID], "syncgroups ?", interactive=True)
+                    syncGroupsFuture.add_done_callback(lambda future, devId=dev.id: self._playerMixerMutingAll(future, devId, "0"))
                 else:
-                    self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][dev.id][SERVER_ID]].put([self.globals[PLAYERS][dev.id][MAC] + " mixer muting 0"])
+                    self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][dev.id][SERVER_ID]].put([self.globals[PLAYERS][dev.id][MAC] + " mixer muting 0"], interactive=True)
 
         except Exception as exception_error:
             self.exception_handler(exception_error, True)  # Log error and display failing statement
@@ -456,9 +732,11 @@ class Plugin(indigo.PluginBase):
         try:
             if self._playerConnectedTest(dev, pluginAction):
                 if pluginAction.props.get("volumeToggleMuteAll", False):
-                    self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][dev.id][SERVER_ID]].put([self.globals[PLAYERS][dev.id][MAC] + " autologMixerToggleMuteAll"])
+                    # Refresh the sync groups first so that every player currently synced with this one is processed
+                    syncGroupsFuture = self.send_command(self.globals[PLAYERS][dev.id][SERVER_ID], "syncgroups ?", interactive=True)
+                    syncGroupsFuture.add_done_callback(lambda future, devId=dev.id: self._playerMixerMutingAll(future, devId, "toggle"))
                 else:
-                    self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][dev.id][SERVER_ID]].put([self.globals[PLAYERS][dev.id][MAC] + " mixer muting toggle"])
+                    self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][dev.id][SERVER_ID]].put([self.globals[PLAYERS][dev.id][MAC] + " mixer muting toggle"], interactive=True)
 
         except Exception as exception_error:
             self.exception_handler(exception_error, True)  # Log error and display failing statement
@@ -466,7 +744,7 @@ class Plugin(indigo.PluginBase):
     def processPlayPreset(self, pluginAction, dev):  # Dev is a Squeezebox Player
         try:
             if self._playerConnectedTest(dev, pluginAction):
-                self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][dev.id][SERVER_ID]].put([self.globals[PLAYERS][dev.id][MAC] + " button playPreset_" + pluginAction.props.get("preset")])
+                self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][dev.id][SERVER_ID]].put([self.globals[PLAYERS][dev.id][MAC] + " button playPreset_" + pluginAction.props.get("preset")], interactive=True)
 
         except Exception as exception_error:
             self.exception_handler(exception_error, True)  # Log error and display failing statement
@@ -474,7 +752,7 @@ class Plugin(indigo.PluginBase):
     def processPlayFavorite(self, pluginAction, dev):  # Dev is a Squeezebox Player
         try:
             if self._playerConnectedTest(dev, pluginAction):
-               self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][dev.id][SERVER_ID]].put([self.globals[PLAYERS][dev.id][MAC] + " favorites playlist play item_id:" + pluginAction.props.get("favorite")])
+               self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][dev.id][SERVER_ID]].put([self.globals[PLAYERS][dev.id][MAC] + " favorites playlist play item_id:" + pluginAction.props.get("favorite")], interactive=True)
 
         except Exception as exception_error:
             self.exception_handler(exception_error, True)  # Log error and display failing statement
@@ -486,18 +764,36 @@ class Plugin(indigo.PluginBase):
                     self.logger.info(f"Play Playlist ['{pluginAction.props.get('playlist')}'] requested for '{dev.name}'.")
 
                     self.playlistFile = str(pluginAction.props.get("playlist")).replace(" ", "%20")
-                    self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][dev.id][SERVER_ID]].put([
-                        f"readdirectory 0 1 autologFunction:PlaylistCheck autologDevice:{str(dev.id)} folder:{os.path.dirname(self.playlistFile)} filter:{os.path.basename(self.playlistFile)}"])
+                    playlistCheckFuture = self.send_command(self.globals[PLAYERS][dev.id][SERVER_ID],
+                        f"readdirectory 0 1 folder:{os.path.dirname(self.playlistFile)} filter:{os.path.basename(self.playlistFile)}", interactive=True)
+                    playlistCheckFuture.add_done_callback(lambda future, devId=dev.id: self._playerPlaylistChecked(future, devId))
                 else:
                     self.logger.error(f"Play Playlist not actioned for '{dev.name}' as playlist ['{pluginAction.props.get('playlist')}'] not found.")
 
         except Exception as exception_error:
             self.exception_handler(exception_error, True)  # Log error and display failing statement
 
+    def _playerPlaylistChecked(self, future, devId):  # Done callback of the playlist readdirectory check
+        try:
+            if future.exception() is not None:
+                self.logger.error(f"Play Playlist on '{indigo.devices[devId].name}' not actioned: {future.exception()}")
+                return
+
+            readDirectory = self._readDirectoryParse(future.result())
+            if readDirectory.get("count", "") == "1":
+                self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][devId][SERVER_ID]].put([
+                    self.globals[PLAYERS][devId][MAC] + " playlist play " + str(readDirectory.get("path", "")).replace(" ", "%20")], interactive=True)
+            else:
+                self.logger.error(
+                    f"Playlist File [{readDirectory.get('folder', '')}/{readDirectory.get('filter', '')}] not found. Play Playlist on '{indigo.devices[devId].name}' not actioned.")
+
+        except Exception as exception_error:
+            self.exception_handler(exception_error, True)  # Log error and display failing statement
+
     def processClearPlaylist(self, pluginAction, dev):  # Dev is a Squeezebox Player
         try:
             if self._playerConnectedTest(dev, pluginAction):
-                self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][dev.id][SERVER_ID]].put([self.globals[PLAYERS][dev.id][MAC] + " playlist clear"])
+                self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][dev.id][SERVER_ID]].put([self.globals[PLAYERS][dev.id][MAC] + " playlist clear"], interactive=True)
 
         except Exception as exception_error:
             self.exception_handler(exception_error, True)  # Log error and display failing statement
@@ -518,7 +814,7 @@ class Plugin(indigo.PluginBase):
                     case _:
                         optionShuffle = ""
 
-                self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][dev.id][SERVER_ID]].put([self.globals[PLAYERS][dev.id][MAC] + " playlist shuffle " + optionShuffle])
+                self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][dev.id][SERVER_ID]].put([self.globals[PLAYERS][dev.id][MAC] + " playlist shuffle " + optionShuffle], interactive=True)
 
         except Exception as exception_error:
             self.exception_handler(exception_error, True)  # Log error and display failing statement
@@ -538,7 +834,7 @@ class Plugin(indigo.PluginBase):
                         optionRepeat = ""
                     case _:
                         optionRepeat = ""
-                self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][dev.id][SERVER_ID]].put([f"{self.globals[PLAYERS][dev.id][MAC]} playlist repeat {optionRepeat}"])  # noqa
+                self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][dev.id][SERVER_ID]].put([f"{self.globals[PLAYERS][dev.id][MAC]} playlist repeat {optionRepeat}"], interactive=True)  # noqa
 
         except Exception as exception_error:
             self.exception_handler(exception_error, True)  # Log error and display failing statement
@@ -624,7 +920,7 @@ class Plugin(indigo.PluginBase):
     def processPlayerRawCommand(self, pluginAction, dev):  # Dev is a Squeezebox Player
         try:
             if self._playerConnectedTest(dev, pluginAction):
-                self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][dev.id][SERVER_ID]].put([self.globals[PLAYERS][dev.id][MAC] + " " + pluginAction.props.get("rawPlayerCommand")])
+                self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][dev.id][SERVER_ID]].put([self.globals[PLAYERS][dev.id][MAC] + " " + pluginAction.props.get("rawPlayerCommand")], interactive=True)
 
         except Exception as exception_error:
             self.exception_handler(exception_error, True)  # Log error and display failing statement
@@ -632,7 +928,7 @@ class Plugin(indigo.PluginBase):
     def processServerRawCommand(self, pluginAction, dev):  # Dev is a Squeezebox Server
         try:
             if self._serverConnectedTest(dev, pluginAction):
-                self.globals[QUEUES][COMMAND_TO_SEND][dev.id].put([pluginAction.props.get("rawServerCommand")])
+                self.globals[QUEUES][COMMAND_TO_SEND][dev.id].put([pluginAction.props.get("rawServerCommand")], interactive=True)
 
         except Exception as exception_error:
             self.exception_handler(exception_error, True)  # Log error and display failing statement
@@ -703,154 +999,177 @@ class Plugin(indigo.PluginBase):
         except Exception as exception_error:
             self.exception_handler(exception_error, True)  # Log error and display failing statement
 
-    def handleSqueezeboxServerResponse(self, dev, processSqueezeboxFunction, responseFromSqueezeboxServer):
+    def handleSqueezeboxServerResponse(self, dev, processSqueezeboxFunction, serverEvent):
         try:
-            response_items = responseFromSqueezeboxServer.split(" ")
-            response_output = "Response From Squeezebox Server:\n"
-            response_item_count = 0
-            for response_item in response_items:
-                response_item_count_ui = f"0{str(response_item_count)}"[-2:]
-                response_item = urllib.parse.unquote(response_item)
-                response_output += f"  {response_item_count_ui} {response_item}\n"
-                response_item_count += 1  # For next response item
-            response_output += "------------------"
-            # self.logger.info(response_output)  # TODO: DEBUG
+            # serverEvent is a CliEvent (see cliEvents.py): the line has already been tokenized by the thread that received it
+            # self.logger.info(f"Response From Squeezebox Server: {serverEvent.fields}")  # TODO: DEBUG
 
-            try:
-                response_keyword, response_keyword_2, response_data = responseFromSqueezeboxServer.split(" ", 2)
-                response_keyword = urllib.parse.unquote(response_keyword)
-                response_keyword_2 = urllib.parse.unquote(response_keyword_2)
-            except ValueError:
-                try:
-                    response_data = ""
-                    response_keyword, response_keyword_2 = responseFromSqueezeboxServer.split(" ", 1)
-                    response_keyword = urllib.parse.unquote(response_keyword)
-                    response_keyword_2 = urllib.parse.unquote(response_keyword_2)
-                except ValueError:
-                    response_keyword_2 = ""
-                    response_keyword = responseFromSqueezeboxServer
-                    response_keyword = urllib.parse.unquote(response_keyword)
+            ctx = HandlerContext(serverEvent, indigo.server.getTime())  # This response's state, passed to each handler
 
-            self.currentTime = indigo.server.getTime()
+            # self.logger.info(f"handleSqueezeboxServerResponse: [{processSqueezeboxFunction}] {ctx.responseFromSqueezeboxServer.rstrip()}")  # TODO: DEBUG
+            # self.logger.info(f"HANDLE SERVER RESPONSE: KW1 = [{ctx.serverResponseKeyword}], KW2 = [{ctx.serverResponseKeyword2}]")  # TODO: DEBUG
 
-            self.responseFromSqueezeboxServer = urllib.parse.unquote(responseFromSqueezeboxServer)
+            #
+            # Process response from server by looking up the handler for its command path (see registerResponseHandlers)
+            #
+            #   ctx.responseFromSqueezeboxServer and ctx.serverResponse available to each handler (see handlerContext.py)
+            #
 
-            # self.logger.info(f"handleSqueezeboxServerResponse: [{processSqueezeboxFunction}] {self.responseFromSqueezeboxServer.rstrip()}")  # TODO: DEBUG
+            if serverEvent.kind == PLAYER_EVENT:  # i.e. the response is something like "00:04:20:aa:bb:cc mode play" and is a response for a Player
+                self._handle_player(ctx, dev)  # dev = squeezebox server
+            else:
+                handler = self.globals[DISPATCH_TABLES][SERVERS].lookup(serverEvent.path)
+                if handler is not None:
+                    handler(ctx, dev)  # dev = squeezebox server
 
-            self.serverResponse = self.responseFromSqueezeboxServer.split()
+        except Exception as exception_error:
+            self.exception_handler(exception_error, True)  # Log error and display failing statement
 
-            self.serverResponseKeyword = self.serverResponse[0]
-            try:
-                self.serverResponseKeyword2 = self.serverResponse[1]
-            except:
-                self.serverResponseKeyword2 = ""
-            # self.logger.info(f"HANDLE SERVER RESPONSE: KW1 = [{self.serverResponseKeyword}], KW2 = [{self.serverResponseKeyword2}]")  # TODO: DEBUG
+    def handleSqueezeboxServerConnectionLost(self, devServer):
+        try:
+            # Posted once per outage by the transport, when the first of the server's connections is lost (see serverConnections.py).
+            # The server and its players are marked disconnected here, holding the server's lock like every other state change.
+            # The players that were connected are refreshed when the server is reconnected (see handleSqueezeboxServerReconnected).
+            if devServer.id not in self.globals[SERVERS]:
+                return
 
-            #
-            # Process response from server by analysing response and calling relevant handler
-            #
-            #   self.responseFromSqueezeboxServer  and self.serverResponse available to each handler (no need to pass as parameter)
-            #
+            self.globals[SERVERS][devServer.id][STATUS] = "unavailable"
+            self.deviceStateWrite(devServer, "status", self.globals[SERVERS][devServer.id][STATUS])
+
+            with self.globals[SHARED_STATE_LOCK]:
+                players = list(self.globals[PLAYERS].items())  # Players may be started / stopped meanwhile
+            for playerDevId, player in players:
+                if player[SERVER_ID] == devServer.id:
+                    if player[POWER_UI] != "disconnected":
+                        self.globals[SERVERS][devServer.id][RESYNC_PLAYER_IDS].add(playerDevId)  # Last known state may be out of date on reconnect
+                    player[POWER_UI] = "disconnected"
+                    self.deviceStatesWrite(playerDevId, [{"key": "power", "value": player[POWER_UI]}, {"key": "state", "value": player[POWER_UI]}])
+                    self.deviceStateImageWrite(playerDevId, indigo.kStateImageSel.PowerOff)
+
+        except Exception as exception_error:
+            self.exception_handler(exception_error, True)  # Log error and display failing statement
+
+    def handleSqueezeboxServerReconnected(self, devServer):
+        try:
+            # All of the server's connections have been re-established after one was lost. Rather than rerunning the full discovery,
+            # only the players that were connected when the connection was lost are refreshed (changes while disconnected were missed).
+            # Players are only enumerated again if the server's player count has changed (see _handle_serverstatus).
+            if devServer.id not in self.globals[SERVERS]:
+                return
+
+            resyncPlayerIds = self.globals[SERVERS][devServer.id][RESYNC_PLAYER_IDS]
+            self.globals[SERVERS][devServer.id][RESYNC_PLAYER_IDS] = set()
+            self.globals[SERVERS][devServer.id][RESYNC_PENDING] = True
+
+            self.logger.info(f"Reconnected to '{devServer.name}': resynchronising {len(resyncPlayerIds)} player(s)")
+
+            self.globals[QUEUES][COMMAND_TO_SEND][devServer.id].put(["serverstatus 0 0 subscribe:0"])  # Marks the server as connected
+            self.globals[QUEUES][COMMAND_TO_SEND][devServer.id].put(["syncgroups ?"])
+            for playerId in resyncPlayerIds:
+                if playerId in self.globals[PLAYERS]:
+                    self._playerQueueStatusRefresh(devServer.id, self.globals[PLAYERS][playerId][MAC])
+                    self.globals[QUEUES][COMMAND_TO_SEND][devServer.id].put([self.globals[PLAYERS][playerId][MAC] + " playerpref maintainSync ?"])
+
+        except Exception as exception_error:
+            self.exception_handler(exception_error, True)  # Log error and display failing statement
+
+    def handleSqueezeboxServerJsonResult(self, devServer, jsonResult):
+        try:
+            # jsonResult = [player MAC, command list, result dictionary] from a JSON-RPC "slim.request"
+            playerMac, command, result = jsonResult
+
+            playerDevId = self.globals[PLAYER_INDEX].dev_id(playerMac)
+            if playerDevId == 0:
+                return  # Player no longer known
+            devPlayer = indigo.devices[playerDevId]
+
+            ctx = HandlerContext(currentTime=indigo.server.getTime())
+            self._playerSetReplyContext(ctx, devPlayer)
 
-            match self.serverResponseKeyword:
-                case "serverstatus":
-                    self._handle_serverstatus(dev)  # dev = squeezebox server
-                case "syncgroups":
-                    self._handle_syncgroups(dev)  # dev = squeezebox server
-                case "players":
-                    self._handle_players(dev, response_items)  # dev = squeezebox server
-                case "player":
-                    if self.serverResponseKeyword2 == "id":
-                        self._handle_player_id(dev)  # dev = squeezebox server
-                case "readdirectory":
-                    self._handle_readdirectory(dev)  # dev = squeezebox server
+            match command[0]:
+                case "status":
+                    # Values are JSON typed (e.g. "power": 1); convert to the strings the CLI replies would have contained
+                    playerStatus = {key: str(value) for key, value in result.items() if not isinstance(value, (list, dict))}
+                    currentTrack = dict()
+                    for track in result.get("playlist_loop", list()):
+                        if str(track.get("playlist index")) == playerStatus.get("playlist_cur_index"):
+                            currentTrack = {key: str(value) for key, value in track.items()}
+                            break
+                    self._playerUpdateFromStatus(ctx, devServer, devPlayer, playerStatus, currentTrack)
                 case _:
-                    if response_keyword[2:3] == ":":  # i.e. the response is something like "00:04:20:aa:bb:cc mode play" and is a response for a Player
-                        self._handle_player(dev)  # dev = squeezebox server
+                    self.logger.debug(f"JSON-RPC result for '{devPlayer.name}' not handled: {command} = {result}")
 
         except Exception as exception_error:
             self.exception_handler(exception_error, True)  # Log error and display failing statement
 
-    def _handle_serverstatus(self, dev):  # dev = squeezebox server
+    def _handle_serverstatus(self, ctx, dev):  # dev = squeezebox server
         try:
             self.globals[SERVERS][dev.id][STATUS] = "connected"
-            dev.updateStateOnServer(key="status", value=self.globals[SERVERS][dev.id][STATUS])
-            dev.updateStateImageOnServer(indigo.kStateImageSel.PowerOn)
+            self.deviceStateWrite(dev, "status", self.globals[SERVERS][dev.id][STATUS])
+            self.deviceStateImageWrite(dev, indigo.kStateImageSel.PowerOn)
 
-            self.responseToCommandServerstatus = re.findall(r"([^:]*:[^ ]*) *", self.responseFromSqueezeboxServer)  # Split the response into n times "AAAA : BBBB"
+            serverStatus = TaggedResponse(ctx.serverEvent.args, SERVERSTATUS_RECORD_KEY)  # Header only: any player records follow it
 
-            for self.serverstatusResponseEntry in self.responseToCommandServerstatus:
-                self.serverstatusResponseEntryElements = self.serverstatusResponseEntry.partition(":")
-
-                match self.serverstatusResponseEntryElements[0]:
+            for serverStatusKey, serverStatusValue in serverStatus.items():
+                match serverStatusKey:
                     case "lastscan":
-                        self.globals[SERVERS][dev.id][LAST_SCAN] = datetime.datetime.fromtimestamp(int(self.serverstatusResponseEntryElements[2])).strftime("%Y-%b-%d %H:%M:%S")
-                        dev.updateStateOnServer(key="lastScan", value=self.globals[SERVERS][dev.id][LAST_SCAN])
+                        self.globals[SERVERS][dev.id][LAST_SCAN] = datetime.datetime.fromtimestamp(int(serverStatusValue)).strftime("%Y-%b-%d %H:%M:%S")
+                        self.deviceStateWrite(dev, "lastScan", self.globals[SERVERS][dev.id][LAST_SCAN])
                     case "version":
-                        self.globals[SERVERS][dev.id][VERSION] = self.serverstatusResponseEntryElements[2]
-                        dev.updateStateOnServer(key="version", value=self.globals[SERVERS][dev.id][VERSION])
+                        self.globals[SERVERS][dev.id][VERSION] = serverStatusValue
+                        self.deviceStateWrite(dev, "version", self.globals[SERVERS][dev.id][VERSION])
                     case "info total albums":
-                        self.globals[SERVERS][dev.id][TOTAL_ALBUMS] = self.serverstatusResponseEntryElements[2]
-                        dev.updateStateOnServer(key="totalAlbums", value=self.globals[SERVERS][dev.id][TOTAL_ALBUMS])
+                        self.globals[SERVERS][dev.id][TOTAL_ALBUMS] = serverStatusValue
+                        self.deviceStateWrite(dev, "totalAlbums", self.globals[SERVERS][dev.id][TOTAL_ALBUMS])
                     case "info total artists":
-                        self.globals[SERVERS][dev.id][TOTAL_ARTISTS] = self.serverstatusResponseEntryElements[2]
-                        dev.updateStateOnServer(key="totalArtists", value=self.globals[SERVERS][dev.id][TOTAL_ARTISTS])
+                        self.globals[SERVERS][dev.id][TOTAL_ARTISTS] = serverStatusValue
+                        self.deviceStateWrite(dev, "totalArtists", self.globals[SERVERS][dev.id][TOTAL_ARTISTS])
                     case "info total genres":
-                        self.globals[SERVERS][dev.id][TOTAL_GENRES] = self.serverstatusResponseEntryElements[2]
-                        dev.updateStateOnServer(key="totalGenres", value=self.globals[SERVERS][dev.id][TOTAL_GENRES])
+                        self.globals[SERVERS][dev.id][TOTAL_GENRES] = serverStatusValue
+                        self.deviceStateWrite(dev, "totalGenres", self.globals[SERVERS][dev.id][TOTAL_GENRES])
                     case "info total songs":
-                        self.globals[SERVERS][dev.id][TOTAL_SONGS] = self.serverstatusResponseEntryElements[2]
-                        dev.updateStateOnServer(key="totalSongs", value=self.globals[SERVERS][dev.id][TOTAL_SONGS])
+                        self.globals[SERVERS][dev.id][TOTAL_SONGS] = serverStatusValue
+                        self.deviceStateWrite(dev, "totalSongs", self.globals[SERVERS][dev.id][TOTAL_SONGS])
                     case "player count":
-                        self.globals[SERVERS][dev.id][PLAYER_COUNT] = self.serverstatusResponseEntryElements[2]
+                        previousPlayerCount = self.globals[SERVERS][dev.id].get(PLAYER_COUNT)
+                        self.globals[SERVERS][dev.id][PLAYER_COUNT] = serverStatusValue
+                        if self.globals[SERVERS][dev.id][RESYNC_PENDING] and previousPlayerCount == self.globals[SERVERS][dev.id][PLAYER_COUNT]:
+                            continue  # Reconnected with the same players: those needing it are already being resynchronised
                         loop = 0
-                        while loop < int(self.serverstatusResponseEntryElements[2]):
+                        while loop < int(serverStatusValue):
                             self.globals[QUEUES][COMMAND_TO_SEND][dev.id].put(["players " + str(loop) +" 1"])
                             loop += 1
 
-                self.logger.debug(
-                    f"  = {self.serverstatusResponseEntry} [1={self.serverstatusResponseEntryElements[0]}] [2={self.serverstatusResponseEntryElements[1]}] [3={self.serverstatusResponseEntryElements[2]}]")
+                self.logger.debug(f"  = [{serverStatusKey}] = [{serverStatusValue}]")
+
+            self.globals[SERVERS][dev.id][RESYNC_PENDING] = False
 
         except Exception as exception_error:
             self.exception_handler(exception_error, True)  # Log error and display failing statement
 
-    def _handle_syncgroups(self, dev):  # dev = squeezebox server
+    def _handle_syncgroups(self, ctx, dev):  # dev = squeezebox server
         try:
-            self._playerRemoveSyncMaster()  # Set Sync master / slave off for all players
-
-            for self.syncInfo in self.responseFromSqueezeboxServer.split("sync_"):
-                if self.syncInfo[0:8] == "members:":
-                    self.syncMembers = self.syncInfo[8:].split(",")
-                    self.masterDevId = 0
-                    for self.syncMember in self.syncMembers:
-                        if self.masterDevId == 0:
-                            self.masterMAC = self.syncMember.rstrip()
-                            self.masterDevId = self._playerMACToDeviceId(self.syncMember.rstrip())
-                            self.globals[PLAYERS][self.masterDevId][MASTER_PLAYER_ID] = 0
-                            self.globals[PLAYERS][self.masterDevId][MASTER_PLAYER_ADDRESS] = ""
-
-                            self.logger.debug(f"SyncMaster = '{self.syncMember}' = '{self.masterDevId}'")
-                        else:
-                            self.slaveDevId = self._playerMACToDeviceId(self.syncMember.rstrip())
-                            self.globals[PLAYERS][self.slaveDevId ][MASTER_PLAYER_ID] = self.masterDevId
-                            self.globals[PLAYERS][self.slaveDevId ][MASTER_PLAYER_ADDRESS] = self.masterMAC
-                            self.globals[PLAYERS][self.slaveDevId ][SLAVE_PLAYER_IDS] = []
-                            self.globals[PLAYERS][self.masterDevId][SLAVE_PLAYER_IDS].append(self.slaveDevId)
+            syncGroups = list()
+            for syncInfo in ctx.responseFromSqueezeboxServer.split("sync_"):
+                if syncInfo[0:8] == "members:":
+                    # The first member is the master. Players not started in Indigo are left out; a group whose master isn't started is ignored.
+                    syncMembers = [self._playerMACToDeviceId(syncMember.strip()) for syncMember in syncInfo[8:].split(",")]
+                    if syncMembers[0] != 0:
+                        syncGroups.append([syncMember for syncMember in syncMembers if syncMember != 0])
 
-                            self.logger.debug(f"slavePlayerIds = '{self.globals[PLAYERS][self.masterDevId][SLAVE_PLAYER_IDS]}'")
+            changedPlayerIds = self.globals[SYNC_GROUPS].apply(dev.id, syncGroups)
+            self.logger.debug(f"Sync groups = {syncGroups}, changed players = {changedPlayerIds}")
 
-            self._playerUpdateSync()
+            self._playerUpdateSync(changedPlayerIds)
 
         except Exception as exception_error:
             self.exception_handler(exception_error, True)  # Log error and display failing statement
 
-    def _handle_players(self, dev, response_items):  # dev = squeezebox server
+    def _handle_players(self, ctx, dev):  # dev = squeezebox server
         try:
-            # self.logger.info(f"_HANDLE_PLAYERS:\n{self.responseFromSqueezeboxServer}\n")  # TODO: DEBUG
+            # self.logger.info(f"_HANDLE_PLAYERS:\n{ctx.responseFromSqueezeboxServer}\n")  # TODO: DEBUG
             playerInfo = dict()
 
-            # for response_item in response_items:
-
             playerInfo[NAME] = "Not specified"
             playerInfo[MODEL] = "Unknown"
             playerInfo[IP_ADDRESS] = "Unknown"
@@ -858,13 +1177,12 @@ class Plugin(indigo.PluginBase):
             playerInfo[POWER_UI] = "disconnected"
             playerInfo[PLAYER_ID] = "disconnected"
 
-            self.serverResponsePlayersElementName = re.findall(r"(?<=name:)(.*) seq_no:", self.responseFromSqueezeboxServer)
+            # "players <n> 1" replies with a single player record e.g. "players 0 1 count:2 playerindex:0 playerid:... ip:... name:... model:baby ... connected:1"
+            playerRecord = next(TaggedResponse(ctx.serverEvent.args, PLAYERS_RECORD_KEY).records(), dict())
 
-            playerInfo[NAME] = self.serverResponsePlayersElementName[0]
-    
-            self.serverResponsePlayersElementModel = re.findall(r"(?<=model:)(.*) modelname:", self.responseFromSqueezeboxServer)
-     
-            playerInfo[MODEL] = self.serverResponsePlayersElementModel[0]
+            playerInfo[NAME] = playerRecord.get("name", playerInfo[NAME])
+
+            playerInfo[MODEL] = playerRecord.get("model", playerInfo[MODEL])
             match playerInfo[MODEL]:
                 case "baby":
                     playerInfo[MODEL] = "Squeezebox Radio"
@@ -879,33 +1197,16 @@ class Plugin(indigo.PluginBase):
 
             self.logger.debug(str(f"DISCONNECT DEBUG [MODEL]: {playerInfo[MODEL]}"))
 
-            self.serverResponsePlayers = re.findall(r"([^:]*:[^ ]*) *", self.responseFromSqueezeboxServer.rstrip())
-
-            for self.serverResponsePlayersEntry in self.serverResponsePlayers:
-                self.logger.debug(str(f"DISCONNECT DEBUG [ENTRY]: {self.serverResponsePlayersEntry}"))
-                self.serverResponsePlayersEntryElements = self.serverResponsePlayersEntry.partition(":")
-
-                match self.serverResponsePlayersEntryElements[0]:
-                    case "playerid":
-                        playerInfo[PLAYER_ID] = self.serverResponsePlayersEntryElements[2]
-                    case "ip":
-                        self.serverStatusAddressElements = self.serverResponsePlayersEntryElements[2].partition(":")
-                        playerInfo[IP_ADDRESS] = self.serverStatusAddressElements[0]
-                        playerInfo[PORT] = self.serverStatusAddressElements[2]
-                    case "connected":
-                        self.logger.debug(f"DISCONNECT DEBUG [CONNECTED]: {self.serverResponsePlayersEntryElements[2]}")
-                        if self.serverResponsePlayersEntryElements[2] == "1":
-                            playerInfo[CONNECTED] = True  # Player is connected
-                        else:
-                            playerInfo[CONNECTED] = False  # Player is disconnected
+            playerInfo[PLAYER_ID] = playerRecord.get("playerid", playerInfo[PLAYER_ID])
+            if "ip" in playerRecord:
+                playerInfo[IP_ADDRESS], separator, playerInfo[PORT] = playerRecord["ip"].partition(":")  # e.g. "10.0.1.5:3483"
+            self.logger.debug(f"DISCONNECT DEBUG [CONNECTED]: {playerRecord.get('connected')}")
+            playerInfo[CONNECTED] = playerRecord.get("connected") == "1"  # Player is connected / disconnected
 
-            self.playerKnown = False
-            for playerDev in indigo.devices.iter(filter="self"):
-                if playerDev.address == playerInfo[PLAYER_ID]:
-                    self.playerKnown = True
-                    break
+            playerDev = self._playerDeviceByAddress(playerInfo[PLAYER_ID])
+            playerKnown = playerDev is not None
 
-            if not self.playerKnown:
+            if not playerKnown:
                 self.logger.info(f"New player discovered with Address: [{playerInfo[PLAYER_ID]}] ... creating device ...")
 
                 playerDev = indigo.device.create(protocol=indigo.kProtocol.Plugin,
@@ -917,7 +1218,8 @@ class Plugin(indigo.PluginBase):
                     props={"mac":playerInfo[PLAYER_ID]},
                     folder=self.deviceFolderId)
 
-                self.globals[PLAYERS][playerDev.id] = dict()
+                with self.globals[SHARED_STATE_LOCK]:
+                    self.globals[PLAYERS].setdefault(playerDev.id, PlayerState())  # Unless already started
                 self.globals[PLAYERS][playerDev.id][SERVER_ID] = dev.id
 
                 key_value_list = list()
@@ -926,9 +1228,10 @@ class Plugin(indigo.PluginBase):
                 self.deviceUpdateKeyValueList(False, playerDev, key_value_list, MAC, "mac", playerInfo[PLAYER_ID])
                 self.deviceUpdateKeyValueList(True, playerDev, key_value_list, SERVER_ID, "serverId", dev.id)
                 self.deviceUpdateKeyValueList(True, playerDev, key_value_list, SERVER_NAME, "serverName", dev.name)
-                playerDev.updateStatesOnServer(key_value_list)
+                self.deviceStatesWrite(playerDev, key_value_list)
 
                 # self.logger.debug(f"Calling deviceStartComm for device: {playerInfo[PLAYER_ID]}")
+                self.deviceStatesFlush(keepBatching=True)  # deviceStartComm reads the states just set
                 self.deviceStartComm(playerDev)
                 # self.logger.debug(f"Called deviceStartComm for device: {playerInfo[PLAYER_ID]}")
                 self.logger.info(f"Newly discovered player with Address [{playerInfo[PLAYER_ID]}] has now been created.")
@@ -977,258 +1280,131 @@ class Plugin(indigo.PluginBase):
                 error_message = f"Cover Art Error - ERR: {exception_error}"
                 self.exception_handler(error_message, True)  # Log error and display failing statement
 
-            self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][playerDev.id][SERVER_ID]].put([playerDev.address + " power ?"])
-            self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][playerDev.id][SERVER_ID]].put([playerDev.address + " mode ?"])
-            self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][playerDev.id][SERVER_ID]].put([playerDev.address + " artist ?"])
-            self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][playerDev.id][SERVER_ID]].put([playerDev.address + " album ?"])
-            self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][playerDev.id][SERVER_ID]].put([playerDev.address + " title ?"])
-            self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][playerDev.id][SERVER_ID]].put([playerDev.address + " genre ?"])
-            self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][playerDev.id][SERVER_ID]].put([playerDev.address + " duration ?"])
-            self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][playerDev.id][SERVER_ID]].put([playerDev.address + " remote ?"])
-            self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][playerDev.id][SERVER_ID]].put([playerDev.address + " playerpref volume ?"])
+            self._playerQueueStatusRefresh(self.globals[PLAYERS][playerDev.id][SERVER_ID], playerDev.address)
             self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][playerDev.id][SERVER_ID]].put([playerDev.address + " playerpref maintainSync ?"])
-            self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][playerDev.id][SERVER_ID]].put([playerDev.address + " playlist index ?"])
-            self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][playerDev.id][SERVER_ID]].put([playerDev.address + " playlist tracks ?"])
-            self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][playerDev.id][SERVER_ID]].put([playerDev.address + " playlist repeat ?"])
-            self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][playerDev.id][SERVER_ID]].put([playerDev.address + " playlist shuffle ?"])
 
         except Exception as exception_error:
             self.exception_handler(exception_error, True)  # Log error and display failing statement
 
-    def _handle_player_id(self, dev):  # dev = squeezebox server
+    def _handle_player_id(self, ctx, dev):  # dev = squeezebox server
         try:
-            playerNumber = int(self.serverResponse[2])
-            playerId = urllib.parse.unquote(self.serverResponse[3])
+            playerNumber = int(ctx.serverResponse[2])
+            playerId = ctx.serverEvent.args[1]  # e.g. "player id 0 00:04:20:aa:bb:cc" (already unquoted)
 
-            playerKnown = False
-            for playerDev in indigo.devices.iter(filter="self"):
-                if playerDev.address == playerId:
-                    playerKnown = True
-                    self.logger.debug(f"Processing known player [{str(playerNumber)}]: '{playerId}'")
-                    break
-            if not playerKnown:
+            playerDev = self._playerDeviceByAddress(playerId)
+            playerKnown = playerDev is not None
+            if playerKnown:
+                self.logger.debug(f"Processing known player [{str(playerNumber)}]: '{playerId}'")
+            else:
                 playerName = "New Squeezebox Player"
                 playerDescription = "New Squeezebox Player"
                 playerModel = "unknown"
                 playerDev = indigo.device.create(protocol=indigo.kProtocol.Plugin,
-                    address=self.playerId,
+                    address=playerId,
                     name=playerName, 
                     description=playerDescription, 
                     pluginId=f"{self.globals[PLUGIN_INFO][PLUGIN_ID]}",
                     deviceTypeId="squeezeboxPlayer",
                     props={"mac":playerId},
                     folder=self.deviceFolderId)
-                playerDev.updateStateOnServer(key="name", value=playerName)
-                playerDev.updateStateOnServer(key="model", value=playerModel)
-                playerDev.updateStateOnServer(key="serverId", value=dev.id)
-                playerDev.updateStateOnServer(key="serverName", value=dev.name)
+                self.deviceStateWrite(playerDev, "name", playerName)
+                self.deviceStateWrite(playerDev, "model", playerModel)
+                self.deviceStateWrite(playerDev, "serverId", dev.id)
+                self.deviceStateWrite(playerDev, "serverName", dev.name)
 
-            self.playerIdQuoted = urllib.parse.quote(self.playerId)  # ££££££££££££££££££££££££££££££££££££££££££££££££££££££££££££££££££££££££££££££££
-            self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][dev.Id][SERVER_ID]].put([self.playerId + " status 0 999 tags:"])
+            # Query the player's status via its server: the server that reported it if the player isn't started yet (or its server isn't)
+            serverId = self.globals[PLAYERS][playerDev.id][SERVER_ID] if playerDev.id in self.globals[PLAYERS] else dev.id
+            if serverId not in self.globals[QUEUES][COMMAND_TO_SEND]:
+                serverId = dev.id
+            self.globals[QUEUES][COMMAND_TO_SEND][serverId].put([playerId + " status 0 999 tags:"])
 
         except Exception as exception_error:
             self.exception_handler(exception_error, True)  # Log error and display failing statement
 
-    def _handle_readdirectory(self, dev):  # dev = squeezebox server
+    def _handle_readdirectory(self, ctx, dev):  # dev = squeezebox server
         try:
-            self.logger.debug(f"READDIRECTORY = [{self.serverResponse[3]}] [{self.serverResponse[6]}]")
+            # The file checks (Play Playlist, Play Announcement) act on the reply through the future returned by send_command
+            self.logger.debug(f"READDIRECTORY = {self._readDirectoryParse(ctx.serverEvent.line)}")
+
+        except Exception as exception_error:
+            self.exception_handler(exception_error, True)  # Log error and display failing statement
 
-            self.readDirectory = []
-            parts = re.split("(\w+:)", self.responseFromSqueezeboxServer)
-            if parts[0]:
-                self.readDirectory.append(parts[0].strip())
+    def _readDirectoryParse(self, response):
+        try:
+            # e.g. "readdirectory 0 1 folder:/Music filter:Rock.m3u count:1 path:/Music/Rock.m3u name:Rock.m3u isfolder:0"
+            #   -> {"folder": "/Music", "filter": "Rock.m3u", "count": "1", "path": "/Music/Rock.m3u", ...}
+            readDirectory = dict()
+            parts = READDIRECTORY_TAG_PATTERN.split(response)  # Split before unquoting, as a quoted value may contain "word:"
             groups = zip(*[parts[i+1::2] for i in range(2)])
-            self.readDirectory.extend(["".join(group).strip() for group in groups])
-
-            self.readDirectoryFunction = ""
-            self.readDirectoryDevice = 0
-            self.readDirectoryFolder = ""
-            self.readDirectoryFilter = ""
-            self.readDirectoryPath = ""
-            self.readDirectoryCount = 0
-            self.readDirectoryIsFolder = 0
-
-            for self.readDirectoryEntry in self.readDirectory:
-                self.readDirectoryEntryElements = self.readDirectoryEntry.partition(":")
-                self.logger.debug(f"SELF.RD-ELEMENTS: [{self.readDirectoryEntryElements[0]}] [{self.readDirectoryEntryElements[1]}] [{self.readDirectoryEntryElements[2]}]")
-
-                self.readDirectoryKeyword = self.readDirectoryEntryElements[0]
-                self.readDirectoryValue = self.readDirectoryEntryElements[2].rstrip()
-
-                match self.readDirectoryKeyword:
-                    case "autologFunction":
-                        self.readDirectoryFunction = self.readDirectoryValue
-                    case "autologDevice":
-                        self.readDirectoryDevice = self.readDirectoryValue
-                    case "folder":
-                        self.readDirectoryFolder = self.readDirectoryValue
-                    case "filter":
-                        self.readDirectoryFilter = self.readDirectoryValue
-                    case "path":
-                        self.readDirectoryPath = self.readDirectoryValue
-                    case "count":
-                        self.readDirectoryCount = self.readDirectoryValue
-                    case "isfolder":
-                        self.readDirectoryIsFolder = self.readDirectoryValue
-
-            self.logger.debug(
-                f"SELF.READDIRECTORY: Func=[{self.readDirectoryFunction}], Dev=[{'Unknown'}], Fol=[{self.readDirectoryFolder}], Fil=[{self.readDirectoryFilter}], Path=[{self.readDirectoryPath}], C=[{self.readDirectoryCount}], IsF=[{self.readDirectoryIsFolder}]")
-
-            self.fileCount = self.serverResponse[6].partition(":")
-            self.fileCheckModeDev = self.serverResponse[3].partition(":")
-            self.logger.debug(f"SELF.FILECOUNT = [{self.readDirectoryCount}]")
-
-            if self.readDirectoryFunction == "AnnouncementCheck":
-                if self.readDirectoryCount == "1":
-                    pass
-                else:
-                    self.globals[ANNOUNCEMENT][FILE_CHECK_OK] = False
-                    self.logger.error(
-                        f"Announcement File [{self.readDirectoryFolder}/{self.readDirectoryFilter}] not found. Play Announcement on '{indigo.devices[int(self.readDirectoryDevice)].name}' not actioned.")
-            elif self.readDirectoryFunction == "PlaylistCheck":
-                if self.readDirectoryCount == "1":
-                    self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][int(self.readDirectoryDevice)][SERVER_ID]].put([
-                        self.globals[PLAYERS][int(self.readDirectoryDevice)][MAC] + " playlist play " + str(self.readDirectoryPath).replace(" ", "%20")])
-                else:
-                    self.logger.error(
-                        f"Playlist File [{self.readDirectoryFolder}/{self.readDirectoryFilter}] not found. Play Playlist on '{indigo.devices[int(self.readDirectoryDevice)].name}' not actioned.")
+            for readDirectoryEntry in ["".join(group).strip() for group in groups]:
+                readDirectoryKeyword, separator, readDirectoryValue = readDirectoryEntry.partition(":")
+                readDirectory[readDirectoryKeyword] = urllib.parse.unquote(readDirectoryValue.rstrip())
+
+            return readDirectory
 
         except Exception as exception_error:
             self.exception_handler(exception_error, True)  # Log error and display failing statement
+            return dict()
 
-    def _handle_player(self, devServer):  # dev = squeezebox server
+    def _handle_player(self, ctx, devServer):  # dev = squeezebox server
         try:
-            self.playerKnown = False
-            for devPlayer in indigo.devices.iter(filter="self"):
-                if devPlayer.address == self.serverResponseKeyword:
-                    self.playerKnown = True
-                    break
+            playerDevId = self.globals[PLAYER_INDEX].dev_id(ctx.serverEvent.mac)  # Only started players are indexed
 
-            if not self.playerKnown:
-                self.logger.info(f"Now handling unknown player: [{self.serverResponseKeyword}]")
-                self.globals[QUEUES][COMMAND_TO_SEND][devServer.id].put(["serverstatus 0 0 subscribe:0"])
+            if playerDevId == 0:
+                if self._playerDeviceByAddress(ctx.serverEvent.mac) is None:
+                    self.logger.info(f"Now handling unknown player: [{ctx.serverResponseKeyword}]")
+                    self.globals[QUEUES][COMMAND_TO_SEND][devServer.id].put(["serverstatus 0 0 subscribe:0"])
+                return  # Unknown, or a player device that isn't started (e.g. disabled)
 
-                return
+            devPlayer = indigo.devices[playerDevId]
+            self._playerSetReplyContext(ctx, devPlayer)
+
+            self._handle_player_detail(ctx, devServer, devPlayer)
 
-            self.replyPlayerMAC = self.serverResponseKeyword
-            self.replyPlayerId = devPlayer.id  # noqa
+        except Exception as exception_error:
+            self.exception_handler(exception_error, True)  # Log error and display failing statement
+
+    def _playerSetReplyContext(self, ctx, devPlayer):
+        try:
+            ctx.replyPlayerMAC = devPlayer.address
+            ctx.replyPlayerId = devPlayer.id
 
             # Determine master (sync) player MAC and ID
-            if self.globals[PLAYERS][self.replyPlayerId][MASTER_PLAYER_ADDRESS] != "":
-                self.masterPlayerMAC = self.globals[PLAYERS][self.replyPlayerId][MASTER_PLAYER_ADDRESS]
-                self.masterPlayerId = self.globals[PLAYERS][self.replyPlayerId][MASTER_PLAYER_ID]
+            if self.globals[PLAYERS][ctx.replyPlayerId][MASTER_PLAYER_ADDRESS] != "":
+                ctx.masterPlayerMAC = self.globals[PLAYERS][ctx.replyPlayerId][MASTER_PLAYER_ADDRESS]
+                ctx.masterPlayerId = self.globals[PLAYERS][ctx.replyPlayerId][MASTER_PLAYER_ID]
             else:
-                self.masterPlayerMAC = self.replyPlayerMAC
-                self.masterPlayerId = self.replyPlayerId
-
-            self._handle_player_detail(devServer, devPlayer)
-
-        except Exception as exception_error:
-            self.exception_handler(exception_error, True)  # Log error and display failing statement
-
-    def _handle_player_detail(self, devServer, devPlayer):
-        try:
-            match self.serverResponse[1]:
-                case "sync":
-                    self._handle_player_detail_sync(devServer, devPlayer)
-                case "songinfo":
-                    self._handle_player_detail_songinfo(devServer, devPlayer)
-                case "favorites":
-                    self._handle_player_detail_favorites(devServer, devPlayer)
-                case "playlist":
-                    match self.serverResponse[2]:
-                        case "open":
-                            self._handle_player_detail_playlist_open(devServer, devPlayer)
-                        case "newsong":
-                            self._handle_player_detail_playlist_newsong(devServer, devPlayer)
-                        case "pause":
-                            self._handle_player_detail_playlist_pause(devServer, devPlayer)
-                        case "name":
-                            self._handle_player_detail_playlist_name(devServer, devPlayer)
-                        case "index":
-                            self._handle_player_detail_playlist_index(devServer, devPlayer)
-                        case "tracks":
-                            self._handle_player_detail_playlist_tracks(devServer, devPlayer)
-                        case "repeat":
-                            self._handle_player_detail_playlist_repeat(devServer, devPlayer)
-                        case "shuffle":
-                            self._handle_player_detail_playlist_shuffle(devServer, devPlayer)
-                        case "load_done":
-                            self._handle_player_detail_playlist_load_done(devServer, devPlayer)
-                        case "stop":
-                            self._handle_player_detail_playlist_stop(devServer, devPlayer)
-                case "pause":
-                    self._handle_player_detail_pause(devServer, devPlayer)
-                case "play":
-                    self._handle_player_detail_play(devServer, devPlayer)
-                case "prefset":
-                    self._handle_player_detail_prefset(devServer, devPlayer)
-                case "mixer":
-                    self._handle_player_detail_mixer(devServer, devPlayer)
-                case "playerpref":
-                    self._handle_player_detail_playerpref(devServer, devPlayer)
-                case "maintainSync":
-                    self._handle_player_detail_maintainSync(devServer, devPlayer)
-                case "artist":
-                    self._handle_player_detail_artist(devServer, devPlayer)
-                case "album":
-                    self._handle_player_detail_album(devServer, devPlayer)
-                case "title":
-                    self._handle_player_detail_title(devServer, devPlayer)
-                case "genre":
-                    self._handle_player_detail_genre(devServer, devPlayer)
-                case "duration":
-                    self._handle_player_detail_duration(devServer, devPlayer)
-                case "autologMixerMuteAll":
-                    self._handle_player_detail_autologMixerMuteAll(devServer, devPlayer)
-                case "autologMixerUnmuteAll":
-                    self._handle_player_detail_autologMixerUnmuteAll(devServer, devPlayer)
-                case "autologMixerToggleMuteAll":
-                    self._handle_player_detail_autologMixerToggleMuteAll(devServer, devPlayer)
-                case "remote":
-                    self._handle_player_detail_remote(devServer, devPlayer)
-                case "client":
-                    self._handle_player_detail_client(devServer, devPlayer)
-                case "autologAnnouncementRequest":
-                    self._handle_player_detail_autologAnnouncementRequest(devServer, devPlayer)
-                case "autologAnnouncementInitialise":
-                    self._handle_player_detail_autologAnnouncementInitialise(devServer, devPlayer)
-                case "power":
-                    self._handle_player_detail_power(devServer, devPlayer)
-                case "mode":
-                    self._handle_player_detail_mode(devServer, devPlayer)
-                case "time":
-                    self._handle_player_detail_time(devServer, devPlayer)
-                case "autologAnnouncementSaveState":
-                    self._handle_player_detail_autologAnnouncementSaveState(devServer, devPlayer)
-                case "autologAnnouncementPlay":
-                    self._handle_player_detail_autologAnnouncementPlay(devServer, devPlayer)
-                case "autologAnnouncementRestartPlaying":
-                    self._handle_player_detail_autologAnnouncementRestartPlaying(devServer, devPlayer)
-                case "autologAnnouncementEnded":
-                    self._handle_player_detail_autologAnnouncementEnded(devServer, devPlayer)
-                case _:
-                    pass
+                ctx.masterPlayerMAC = ctx.replyPlayerMAC
+                ctx.masterPlayerId = ctx.replyPlayerId
+
+        except Exception as exception_error:
+            self.exception_handler(exception_error, True)  # Log error and display failing statement
+
+    def _handle_player_detail(self, ctx, devServer, devPlayer):
+        try:
+            handler = self.globals[DISPATCH_TABLES][PLAYERS].lookup(ctx.serverEvent.path)
+            if handler is not None:
+                handler(ctx, devServer, devPlayer)
 
         except Exception as exception_error:
             self.exception_handler(exception_error, True)  # Log error and display failing statement
 
-    def _handle_player_detail_sync(self, devServer, devPlayer):
+    def _handle_player_detail_sync(self, ctx, devServer, devPlayer):
         try:
             self.globals[QUEUES][COMMAND_TO_SEND][devServer.id].put(["syncgroups ?"])
 
         except Exception as exception_error:
             self.exception_handler(exception_error, True)  # Log error and display failing statement
 
-    def _handle_player_detail_songinfo(self, devServer, devPlayer):
+    def _handle_player_detail_songinfo(self, ctx, devServer, devPlayer):
         try:
             # artworkUrl = "00:04:20:29:46:b9 songinfo 0 100 url:pandora://495903246413988319.mp3 tags:aK id:-140590555861760 title:Timber artist:Pitbull artwork_url:http://cont-sv5-2.pandora.com/images/public/amz/0/8/5/7/800037580_500W_497H.jpg"
 
-            artworkUrl = self.responseFromSqueezeboxServer.split("artwork_url:")
+            artworkUrl = ctx.responseFromSqueezeboxServer.split("artwork_url:")
             if len(artworkUrl) == 2:
                 artworkUrl = artworkUrl[1]  # i.e. artwork_url was found
             else:
-                artworkUrl = str(f"music/current/cover.jpg?player={self.globals[PLAYERS][self.replyPlayerId][MAC]}")
+                artworkUrl = str(f"music/current/cover.jpg?player={self.globals[PLAYERS][ctx.replyPlayerId][MAC]}")
             # artworkUrl = artworkUrl.split("artwork_url:")[1]
             # self.logger.debug(f"SONGINFO: 'artworkUrl' = {artworkUrl}")
             if artworkUrl[0:7] != "http://" and artworkUrl[0:8] != "https://":
@@ -1236,10 +1412,10 @@ class Plugin(indigo.PluginBase):
 
             # self.logger.debug(f"ARTWORKURL: 'artworkUrl' = {artworkUrl}")
 
-            coverArtToRetrieve = urlopen(artworkUrl)
-            coverArtFile = f"{self.globals[PLAYERS][self.replyPlayerId][COVER_ART_FOLDER]}/coverart.jpg"
+            coverArtFile = f"{self.globals[PLAYERS][ctx.replyPlayerId][COVER_ART_FOLDER]}/coverart.jpg"
             # self.logger.debug(f"COVERARTFILE: {coverArtFile}")
 
+            coverArtToRetrieve = urlopen(artworkUrl, timeout=10)  # Only holds up this server's responses (see _serverLock)
             localFile = open(coverArtFile, "wb")
             localFile.write(coverArtToRetrieve.read())
             localFile.close()
@@ -1247,26 +1423,26 @@ class Plugin(indigo.PluginBase):
         except Exception as exception_error:
             self.exception_handler(exception_error, True)  # Log error and display failing statement
 
-    def _handle_player_detail_favorites(self, devServer, devPlayer):
+    def _handle_player_detail_favorites(self, ctx, devServer, devPlayer):
         try:
             pass
-            #     self.logger.info(f"FAVORITES = {self.serverResponse}")
-            #     if self.serverResponse[2] == "playlist":  # favorites playlist
+            #     self.logger.info(f"FAVORITES = {ctx.serverResponse}")
+            #     if ctx.serverResponse[2] == "playlist":  # favorites playlist
             #         self.logger.info("FAVORITES PLAYLIST")
-            #         if self.serverResponse[3] == "play":  # favorites playlist play
-            #             self.logger.info(f"FAVORITES PLAYLIST PLAY = {self.serverResponse[4]}")
+            #         if ctx.serverResponse[3] == "play":  # favorites playlist play
+            #             self.logger.info(f"FAVORITES PLAYLIST PLAY = {ctx.serverResponse[4]}")
 
         except Exception as exception_error:
             self.exception_handler(exception_error, True)  # Log error and display failing statement
 
 
-    def _handle_player_detail_playlist_open(self, devServer, devPlayer):
+    def _handle_player_detail_playlist_open(self, ctx, devServer, devPlayer):
         try:
-            songUrl = self.serverResponse[3]
+            songUrl = ctx.serverResponse[3]
 
             if (songUrl[0:7] == "file://" or songUrl[0:14] == "spotify:track:" or songUrl[0:10] == "pandora://"
                     or songUrl[0:8] == "qobuz://" or songUrl[0:9] == "deezer://" or songUrl[0:9] == "sirius://"):
-                playerIdsToProcess = self._playersToProcess(self.replyPlayerId, "playlist open")
+                playerIdsToProcess = self._playersToProcess(ctx.replyPlayerId, "playlist open")
                 for playerIdToProcess in playerIdsToProcess:
                     if self.globals[PLAYERS][playerIdToProcess][POWER_UI] != "disconnected":
                         self.deviceStateUpdate(True, devPlayer, SONG_URL, "songUrl", songUrl)
@@ -1275,27 +1451,19 @@ class Plugin(indigo.PluginBase):
         except Exception as exception_error:
                 self.exception_handler(exception_error, True)  # Log error and display failing statement
 
-    def _handle_player_detail_playlist_newsong(self, devServer, devPlayer):
+    def _handle_player_detail_playlist_newsong(self, ctx, devServer, devPlayer):
         try:
             if self.globals[ANNOUNCEMENT][STEP] != "loaded":
                 # self.logger.debug(f"NEWSONG: 'announcementStep' = {self.globals[ANNOUNCEMENT][STEP]}")
-                self.globals[QUEUES][COMMAND_TO_SEND][devServer.id].put([self.masterPlayerMAC + " artist ?"])
-                self.globals[QUEUES][COMMAND_TO_SEND][devServer.id].put([self.masterPlayerMAC + " album ?"])
-                self.globals[QUEUES][COMMAND_TO_SEND][devServer.id].put([self.masterPlayerMAC + " title ?"])
-                self.globals[QUEUES][COMMAND_TO_SEND][devServer.id].put([self.masterPlayerMAC + " genre ?"])
-                self.globals[QUEUES][COMMAND_TO_SEND][devServer.id].put([self.masterPlayerMAC + " duration ?"])
-                self.globals[QUEUES][COMMAND_TO_SEND][devServer.id].put([self.masterPlayerMAC + " remote ?"])
-                self.globals[QUEUES][COMMAND_TO_SEND][devServer.id].put([self.masterPlayerMAC + " mode ?"])
-                self.globals[QUEUES][COMMAND_TO_SEND][devServer.id].put([self.masterPlayerMAC + " playlist name ?"])
-                self.globals[QUEUES][COMMAND_TO_SEND][devServer.id].put([self.masterPlayerMAC + " playlist index ?"])
-                self.globals[QUEUES][COMMAND_TO_SEND][devServer.id].put([self.masterPlayerMAC + " playlist tracks ?"])
+                self._playerQueueStatusRefresh(devServer.id, ctx.masterPlayerMAC)
+                self.globals[QUEUES][COMMAND_TO_SEND][devServer.id].put([ctx.masterPlayerMAC + " playlist name ?"])
 
         except Exception as exception_error:
                 self.exception_handler(exception_error, True)  # Log error and display failing statement
 
-    def _handle_player_detail_playlist_pause(self, devServer, devPlayer):
+    def _handle_player_detail_playlist_pause(self, ctx, devServer, devPlayer):
         try:
-            playerIdsToProcess = self._playersToProcess(self.replyPlayerId, "playlist pause")
+            playerIdsToProcess = self._playersToProcess(ctx.replyPlayerId, "playlist pause")
 
             for playerIdToProcess in playerIdsToProcess:
                 self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][playerIdToProcess][SERVER_ID]].put([indigo.devices[playerIdToProcess].address + " mode ?"])
@@ -1303,150 +1471,186 @@ class Plugin(indigo.PluginBase):
         except Exception as exception_error:
                 self.exception_handler(exception_error, True)  # Log error and display failing statement
 
-    def _handle_player_detail_playlist_name(self, devServer, devPlayer):
+    def _handle_player_detail_playlist_name(self, ctx, devServer, devPlayer):
         try:
             try:
-                self.playlistName = self.serverResponse[3]
-                self.playlistName = self.responseFromSqueezeboxServer.split("playlist name")[1]
+                playlistName = ctx.serverResponse[3]
+                playlistName = ctx.responseFromSqueezeboxServer.split("playlist name")[1]
             except:
-                self.playlistName = ""
+                playlistName = ""
 
-            playerIdsToProcess = self._playersToProcess(self.replyPlayerId, "playlist name")
+            playerIdsToProcess = self._playersToProcess(ctx.replyPlayerId, "playlist name")
 
             for playerIdToProcess in playerIdsToProcess:
                 if self.globals[PLAYERS][playerIdToProcess][POWER_UI] != "disconnected":
-                    indigo.devices[playerIdToProcess].updateStateOnServer(key="playlistName", value=self.playlistName)
+                    self.deviceStateWrite(playerIdToProcess, "playlistName", playlistName)
+
+        except Exception as exception_error:
+            self.exception_handler(exception_error, True)  # Log error and display failing statement
+
+    def _handle_player_detail_playlist_index(self, ctx, devServer, devPlayer):
+        try:
+            if len(ctx.serverResponse) > 3:
+                self._playerUpdatePlaylistIndex(ctx, ctx.serverResponse[3])
+            else:
+                self._playerUpdatePlaylistIndex(ctx, "")
 
         except Exception as exception_error:
             self.exception_handler(exception_error, True)  # Log error and display failing statement
 
-    def _handle_player_detail_playlist_index(self, devServer, devPlayer):
+    def _playerUpdatePlaylistIndex(self, ctx, playlistIndex):
         try:
             try:
-                self.playlistIndex = self.serverResponse[3]
-                self.playlistTrackNumber = str(int(self.playlistIndex) + 1)
-            except:
-                self.playlistIndex = "0"
-                self.playlistTrackNumber = "1"
+                playlistTrackNumber = str(int(playlistIndex) + 1)
+            except ValueError:
+                playlistIndex = "0"
+                playlistTrackNumber = "1"
 
-            playerIdsToProcess = self._playersToProcess(self.replyPlayerId, "playlist index")
+            playerIdsToProcess = self._playersToProcess(ctx.replyPlayerId, "playlist index")
 
             for playerIdToProcess in playerIdsToProcess:
                 if self.globals[PLAYERS][playerIdToProcess][POWER_UI] != "disconnected":
-                    indigo.devices[playerIdToProcess].updateStateOnServer(key="playlistIndex", value=self.playlistIndex)
-                    indigo.devices[playerIdToProcess].updateStateOnServer(key="playlistTrackNumber", value=self.playlistTrackNumber)
+                    self.deviceStateWrite(playerIdToProcess, "playlistIndex", playlistIndex)
+                    self.globals[PLAYERS][playerIdToProcess][PLAYLIST_TRACK_NUMBER] = playlistTrackNumber  # For playlistTracksUi
+                    self.deviceStateWrite(playerIdToProcess, "playlistTrackNumber", playlistTrackNumber)
 
         except Exception as exception_error:
             self.exception_handler(exception_error, True)  # Log error and display failing statement
 
-    def _handle_player_detail_playlist_tracks(self, devServer, devPlayer):
+    def _handle_player_detail_playlist_tracks(self, ctx, devServer, devPlayer):
         try:
-            self.playlistTracksTotal = self.serverResponse[3]
+            self._playerUpdatePlaylistTracks(ctx, ctx.serverResponse[3])
 
-            playerIdsToProcess = self._playersToProcess(self.replyPlayerId, "playlist tracks")
+        except Exception as exception_error:
+                self.exception_handler(exception_error, True)  # Log error and display failing statement
+
+    def _playerUpdatePlaylistTracks(self, ctx, playlistTracksTotal):
+        try:
+            playerIdsToProcess = self._playersToProcess(ctx.replyPlayerId, "playlist tracks")
 
             for playerIdToProcess in playerIdsToProcess:
                 if self.globals[PLAYERS][playerIdToProcess][POWER_UI] != "disconnected":
-                    indigo.devices[playerIdToProcess].updateStateOnServer(key="playlistTracksTotal", value=self.playlistTracksTotal)
-                    if self.playlistTracksTotal == "0":
-                        indigo.devices[playerIdToProcess].updateStateOnServer(key="playlistTrackNumber", value="0")
+                    self.deviceStateWrite(playerIdToProcess, "playlistTracksTotal", playlistTracksTotal)
+                    if playlistTracksTotal == "0":
+                        self.globals[PLAYERS][playerIdToProcess][PLAYLIST_TRACK_NUMBER] = "0"
+                        self.deviceStateWrite(playerIdToProcess, "playlistTrackNumber", "0")
                         tracksUi = ""
                     else:
-                        tracksUi = f"{indigo.devices[playerIdToProcess].states['playlistTrackNumber']} of {self.playlistTracksTotal}"
-                    indigo.devices[playerIdToProcess].updateStateOnServer(key="playlistTracksUi", value=tracksUi)
+                        # From the plugin's copy rather than the device: a track number changed by this response isn't written yet
+                        tracksUi = f"{self.globals[PLAYERS][playerIdToProcess].get(PLAYLIST_TRACK_NUMBER, '?')} of {playlistTracksTotal}"
+                    self.deviceStateWrite(playerIdToProcess, "playlistTracksUi", tracksUi)
 
         except Exception as exception_error:
                 self.exception_handler(exception_error, True)  # Log error and display failing statement
 
-    def _handle_player_detail_playlist_repeat(self, devServer, devPlayer):
+    def _handle_player_detail_playlist_repeat(self, ctx, devServer, devPlayer):
+        try:
+            if len(ctx.serverResponse) > 3:
+                self._playerUpdateRepeat(ctx, ctx.serverResponse[3])
+            else:
+                self._playerUpdateRepeat(ctx, None)
+
+        except Exception as exception_error:
+            self.exception_handler(exception_error, True)  # Log error and display failing statement
+
+    def _playerUpdateRepeat(self, ctx, repeat):  # repeat is None if not returned by the server
         try:
-            if len(self.serverResponse) > 3:
-                match self.serverResponse[3]:
+            if repeat is not None:
+                match repeat:
                     case "0":
-                        self.repeat = "off"
+                        repeatUi = "off"
                     case "1":
-                        self.repeat = "song"
+                        repeatUi = "song"
                     case "2":
-                        self.repeat = "playlist"
+                        repeatUi = "playlist"
                     case _:
-                        self.repeat = "?"
-                playerIdsToProcess = self._playersToProcess(self.replyPlayerId, "playlist repeat")
+                        repeatUi = "?"
+                playerIdsToProcess = self._playersToProcess(ctx.replyPlayerId, "playlist repeat")
                 for playerIdToProcess in playerIdsToProcess:
-                    self.globals[PLAYERS][playerIdToProcess][REPEAT] = self.serverResponse[3]
-                    indigo.devices[playerIdToProcess].updateStateOnServer(key="repeat", value=self.repeat)
+                    self.globals[PLAYERS][playerIdToProcess][REPEAT] = repeat
+                    self.deviceStateWrite(playerIdToProcess, "repeat", repeatUi)
 
             if self.globals[ANNOUNCEMENT][STEP] == "initialise":
-                self.logger.debug(f"ACT=[initialise]: {indigo.devices[self.masterPlayerId].name}")
-                if len(self.serverResponse) > 3:
-                    self.globals[PLAYERS][self.masterPlayerId][SAVED_REPEAT] = self.serverResponse[3]
+                self.logger.debug(f"ACT=[initialise]: {indigo.devices[ctx.masterPlayerId].name}")
+                if repeat is not None:
+                    self.globals[PLAYERS][ctx.masterPlayerId][SAVED_REPEAT] = repeat
                 else:
-                    self.globals[PLAYERS][self.masterPlayerId][SAVED_REPEAT] = "?"
+                    self.globals[PLAYERS][ctx.masterPlayerId][SAVED_REPEAT] = "?"
 
         except Exception as exception_error:
             self.exception_handler(exception_error, True)  # Log error and display failing statement
 
-    def _handle_player_detail_playlist_shuffle(self, devServer, devPlayer):
+    def _handle_player_detail_playlist_shuffle(self, ctx, devServer, devPlayer):
         try:
-            if len(self.serverResponse) > 3:
-                match self.serverResponse[3]:
+            if len(ctx.serverResponse) > 3:
+                self._playerUpdateShuffle(ctx, ctx.serverResponse[3])
+            else:
+                self._playerUpdateShuffle(ctx, None)
+
+        except Exception as exception_error:
+            self.exception_handler(exception_error, True)  # Log error and display failing statement
+
+    def _playerUpdateShuffle(self, ctx, shuffle):  # shuffle is None if not returned by the server
+        try:
+            if shuffle is not None:
+                match shuffle:
                     case "0":
-                        self.shuffle = "off"
+                        shuffleUi = "off"
                     case "1":
-                        self.shuffle = "songs"
+                        shuffleUi = "songs"
                     case "2":
-                        self.shuffle = "albums"
+                        shuffleUi = "albums"
                     case _:
-                        self.shuffle = "?"
-                playerIdsToProcess = self._playersToProcess(self.replyPlayerId, "playlist shuffle")
+                        shuffleUi = "?"
+                playerIdsToProcess = self._playersToProcess(ctx.replyPlayerId, "playlist shuffle")
                 for playerIdToProcess in playerIdsToProcess:
-                    self.globals[PLAYERS][playerIdToProcess][SHUFFLE] = self.serverResponse[3]
-                    indigo.devices[playerIdToProcess].updateStateOnServer(key="shuffle", value=self.shuffle)
+                    self.globals[PLAYERS][playerIdToProcess][SHUFFLE] = shuffle
+                    self.deviceStateWrite(playerIdToProcess, "shuffle", shuffleUi)
 
             if self.globals[ANNOUNCEMENT][STEP] == "initialise":
-                self.logger.debug(f"ACT=[initialise]: {indigo.devices[self.masterPlayerId].name}")
-                if len(self.serverResponse) > 3:
-                    self.globals[PLAYERS][self.masterPlayerId][SAVED_SHUFFLE] = self.serverResponse[3]
+                self.logger.debug(f"ACT=[initialise]: {indigo.devices[ctx.masterPlayerId].name}")
+                if shuffle is not None:
+                    self.globals[PLAYERS][ctx.masterPlayerId][SAVED_SHUFFLE] = shuffle
                 else:
-                    self.globals[PLAYERS][self.masterPlayerId][SAVED_SHUFFLE] = "?"
-
+                    self.globals[PLAYERS][ctx.masterPlayerId][SAVED_SHUFFLE] = "?"
 
         except Exception as exception_error:
             self.exception_handler(exception_error, True)  # Log error and display failing statement
 
-    def _handle_player_detail_playlist_load_done(self, devServer, devPlayer):
+    def _handle_player_detail_playlist_load_done(self, ctx, devServer, devPlayer):
         try:
             if self.globals[ANNOUNCEMENT][STEP] == "play":
-                self.logger.debug(f"ACT=[play]: {indigo.devices[self.masterPlayerId].name}")
+                self.logger.debug(f"ACT=[play]: {indigo.devices[ctx.masterPlayerId].name}")
                 self.globals[ANNOUNCEMENT][STEP] = "loaded"
-                self.logger.debug(f"NXT=[loaded]: {indigo.devices[self.masterPlayerId].name}")
+                self.logger.debug(f"NXT=[loaded]: {indigo.devices[ctx.masterPlayerId].name}")
 
         except Exception as exception_error:
             self.exception_handler(exception_error, True)  # Log error and display failing statement
 
-    def _handle_player_detail_playlist_stop(self, devServer, devPlayer):
+    def _handle_player_detail_playlist_stop(self, ctx, devServer, devPlayer):
         try:
-            # self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][self.masterPlayerId][SERVER_ID]].put([self.masterPlayerMAC + " mode ?")
+            # self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][ctx.masterPlayerId][SERVER_ID]].put([ctx.masterPlayerMAC + " mode ?")
 
-            if self.globals[PLAYERS][self.replyPlayerId][POWER_UI] != "disconnected":
-                playerIdsToProcess = self._playersToProcess(self.replyPlayerId, "playlist stop")
+            if self.globals[PLAYERS][ctx.replyPlayerId][POWER_UI] != "disconnected":
+                playerIdsToProcess = self._playersToProcess(ctx.replyPlayerId, "playlist stop")
 
                 for playerIdToProcess in playerIdsToProcess:
                     self.globals[PLAYERS][playerIdToProcess][MODE] = "stop"
                     stateDescription = "stopped"
-                    indigo.devices[playerIdToProcess].updateStateOnServer(key="state", value=stateDescription)
+                    self.deviceStateWrite(playerIdToProcess, "state", stateDescription)
                     stateImage = indigo.kStateImageSel.AvStopped
-                    indigo.devices[self.replyPlayerId].updateStateImageOnServer(stateImage)
+                    self.deviceStateImageWrite(ctx.replyPlayerId, stateImage)
 
                 if self.globals[ANNOUNCEMENT][STEP] == "loaded":
-                    self.logger.debug(f"ACT=[loaded]: {indigo.devices[self.masterPlayerId].name}")
+                    self.logger.debug(f"ACT=[loaded]: {indigo.devices[ctx.masterPlayerId].name}")
                     self.globals[ANNOUNCEMENT][STEP] = "stopped"
-                    self.logger.debug(f"NXT=[stopped]: {indigo.devices[self.masterPlayerId].name}")
+                    self.logger.debug(f"NXT=[stopped]: {indigo.devices[ctx.masterPlayerId].name}")
 
                     # reload saved playlist
-                    self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][self.masterPlayerId][SERVER_ID]].put(
-                        [self.replyPlayerMAC + " playlist resume autolog_" + str(self.masterPlayerId) + " wipePlaylist:1 noplay:1"])
+                    self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][ctx.masterPlayerId][SERVER_ID]].put(
+                        [ctx.replyPlayerMAC + " playlist resume autolog_" + str(ctx.masterPlayerId) + " wipePlaylist:1 noplay:1"])
 
-                    #  + self.globals[PLAYERS][self.masterPlayerId][ANNOUNCEMENT_PLAYLIST_NO_PLAY]
+                    #  + self.globals[PLAYERS][ctx.masterPlayerId][ANNOUNCEMENT_PLAYLIST_NO_PLAY]
 
                     # for master sync player
                     #     if saved repeat != 0:
@@ -1456,26 +1660,26 @@ class Plugin(indigo.PluginBase):
                     #     if time != 0 and shuffle = 0:
                     #         restore time (seconds only)
 
-                    if self.globals[PLAYERS][self.masterPlayerId][SAVED_REPEAT] != "0":
-                        self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][self.masterPlayerId][SERVER_ID]].put(
-                            [self.masterPlayerMAC + " playlist repeat " + self.globals[PLAYERS][self.masterPlayerId][SAVED_REPEAT]])
-                    if self.globals[PLAYERS][self.masterPlayerId][SAVED_SHUFFLE] != "0":
-                        self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][self.masterPlayerId][SERVER_ID]].put(
-                            [self.masterPlayerMAC + " playlist shuffle " + self.globals[PLAYERS][self.masterPlayerId][SAVED_SHUFFLE]])
-                    # if self.globals[PLAYERS][self.masterPlayerId][SAVED_TIME] !=  "0":
-                    #     self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][self.masterPlayerId][SERVER_ID]].put([self.masterPlayerMAC + " time " + self.globals[PLAYERS][self.masterPlayerId][SAVED_TIME])
-                    if self.globals[PLAYERS][self.masterPlayerId][SAVED_VOLUME] != self.globals[PLAYERS][self.masterPlayerId][VOLUME]:
-                        self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][self.masterPlayerId][SERVER_ID]].put(
-                            [self.masterPlayerMAC + " mixer volume " + self.globals[PLAYERS][self.masterPlayerId][SAVED_VOLUME]])
-                    if self.globals[PLAYERS][self.masterPlayerId][SAVED_MAINTAIN_SYNC] != self.globals[PLAYERS][self.masterPlayerId][MAINTAIN_SYNC]:
-                        self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][self.masterPlayerId][SERVER_ID]].put(
-                            [self.masterPlayerMAC + " playerpref maintainSync " + self.globals[PLAYERS][self.masterPlayerId][SAVED_MAINTAIN_SYNC]])
+                    if self.globals[PLAYERS][ctx.masterPlayerId][SAVED_REPEAT] != "0":
+                        self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][ctx.masterPlayerId][SERVER_ID]].put(
+                            [ctx.masterPlayerMAC + " playlist repeat " + self.globals[PLAYERS][ctx.masterPlayerId][SAVED_REPEAT]])
+                    if self.globals[PLAYERS][ctx.masterPlayerId][SAVED_SHUFFLE] != "0":
+                        self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][ctx.masterPlayerId][SERVER_ID]].put(
+                            [ctx.masterPlayerMAC + " playlist shuffle " + self.globals[PLAYERS][ctx.masterPlayerId][SAVED_SHUFFLE]])
+                    # if self.globals[PLAYERS][ctx.masterPlayerId][SAVED_TIME] !=  "0":
+                    #     self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][ctx.masterPlayerId][SERVER_ID]].put([ctx.masterPlayerMAC + " time " + self.globals[PLAYERS][ctx.masterPlayerId][SAVED_TIME])
+                    if self.globals[PLAYERS][ctx.masterPlayerId][SAVED_VOLUME] != self.globals[PLAYERS][ctx.masterPlayerId][VOLUME]:
+                        self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][ctx.masterPlayerId][SERVER_ID]].put(
+                            [ctx.masterPlayerMAC + " mixer volume " + self.globals[PLAYERS][ctx.masterPlayerId][SAVED_VOLUME]])
+                    if self.globals[PLAYERS][ctx.masterPlayerId][SAVED_MAINTAIN_SYNC] != self.globals[PLAYERS][ctx.masterPlayerId][MAINTAIN_SYNC]:
+                        self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][ctx.masterPlayerId][SERVER_ID]].put(
+                            [ctx.masterPlayerMAC + " playerpref maintainSync " + self.globals[PLAYERS][ctx.masterPlayerId][SAVED_MAINTAIN_SYNC]])
 
                     # for each player (sync'd - master & slave)
                     #     if saved power is off:
                     #         turn off power
 
-                    for slavePlayerId in self.globals[PLAYERS][self.masterPlayerId][SLAVE_PLAYER_IDS]:
+                    for slavePlayerId in self.globals[PLAYERS][ctx.masterPlayerId][SLAVE_PLAYER_IDS]:
                         if self.globals[PLAYERS][slavePlayerId][SAVED_VOLUME] != self.globals[PLAYERS][slavePlayerId][VOLUME]:
                             self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][slavePlayerId][SERVER_ID]].put(
                                 [self.globals[PLAYERS][slavePlayerId][MAC] + " mixer volume " + self.globals[PLAYERS][slavePlayerId][SAVED_VOLUME]])
@@ -1485,17 +1689,17 @@ class Plugin(indigo.PluginBase):
 
                         if self.globals[PLAYERS][slavePlayerId][SAVED_POWER] == "0":
                             self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][slavePlayerId][SERVER_ID]].put([self.globals[PLAYERS][slavePlayerId][MAC] + " power 0"])
-                    if self.globals[PLAYERS][self.masterPlayerId][SAVED_POWER] == "0":
-                        self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][self.masterPlayerId][SERVER_ID]].put([self.masterPlayerMAC + " power 0"])
+                    if self.globals[PLAYERS][ctx.masterPlayerId][SAVED_POWER] == "0":
+                        self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][ctx.masterPlayerId][SERVER_ID]].put([ctx.masterPlayerMAC + " power 0"])
 
-                    self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][self.masterPlayerId][SERVER_ID]].put([self.masterPlayerMAC + " autologAnnouncementRestartPlaying"])
+                    self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][ctx.masterPlayerId][SERVER_ID]].put([ctx.masterPlayerMAC + " autologAnnouncementRestartPlaying"])
 
         except Exception as exception_error:
             self.exception_handler(exception_error, True)  # Log error and display failing statement
 
-    def _handle_player_detail_pause(self, devServer, devPlayer):
+    def _handle_player_detail_pause(self, ctx, devServer, devPlayer):
         try:
-            playerIdsToProcess = self._playersToProcess(self.replyPlayerId, "pause")
+            playerIdsToProcess = self._playersToProcess(ctx.replyPlayerId, "pause")
 
             for playerIdToProcess in playerIdsToProcess:
                 self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][playerIdToProcess][SERVER_ID]].put([indigo.devices[playerIdToProcess].address + " mode ?"])
@@ -1503,58 +1707,58 @@ class Plugin(indigo.PluginBase):
         except Exception as exception_error:
                 self.exception_handler(exception_error, True)  # Log error and display failing statement
 
-    def _handle_player_detail_play(self, devServer, devPlayer):
+    def _handle_player_detail_play(self, ctx, devServer, devPlayer):
         try:
-            self.logger.debug(f"NXT=[play]: {indigo.devices[self.masterPlayerId].name}")
+            self.logger.debug(f"NXT=[play]: {indigo.devices[ctx.masterPlayerId].name}")
 
             if self.globals[ANNOUNCEMENT][STEP] == "autologAnnouncementRestartPlaying":
-                self.logger.debug(f"ACT=[autologAnnouncementRestartPlaying]: {indigo.devices[self.masterPlayerId].name}")
-                playerIdsToProcess = self._playersToProcess(self.replyPlayerId, "autologAnnouncementRestartPlaying")
+                self.logger.debug(f"ACT=[autologAnnouncementRestartPlaying]: {indigo.devices[ctx.masterPlayerId].name}")
+                playerIdsToProcess = self._playersToProcess(ctx.replyPlayerId, "autologAnnouncementRestartPlaying")
                 self.logger.debug(f"PLAYERIDSTOPROCESS: Len={len(playerIdsToProcess)}; {str(playerIdsToProcess)}")
-                if self.globals[PLAYERS][self.masterPlayerId][SAVED_TIME] != "0":
-                    self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][self.masterPlayerId][SERVER_ID]].put([self.masterPlayerMAC + " pause"])
+                if self.globals[PLAYERS][ctx.masterPlayerId][SAVED_TIME] != "0":
+                    self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][ctx.masterPlayerId][SERVER_ID]].put([ctx.masterPlayerMAC + " pause"])
                     for playerIdToProcess in playerIdsToProcess:
                         mac = self._playerDeviceIdToMAC(playerIdToProcess)
-                        self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][playerIdToProcess][SERVER_ID]].put([mac + " time " + self.globals[PLAYERS][self.masterPlayerId][SAVED_TIME]])
-                    self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][self.masterPlayerId][SERVER_ID]].put([self.masterPlayerMAC + " pause"])
+                        self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][playerIdToProcess][SERVER_ID]].put([mac + " time " + self.globals[PLAYERS][ctx.masterPlayerId][SAVED_TIME]])
+                    self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][ctx.masterPlayerId][SERVER_ID]].put([ctx.masterPlayerMAC + " pause"])
 
         except Exception as exception_error:
                 self.exception_handler(exception_error, True)  # Log error and display failing statement
 
-    def _handle_player_detail_prefset(self, devServer, devPlayer):
+    def _handle_player_detail_prefset(self, ctx, devServer, devPlayer):
         try:
-            if self.serverResponse[2] == "server":  # prefset server
-                match self.serverResponse[3]:
+            if ctx.serverResponse[2] == "server":  # prefset server
+                match ctx.serverResponse[3]:
                     case "volume":  # prefset server volume
-                        self.globals[PLAYERS][self.replyPlayerId][VOLUME] = self.serverResponse[4]
-                        indigo.devices[self.replyPlayerId].updateStateOnServer(key="volume", value=self.globals[PLAYERS][self.replyPlayerId][VOLUME])
+                        self.globals[PLAYERS][ctx.replyPlayerId][VOLUME] = ctx.serverResponse[4]
+                        self.deviceStateWrite(ctx.replyPlayerId, "volume", self.globals[PLAYERS][ctx.replyPlayerId][VOLUME])
                     case "power":  # prefset server power
                         pass
                     case "repeat":  # prefset server repeat
-                        if len(self.serverResponse) > 4:
-                            match self.serverResponse[4]:
+                        if len(ctx.serverResponse) > 4:
+                            match ctx.serverResponse[4]:
                                 case "0":
-                                    self.repeat = "off"
+                                    repeat = "off"
                                 case "1":
-                                    self.repeat = "song"
+                                    repeat = "song"
                                 case "2":
-                                    self.repeat = "playlist"
+                                    repeat = "playlist"
                                 case _:
-                                    self.repeat = "?"
-                        playerIdsToProcess = self._playersToProcess(self.replyPlayerId, "playlist repeat")
+                                    repeat = "?"
+                        playerIdsToProcess = self._playersToProcess(ctx.replyPlayerId, "playlist repeat")
                         for playerIdToProcess in playerIdsToProcess:
-                            self.globals[PLAYERS][playerIdToProcess][REPEAT] = self.repeat
-                            indigo.devices[playerIdToProcess].updateStateOnServer(key="repeat", value=self.repeat)
+                            self.globals[PLAYERS][playerIdToProcess][REPEAT] = repeat
+                            self.deviceStateWrite(playerIdToProcess, "repeat", repeat)
 
                         # if self.globals[ANNOUNCEMENT][STEP] == "autologAnnouncementInitialise":
-                        #     if len(self.serverResponse) > 3:
-                        #         self.globals[PLAYERS][self.masterPlayerId][SAVED_REPEAT] = self.serverResponse[3]
+                        #     if len(ctx.serverResponse) > 3:
+                        #         self.globals[PLAYERS][ctx.masterPlayerId][SAVED_REPEAT] = ctx.serverResponse[3]
                         #     else:
-                        #         self.globals[PLAYERS][self.masterPlayerId][SAVED_REPEAT] = "?"
+                        #         self.globals[PLAYERS][ctx.masterPlayerId][SAVED_REPEAT] = "?"
 
                     case "shuffle":  # prefset server shuffle
-                        if len(self.serverResponse) > 3:
-                            match self.serverResponse[4]:
+                        if len(ctx.serverResponse) > 3:
+                            match ctx.serverResponse[4]:
                                 case "0":
                                     shuffle = "off"
                                 case "1":
@@ -1563,43 +1767,34 @@ class Plugin(indigo.PluginBase):
                                     shuffle = "albums"
                                 case _:
                                     shuffle = "?"
-                            playerIdsToProcess = self._playersToProcess(self.replyPlayerId, "playlist shuffle")
+                            playerIdsToProcess = self._playersToProcess(ctx.replyPlayerId, "playlist shuffle")
                             for playerIdToProcess in playerIdsToProcess:
                                 self.deviceStateUpdate(True, devPlayer, SHUFFLE, "shuffle", shuffle)  # TODO: Check this is correct ???
 
         except Exception as exception_error:
             self.exception_handler(exception_error, True)  # Log error and display failing statement
 
-    def _handle_player_detail_mixer(self, devServer, devPlayer):
+    def _handle_player_detail_mixer(self, ctx, devServer, devPlayer):
         try:
-            if self.serverResponse[2] == "volume":  # mixer volume
-                volume = self.serverResponse[3]
+            if ctx.serverResponse[2] == "volume":  # mixer volume
+                volume = ctx.serverResponse[3]
                 # self.deviceStateUpdate(True,  devPlayer, "volume", volume)
 
         except Exception as exception_error:
             self.exception_handler(exception_error, True)  # Log error and display failing statement
 
-    def _handle_player_detail_playerpref(self, devServer, devPlayer):
+    def _handle_player_detail_playerpref(self, ctx, devServer, devPlayer):
         try:
-            if self.serverResponse[2] == "volume":  # playerpref volume
-                volume = self.serverResponse[3]
-                self.deviceStateUpdate(True, devPlayer, VOLUME, "volume", volume)
-
-                if self.globals[ANNOUNCEMENT][STEP] == "initialise":
-                    self.logger.debug(f"ACT=[initialise]: {indigo.devices[self.masterPlayerId].name}")
-                    if len(self.serverResponse) > 3:
-                        savedVolume = volume
-                    else:
-                        savedVolume = "?"
-                    self.deviceStateUpdate(False, devPlayer, SAVED_VOLUME, "savedVolume", savedVolume)
+            if ctx.serverResponse[2] == "volume":  # playerpref volume
+                self._playerUpdateVolume(ctx, devPlayer, ctx.serverResponse[3])
 
-            if self.serverResponse[2] == "maintainSync":  # playerpref maintainSync
-                maintainSync = self.serverResponse[3]
+            if ctx.serverResponse[2] == "maintainSync":  # playerpref maintainSync
+                maintainSync = ctx.serverResponse[3]
                 self.deviceStateUpdate(True, devPlayer, MAINTAIN_SYNC, "maintainSync", maintainSync)
 
                 if self.globals[ANNOUNCEMENT][STEP] == "initialise":
-                    self.logger.debug(f"ACT=[initialise]: {indigo.devices[self.masterPlayerId].name}")
-                    if len(self.serverResponse) > 3:
+                    self.logger.debug(f"ACT=[initialise]: {indigo.devices[ctx.masterPlayerId].name}")
+                    if len(ctx.serverResponse) > 3:
                         savedMaintainSync = maintainSync
                     else:
                         savedMaintainSync = "?"
@@ -1609,240 +1804,261 @@ class Plugin(indigo.PluginBase):
         except Exception as exception_error:
             self.exception_handler(exception_error, True)  # Log error and display failing statement
 
-    def _handle_player_detail_maintainSync(self, devServer, devPlayer):
+    def _playerUpdateVolume(self, ctx, devPlayer, volume):
+        try:
+            self.deviceStateUpdate(True, devPlayer, VOLUME, "volume", volume)
+
+            if self.globals[ANNOUNCEMENT][STEP] == "initialise":
+                self.logger.debug(f"ACT=[initialise]: {indigo.devices[ctx.masterPlayerId].name}")
+                self.deviceStateUpdate(False, devPlayer, SAVED_VOLUME, "savedVolume", volume)
+
+        except Exception as exception_error:
+            self.exception_handler(exception_error, True)  # Log error and display failing statement
+
+    def _handle_player_detail_maintainSync(self, ctx, devServer, devPlayer):
         try:
             pass
         except Exception as exception_error:
             self.exception_handler(exception_error, True)  # Log error and display failing statement
 
-    def _handle_player_detail_artist(self, devServer, devPlayer):
+    def _handle_player_detail_artist(self, ctx, devServer, devPlayer):
         try:
-            artistResponse = self.responseFromSqueezeboxServer.split(" ", 2)
             try:
+                artistResponse = ctx.responseFromSqueezeboxServer.split(" ", 2)
                 artist = artistResponse[2].rstrip()
             except:
                 artist = ""
 
-            playerIdsToProcess = self._playersToProcess(self.replyPlayerId, "artist")
-            for playerIdToProcess in playerIdsToProcess:
-                if self.globals[PLAYERS][playerIdToProcess][CONNECTED]:
-                    self.deviceStateUpdate(True, devPlayer, ARTIST, "artist", artist)
+            self._playerUpdateTrackDetail(ctx, devPlayer, ARTIST, "artist", artist)
 
         except Exception as exception_error:
-                self.exception_handler(exception_error, True)  # Log error and display failing statement
+            self.exception_handler(exception_error, True)  # Log error and display failing statement
 
-    def _handle_player_detail_album(self, devServer, devPlayer):
+    def _handle_player_detail_album(self, ctx, devServer, devPlayer):
         try:
             try:
-                albumResponse = self.responseFromSqueezeboxServer.split(" ", 2)
+                albumResponse = ctx.responseFromSqueezeboxServer.split(" ", 2)
                 album = albumResponse[2].rstrip()
             except:
                 album = ""
 
-            playerIdsToProcess = self._playersToProcess(self.replyPlayerId, "album")
-            for playerIdToProcess in playerIdsToProcess:
-                if self.globals[PLAYERS][playerIdToProcess][CONNECTED]:
-                    self.deviceStateUpdate(True, devPlayer, ALBUM, "album", album)
+            self._playerUpdateTrackDetail(ctx, devPlayer, ALBUM, "album", album)
 
         except Exception as exception_error:
             self.exception_handler(exception_error, True)  # Log error and display failing statement
 
-    def _handle_player_detail_title(self, devServer, devPlayer):
+    def _handle_player_detail_title(self, ctx, devServer, devPlayer):
         try:
             try:
-                titleResponse = self.responseFromSqueezeboxServer.split(" ", 2)
+                titleResponse = ctx.responseFromSqueezeboxServer.split(" ", 2)
                 title = titleResponse[2].rstrip()
             except:
                 title = ""
 
-            playerIdsToProcess = self._playersToProcess(self.replyPlayerId, "title")
-            for playerIdToProcess in playerIdsToProcess:
-                if self.globals[PLAYERS][playerIdToProcess][CONNECTED]:
-                    self.deviceStateUpdate(True, devPlayer, TITLE, "title", title)
+            self._playerUpdateTrackDetail(ctx, devPlayer, TITLE, "title", title)
 
         except Exception as exception_error:
             self.exception_handler(exception_error, True)  # Log error and display failing statement
 
-    def _handle_player_detail_genre(self, devServer, devPlayer):
+    def _handle_player_detail_genre(self, ctx, devServer, devPlayer):
         try:
             try:
-                genreResponse = self.responseFromSqueezeboxServer.split(" ", 2)
+                genreResponse = ctx.responseFromSqueezeboxServer.split(" ", 2)
                 genre = genreResponse[2].rstrip()
             except:
                 genre = ""
 
-            playerIdsToProcess = self._playersToProcess(self.replyPlayerId, "genre")
+            self._playerUpdateTrackDetail(ctx, devPlayer, GENRE, "genre", genre)
+
+        except Exception as exception_error:
+            self.exception_handler(exception_error, True)  # Log error and display failing statement
+
+    def _playerUpdateTrackDetail(self, ctx, devPlayer, internalKey, stateKey, stateValue):  # artist, album, title or genre
+        try:
+            playerIdsToProcess = self._playersToProcess(ctx.replyPlayerId, stateKey)
             for playerIdToProcess in playerIdsToProcess:
                 if self.globals[PLAYERS][playerIdToProcess][CONNECTED]:
-                    self.deviceStateUpdate(True, devPlayer, GENRE, "genre", genre)
+                    self.deviceStateUpdate(True, devPlayer, internalKey, stateKey, stateValue)
+                    break
 
         except Exception as exception_error:
             self.exception_handler(exception_error, True)  # Log error and display failing statement
 
-    def _handle_player_detail_duration(self, devServer, devPlayer):
+    def _handle_player_detail_duration(self, ctx, devServer, devPlayer):
         try:
-            durationUi = ""
             try:
-                durationResponse = self.responseFromSqueezeboxServer.split(" ", 2)
+                durationResponse = ctx.responseFromSqueezeboxServer.split(" ", 2)
                 duration = durationResponse[2].rstrip()
-                try:
-                    m, s = divmod(float(duration), 60)
-                    durationUi = str(f"{int(m)}:{int(s)}")
-                except:
-                    pass
             except:
                 duration = ""
 
-            playerIdsToProcess = self._playersToProcess(self.replyPlayerId, "duration")
-            for playerIdToProcess in playerIdsToProcess:
-                if self.globals[PLAYERS][playerIdToProcess][CONNECTED]:
-                    self.deviceStateUpdate(True, devPlayer, DURATION, "duration", duration)
-                    self.deviceStateUpdate(True, devPlayer, DURATION_UI, "durationUi", durationUi)
+            self._playerUpdateDuration(ctx, devPlayer, duration)
 
         except Exception as exception_error:
                 self.exception_handler(exception_error, True)  # Log error and display failing statement
 
-    def _handle_player_detail_autologMixerMuteAll(self, devServer, devPlayer):
+    def _playerUpdateDuration(self, ctx, devPlayer, duration):
         try:
-            playerIdsToProcess = self._playersToProcess(self.replyPlayerId, "autologMixerMuteAll")
-            for playerIdToProcess in playerIdsToProcess:
-                mac = self._playerDeviceIdToMAC(playerIdToProcess)
-                self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][playerIdToProcess][SERVER_ID]].put([f"{mac} mixer muting 1"])
-
-        except Exception as exception_error:
-                self.exception_handler(exception_error, True)  # Log error and display failing statement
+            durationUi = ""
+            try:
+                m, s = divmod(float(duration), 60)
+                durationUi = str(f"{int(m)}:{int(s)}")
+            except ValueError:
+                pass
 
-    def _handle_player_detail_autologMixerUnmuteAll(self, devServer, devPlayer):
-        try:
-            playerIdsToProcess = self._playersToProcess(self.replyPlayerId, "autologMixerUnmuteAll")
+            playerIdsToProcess = self._playersToProcess(ctx.replyPlayerId, "duration")
             for playerIdToProcess in playerIdsToProcess:
-                mac = self._playerDeviceIdToMAC(playerIdToProcess)
-                self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][playerIdToProcess][SERVER_ID]].put([f"{mac} mixer muting 0"])
+                if self.globals[PLAYERS][playerIdToProcess][CONNECTED]:
+                    self.deviceStateUpdate(True, devPlayer, DURATION, "duration", duration)
+                    self.deviceStateUpdate(True, devPlayer, DURATION_UI, "durationUi", durationUi)
+                    break
 
         except Exception as exception_error:
                 self.exception_handler(exception_error, True)  # Log error and display failing statement
 
-    def _handle_player_detail_autologMixerToggleMuteAll(self, devServer, devPlayer):
+    def _playerMixerMutingAll(self, future, devId, muting):  # Done callback of the "syncgroups ?" refresh
         try:
-            playerIdsToProcess = self._playersToProcess(self.replyPlayerId, "autologMixerToggleMuteAll")
+            if future.exception() is not None:
+                self.logger.error(f"Mixer muting {muting} of players synced with '{indigo.devices[devId].name}' not actioned: {future.exception()}")
+                return
+
+            playerIdsToProcess = self._playersToProcess(devId, f"mixerMutingAll {muting}")
             for playerIdToProcess in playerIdsToProcess:
                 mac = self._playerDeviceIdToMAC(playerIdToProcess)
-                self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][playerIdToProcess][SERVER_ID]].put([f"{mac} mixer muting toggle"])
+                self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][playerIdToProcess][SERVER_ID]].put([f"{mac} mixer muting {muting}"], interactive=True)
 
         except Exception as exception_error:
                 self.exception_handler(exception_error, True)  # Log error and display failing statement
 
-    def _handle_player_detail_remote(self, devServer, devPlayer):
+    def _handle_player_detail_remote(self, ctx, devServer, devPlayer):
         try:
             try:
-                remoteResponse = self.responseFromSqueezeboxServer.split(" ", 2)
+                remoteResponse = ctx.responseFromSqueezeboxServer.split(" ", 2)
                 remoteStream = remoteResponse[2].rstrip()
             except:
                 remoteStream = "0"
 
+            self._playerUpdateRemote(ctx, devPlayer, remoteStream)
+
+        except Exception as exception_error:
+            self.exception_handler(exception_error, True)  # Log error and display failing statement
+
+    def _playerUpdateRemote(self, ctx, devPlayer, remoteStream):
+        try:
             if remoteStream == "1":
                 remoteStream = "true"
-                songUrl = self.globals[PLAYERS][self.replyPlayerId][SONG_URL]
-                if songUrl != "":
-                    mac = indigo.devices[self.replyPlayerId].address
-                    self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][self.replyPlayerId][SERVER_ID]].put([f"{mac} songinfo 0 100 url:{songUrl} tags:K"])
             else:
                 remoteStream = "false"
-                songUrl = self.globals[PLAYERS][self.replyPlayerId][SONG_URL]
-                if songUrl != "":
-                    mac = indigo.devices[self.replyPlayerId].address
-                    self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][self.replyPlayerId][SERVER_ID]].put([f"{mac} songinfo 0 100 url:{songUrl} tags:K"])
+            songUrl = self.globals[PLAYERS][ctx.replyPlayerId][SONG_URL]
+            if songUrl != "":
+                mac = indigo.devices[ctx.replyPlayerId].address
+                self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][ctx.replyPlayerId][SERVER_ID]].put([f"{mac} songinfo 0 100 url:{songUrl} tags:K"])
 
-            playerIdsToProcess = self._playersToProcess(self.replyPlayerId, "remote")
+            playerIdsToProcess = self._playersToProcess(ctx.replyPlayerId, "remote")
             for playerIdToProcess in playerIdsToProcess:
                 self.deviceStateUpdate(True, devPlayer, REMOTE_STREAM, "remoteStream", remoteStream)
 
         except Exception as exception_error:
             self.exception_handler(exception_error, True)  # Log error and display failing statement
 
-    def _handle_player_detail_client(self, devServer, devPlayer):
+    def _handle_player_detail_client(self, ctx, devServer, devPlayer):
         try:
-            if self.serverResponse[2] == "new":  # client new
-                self.connectingDevId = self._playerMACToDeviceId(self.serverResponse[0])
-                if self.connectingDevId == 0:
-                    self.logger.info(f"New Player [{self.serverResponse[0]}] detected.")
+            if ctx.serverResponse[2] == "new":  # client new
+                connectingDevId = self._playerMACToDeviceId(ctx.serverResponse[0])
+                if connectingDevId == 0:
+                    self.logger.info(f"New Player [{ctx.serverResponse[0]}] detected.")
                 else:
-                    self.logger.info(f"{indigo.devices[self.connectingDevId].name} player [{self.serverResponse[0]}] connecting")
+                    self.logger.info(f"{indigo.devices[connectingDevId].name} player [{ctx.serverResponse[0]}] connecting")
                 self.globals[QUEUES][COMMAND_TO_SEND][devServer.id].put(["serverstatus 0 0 subscribe:-"])
 
-            elif self.serverResponse[2] == "disconnect":  # client disconnect
-                self.disconnectingDevId = self._playerMACToDeviceId(self.serverResponse[0])
-                if self.disconnectingDevId == 0:
-                    self.logger.info(f"Unknown player [{self.serverResponse[0]}] disconnecting")
+            elif ctx.serverResponse[2] == "disconnect":  # client disconnect
+                disconnectingDevId = self._playerMACToDeviceId(ctx.serverResponse[0])
+                if disconnectingDevId == 0:
+                    self.logger.info(f"Unknown player [{ctx.serverResponse[0]}] disconnecting")
                 else:
-                    self.logger.info(f"{indigo.devices[self.disconnectingDevId].name} player [{self.serverResponse[0]}] disconnecting")
+                    self.logger.info(f"{indigo.devices[disconnectingDevId].name} player [{ctx.serverResponse[0]}] disconnecting")
 
-                    self.globals[PLAYERS][self.disconnectingDevId][POWER_UI] = "disconnected"
+                    self.globals[PLAYERS][disconnectingDevId][POWER_UI] = "disconnected"
 
                     # Reset any active announcements for known player
 
-                    if self.globals[PLAYERS][self.disconnectingDevId][MASTER_PLAYER_ID] != 0:
-                        self.masterPlayerId = self.globals[PLAYERS][self.disconnectingDevId][MASTER_PLAYER_ID]
+                    if self.globals[PLAYERS][disconnectingDevId][MASTER_PLAYER_ID] != 0:
+                        ctx.masterPlayerId = self.globals[PLAYERS][disconnectingDevId][MASTER_PLAYER_ID]
                     else:
-                        self.masterPlayerId = self.disconnectingDevId
+                        ctx.masterPlayerId = disconnectingDevId
 
                     self.globals[ANNOUNCEMENT][ACTIVE] = NO
-                    self.globals[PLAYERS][self.masterPlayerId][ANNOUNCEMENT_PLAY_INITIALISED] = False
-                    self.logger.info(f"Reset Announcement actioned for {indigo.devices[self.disconnectingDevId].name} player [{self.serverResponse[0]}] as disconnected")
+                    self.globals[PLAYERS][ctx.masterPlayerId][ANNOUNCEMENT_PLAY_INITIALISED] = False
+                    self.logger.info(f"Reset Announcement actioned for {indigo.devices[disconnectingDevId].name} player [{ctx.serverResponse[0]}] as disconnected")
                     self.globals[QUEUES][ANNOUNCEMENT].queue.clear
 
                 self.globals[QUEUES][COMMAND_TO_SEND][devServer.id].put(["serverstatus 0 0 subscribe:-"])
 
-            elif self.serverResponse[2] == "forget":  # client forget
-                self.forgottenDevId = self._playerMACToDeviceId(self.serverResponse[0])
-                if self.forgottenDevId == 0:
-                    self.logger.info(f"Unknown player [{self.serverResponse[0]}] forgotten")
+            elif ctx.serverResponse[2] == "forget":  # client forget
+                forgottenDevId = self._playerMACToDeviceId(ctx.serverResponse[0])
+                if forgottenDevId == 0:
+                    self.logger.info(f"Unknown player [{ctx.serverResponse[0]}] forgotten")
                 else:
-                    self.logger.info(f"{indigo.devices[self.forgottenDevId].name} player [{self.serverResponse[0]}] forgotten")
+                    self.logger.info(f"{indigo.devices[forgottenDevId].name} player [{ctx.serverResponse[0]}] forgotten")
                 self.globals[QUEUES][COMMAND_TO_SEND][devServer.id].put(["serverstatus 0 0 subscribe:-"])
 
-            elif self.serverResponse[2] == "reconnect":  # client reconnect
-                self.reconnectingDevId = self._playerMACToDeviceId(self.serverResponse[0])
-                if self.reconnectingDevId == 0:
-                    self.logger.info(f"Unknown player [{self.serverResponse[0]}] reconnecting")
+            elif ctx.serverResponse[2] == "reconnect":  # client reconnect
+                reconnectingDevId = self._playerMACToDeviceId(ctx.serverResponse[0])
+                if reconnectingDevId == 0:
+                    self.logger.info(f"Unknown player [{ctx.serverResponse[0]}] reconnecting")
                 else:
-                    self.logger.info(f"{indigo.devices[self.reconnectingDevId].name} player [{self.serverResponse[0]}] reconnecting")
+                    self.logger.info(f"{indigo.devices[reconnectingDevId].name} player [{ctx.serverResponse[0]}] reconnecting")
                 self.globals[QUEUES][COMMAND_TO_SEND][devServer.id].put(["serverstatus 0 0 subscribe:-"])
 
         except Exception as exception_error:
             self.exception_handler(exception_error, True)  # Log error and display failing statement
 
-    def _handle_player_detail_autologAnnouncementRequest(self, devServer, devPlayer):
+    def _handle_player_detail_autologAnnouncementRequest(self, ctx, devServer, devPlayer):
         try:
             if self.globals[ANNOUNCEMENT][ACTIVE] == PENDING:
                 self.globals[ANNOUNCEMENT][ACTIVE] = YES
 
                 self.globals[ANNOUNCEMENT][STEP] = "request"
-                self.logger.debug(f"NXT=[request]: {indigo.devices[self.masterPlayerId].name}")
+                self.logger.debug(f"NXT=[request]: {indigo.devices[ctx.masterPlayerId].name}")
 
-                self.globals[PLAYERS][self.masterPlayerId][ANNOUNCEMENT_UNIQUE_KEY] = self.serverResponse[2]
-                announcementUniqueKey = self.globals[PLAYERS][self.masterPlayerId][ANNOUNCEMENT_UNIQUE_KEY]
+                self.globals[PLAYERS][ctx.masterPlayerId][ANNOUNCEMENT_UNIQUE_KEY] = ctx.serverResponse[2]
+                announcementUniqueKey = self.globals[PLAYERS][ctx.masterPlayerId][ANNOUNCEMENT_UNIQUE_KEY]
 
-                self.globals[ANNOUNCEMENT][FILE_CHECK_OK] = True  # Assume file checks will be OK (Read Directory will set to False if not)
-                if PREPEND in self.globals[ANNOUNCEMENT][announcementUniqueKey]:
-                    self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][self.masterPlayerId][SERVER_ID]].put([
-                        f"readdirectory 0 1 autologFunction:AnnouncementCheck autologDevice:{str(self.masterPlayerId)} folder:{os.path.dirname(self.globals[ANNOUNCEMENT][announcementUniqueKey][PREPEND])} filter:{os.path.basename(self.globals[ANNOUNCEMENT][announcementUniqueKey][PREPEND])}"])
+                self.globals[ANNOUNCEMENT][FILE_CHECK_OK] = True  # Assume file checks will be OK (_playerAnnouncementFilesChecked will set to False if not)
+                fileCheckFutures = list()
+                for fileKey in (PREPEND, FILE, APPEND):
+                    if fileKey in self.globals[ANNOUNCEMENT][announcementUniqueKey]:
+                        fileCheckFutures.append(self.send_command(self.globals[PLAYERS][ctx.masterPlayerId][SERVER_ID],
+                            f"readdirectory 0 1 folder:{os.path.dirname(self.globals[ANNOUNCEMENT][announcementUniqueKey][fileKey])} filter:{os.path.basename(self.globals[ANNOUNCEMENT][announcementUniqueKey][fileKey])}"))
 
-                if FILE in self.globals[ANNOUNCEMENT][announcementUniqueKey]:
-                    self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][self.masterPlayerId][SERVER_ID]].put([
-                        f"readdirectory 0 1 autologFunction:AnnouncementCheck autologDevice:{str(self.masterPlayerId)} folder:{os.path.dirname(self.globals[ANNOUNCEMENT][announcementUniqueKey][FILE])} filter:{os.path.basename(self.globals[ANNOUNCEMENT][announcementUniqueKey][FILE])}"])
+                # Initialise the announcement once every file check has been replied to
+                gather(fileCheckFutures).add_done_callback(lambda future, masterPlayerId=ctx.masterPlayerId: self._playerAnnouncementFilesChecked(future, masterPlayerId))
 
-                if APPEND in self.globals[ANNOUNCEMENT][announcementUniqueKey]:
-                    self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][self.masterPlayerId][SERVER_ID]].put([
-                        f"readdirectory 0 1 autologFunction:AnnouncementCheck autologDevice:{str(self.masterPlayerId)} folder:{os.path.dirname(self.globals[ANNOUNCEMENT][announcementUniqueKey][APPEND])} filter:{os.path.basename(self.globals[ANNOUNCEMENT][announcementUniqueKey][APPEND])}"])
+        except Exception as exception_error:
+            self.exception_handler(exception_error, True)  # Log error and display failing statement
 
-                self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][self.masterPlayerId][SERVER_ID]].put([f"{self.masterPlayerMAC} autologAnnouncementInitialise"])
+    def _playerAnnouncementFilesChecked(self, future, masterPlayerId):  # Done callback of the announcement readdirectory checks
+        try:
+            if future.exception() is not None:
+                self.globals[ANNOUNCEMENT][FILE_CHECK_OK] = False
+                self.logger.error(f"Announcement file check failed. Play Announcement on '{indigo.devices[masterPlayerId].name}' not actioned: {future.exception()}")
+            else:
+                for reply in future.result():
+                    readDirectory = self._readDirectoryParse(reply)
+                    if readDirectory.get("count", "") != "1":
+                        self.globals[ANNOUNCEMENT][FILE_CHECK_OK] = False
+                        self.logger.error(
+                            f"Announcement File [{readDirectory.get('folder', '')}/{readDirectory.get('filter', '')}] not found. Play Announcement on '{indigo.devices[masterPlayerId].name}' not actioned.")
 
+            devMaster = indigo.devices[masterPlayerId]
+            ctx = HandlerContext(currentTime=indigo.server.getTime())
+            self._playerSetReplyContext(ctx, devMaster)
+            self._handle_player_detail_autologAnnouncementInitialise(ctx, indigo.devices[self.globals[PLAYERS][masterPlayerId][SERVER_ID]], devMaster)
 
         except Exception as exception_error:
             self.exception_handler(exception_error, True)  # Log error and display failing statement
 
-    def _handle_player_detail_autologAnnouncementInitialise(self, devServer, devPlayer):
+    def _handle_player_detail_autologAnnouncementInitialise(self, ctx, devServer, devPlayer):
         try:
             if not self.globals[ANNOUNCEMENT][FILE_CHECK_OK]:
                 self.globals[ANNOUNCEMENT][ACTIVE] = NO
@@ -1850,89 +2066,85 @@ class Plugin(indigo.PluginBase):
 
             else:
                 self.globals[ANNOUNCEMENT][STEP] = "initialise"
-                self.logger.debug(f"NXT=[initialise]: {indigo.devices[self.masterPlayerId].name}")
+                self.logger.debug(f"NXT=[initialise]: {indigo.devices[ctx.masterPlayerId].name}")
 
-                for slavePlayerId in self.globals[PLAYERS][self.masterPlayerId][SLAVE_PLAYER_IDS]:
-                    self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][slavePlayerId][SERVER_ID]].put([self.globals[PLAYERS][slavePlayerId][MAC] + " power ?"])
-                    self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][slavePlayerId][SERVER_ID]].put([self.globals[PLAYERS][slavePlayerId][MAC] + " mode ?"])
-                    self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][slavePlayerId][SERVER_ID]].put([self.globals[PLAYERS][slavePlayerId][MAC] + " playerpref volume ?"])
+                for slavePlayerId in self.globals[PLAYERS][ctx.masterPlayerId][SLAVE_PLAYER_IDS]:
+                    self._playerQueueStatusRefresh(self.globals[PLAYERS][slavePlayerId][SERVER_ID], self.globals[PLAYERS][slavePlayerId][MAC], ordered=True)
                     self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][slavePlayerId][SERVER_ID]].put([self.globals[PLAYERS][slavePlayerId][MAC] + " playerpref maintainSync ?"])
 
-                self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][self.masterPlayerId][SERVER_ID]].put([self.masterPlayerMAC + " power ?"])
-                self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][self.masterPlayerId][SERVER_ID]].put([self.masterPlayerMAC + " mode ?"])
-                self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][self.masterPlayerId][SERVER_ID]].put([self.masterPlayerMAC + " playerpref volume ?"])
-                self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][self.masterPlayerId][SERVER_ID]].put([self.masterPlayerMAC + " playerpref maintainSync ?"])
-                self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][self.masterPlayerId][SERVER_ID]].put([self.masterPlayerMAC + " playlist repeat ?"])
-                self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][self.masterPlayerId][SERVER_ID]].put([self.masterPlayerMAC + " playlist shuffle ?"])
-                self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][self.masterPlayerId][SERVER_ID]].put([self.masterPlayerMAC + " time ?"])
-                self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][self.masterPlayerId][SERVER_ID]].put([self.masterPlayerMAC + " stop"])
+                self._playerQueueStatusRefresh(self.globals[PLAYERS][ctx.masterPlayerId][SERVER_ID], ctx.masterPlayerMAC, ordered=True)
+                self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][ctx.masterPlayerId][SERVER_ID]].put([ctx.masterPlayerMAC + " playerpref maintainSync ?"])
+                self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][ctx.masterPlayerId][SERVER_ID]].put([ctx.masterPlayerMAC + " stop"])
 
-                self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][self.masterPlayerId][SERVER_ID]].put([self.masterPlayerMAC + " autologAnnouncementSaveState"])
+                self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][ctx.masterPlayerId][SERVER_ID]].put([ctx.masterPlayerMAC + " autologAnnouncementSaveState"])
 
         except Exception as exception_error:
             self.exception_handler(exception_error, True)  # Log error and display failing statement
 
-    def _handle_player_detail_power(self, devServer, devPlayer):
+    def _handle_player_detail_power(self, ctx, devServer, devPlayer):
         try:
-            if len(self.serverResponse) < 3:  # Check for Power Toggle - Need to query power to find power status
-                self.globals[QUEUES][COMMAND_TO_SEND][devServer.id].put([self.replyPlayerMAC + " power ?"])
+            if len(ctx.serverResponse) < 3:  # Check for Power Toggle - Need to query power to find power status
+                self.globals[QUEUES][COMMAND_TO_SEND][devServer.id].put([ctx.replyPlayerMAC + " power ?"])
             else:
-                previousPower = self.globals[PLAYERS][devPlayer.id][POWER]  # Power setting before handling response
+                self._playerUpdatePower(ctx, devServer, devPlayer, ctx.serverResponse[2].rstrip(), True)
 
-                power = self.serverResponse[2].rstrip()
-                match power:
-                    case "0":
-                        powerUi = "off"
-                    case "1":
-                        powerUi = "on"
-                    case _:
-                        powerUi = "?"
-                if not self.globals[PLAYERS][devPlayer.id][CONNECTED]:
-                    powerUi = "disconnected"
+        except Exception as exception_error:
+            self.exception_handler(exception_error, True)  # Log error and display failing statement
+
+    def _playerUpdatePower(self, ctx, devServer, devPlayer, power, refreshOnPowerOn):
+        try:
+            previousPower = self.globals[PLAYERS][devPlayer.id][POWER]  # Power setting before handling response
 
-                self.deviceStateUpdate(True, devPlayer, POWER, "power", power)
-                self.deviceStateUpdate(True, devPlayer, POWER_UI, "powerUi", powerUi)
+            match power:
+                case "0":
+                    powerUi = "off"
+                case "1":
+                    powerUi = "on"
+                case _:
+                    powerUi = "?"
+            if not self.globals[PLAYERS][devPlayer.id][CONNECTED]:
+                powerUi = "disconnected"
 
-                if self.globals[ANNOUNCEMENT][STEP] == "initialise":
-                    self.logger.debug(f"ACT=[initialise]: {indigo.devices[self.masterPlayerId].name}")
-                    self.globals[PLAYERS][devPlayer.id][SAVED_POWER] = power
+            self.deviceStateUpdate(True, devPlayer, POWER, "power", power)
+            self.deviceStateUpdate(True, devPlayer, POWER_UI, "powerUi", powerUi)
+
+            if self.globals[ANNOUNCEMENT][STEP] == "initialise":
+                self.logger.debug(f"ACT=[initialise]: {indigo.devices[ctx.masterPlayerId].name}")
+                self.globals[PLAYERS][devPlayer.id][SAVED_POWER] = power
 
-                if power != previousPower:
-                    self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][devPlayer.id][SERVER_ID]].put(["syncgroups ?"])
+            if power != previousPower:
+                self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][devPlayer.id][SERVER_ID]].put(["syncgroups ?"])
 
+                if refreshOnPowerOn:
                     if self.globals[PLAYERS][devPlayer.id][POWER_UI] == "on" and self.globals[ANNOUNCEMENT][STEP] != "initialise":
                         self.globals[QUEUES][COMMAND_TO_SEND][devServer.id].put([devPlayer.address + " autolog detected power on"])
-                        self.globals[QUEUES][COMMAND_TO_SEND][devServer.id].put([devPlayer.address + " mode ?"])
-                        self.globals[QUEUES][COMMAND_TO_SEND][devServer.id].put([devPlayer.address + " artist ?"])
-                        self.globals[QUEUES][COMMAND_TO_SEND][devServer.id].put([devPlayer.address + " album ?"])
-                        self.globals[QUEUES][COMMAND_TO_SEND][devServer.id].put([devPlayer.address + " title ?"])
-                        self.globals[QUEUES][COMMAND_TO_SEND][devServer.id].put([devPlayer.address + " genre ?"])
-                        self.globals[QUEUES][COMMAND_TO_SEND][devServer.id].put([devPlayer.address + " duration ?"])
-                        self.globals[QUEUES][COMMAND_TO_SEND][devServer.id].put([devPlayer.address + " remote ?"])
-                        self.globals[QUEUES][COMMAND_TO_SEND][devServer.id].put([devPlayer.address + " playerpref volume ?"])
+                        self._playerQueueStatusRefresh(devServer.id, devPlayer.address)
                         self.globals[QUEUES][COMMAND_TO_SEND][devServer.id].put([devPlayer.address + " playerpref maintainSync ?"])
-                        self.globals[QUEUES][COMMAND_TO_SEND][devServer.id].put([devPlayer.address + " playlist index ?"])
-                        self.globals[QUEUES][COMMAND_TO_SEND][devServer.id].put([devPlayer.address + " playlist tracks ?"])
-                        self.globals[QUEUES][COMMAND_TO_SEND][devServer.id].put([devPlayer.address + " playlist repeat ?"])
-                        self.globals[QUEUES][COMMAND_TO_SEND][devServer.id].put([devPlayer.address + " playlist shuffle ?"])
                     else:
                         self.globals[QUEUES][COMMAND_TO_SEND][devServer.id].put([devPlayer.address + " mode ?"])
 
-                if power == "0" or not self.globals[PLAYERS][devPlayer.id][CONNECTED]:
-                    try:
-                        shutil.copy2(self.globals[COVER_ART][COVER_ART_NO_FILE], self.globals[PLAYERS][devPlayer.id][COVER_ART_FILE])
-                    except Exception as exception_error:
-                        self.logger.error(f"Cover Art Error - IN: {self.globals[COVER_ART][COVER_ART_NO_FILE]}")
-                        self.logger.error(f"Cover Art Error - OUT: {self.globals[PLAYERS][devPlayer.id][COVER_ART_FILE]}")
-                        error_message = f"Cover Art Error - ERR: {exception_error}"
-                        self.exception_handler(error_message, True)  # Log error and display failing statement
+            if power == "0" or not self.globals[PLAYERS][devPlayer.id][CONNECTED]:
+                try:
+                    shutil.copy2(self.globals[COVER_ART][COVER_ART_NO_FILE], self.globals[PLAYERS][devPlayer.id][COVER_ART_FILE])
+                except Exception as exception_error:
+                    self.logger.error(f"Cover Art Error - IN: {self.globals[COVER_ART][COVER_ART_NO_FILE]}")
+                    self.logger.error(f"Cover Art Error - OUT: {self.globals[PLAYERS][devPlayer.id][COVER_ART_FILE]}")
+                    error_message = f"Cover Art Error - ERR: {exception_error}"
+                    self.exception_handler(error_message, True)  # Log error and display failing statement
+
+        except Exception as exception_error:
+            self.exception_handler(exception_error, True)  # Log error and display failing statement
+
+    def _handle_player_detail_mode(self, ctx, devServer, devPlayer):
+        try:
+            self._playerUpdateMode(ctx, devPlayer, ctx.serverResponse[2])
 
         except Exception as exception_error:
             self.exception_handler(exception_error, True)  # Log error and display failing statement
 
-    def _handle_player_detail_mode(self, devServer, devPlayer):
+    def _playerUpdateMode(self, ctx, devPlayer, mode):
         try:
-            self.deviceStateUpdate(True, devPlayer, MODE, "mode", self.serverResponse[2])
+            self.deviceStateUpdate(True, devPlayer, MODE, "mode", mode)
 
             match self.globals[PLAYERS][devPlayer.id][MODE]:
                 case "stop":
@@ -1956,7 +2168,7 @@ class Plugin(indigo.PluginBase):
                 key_value_list.append({"key": "playlistTrackNumber", "value": ""})
                 key_value_list.append({"key": "playlistTracksTotal", "value": ""})
                 key_value_list.append({"key": "playlistTracksUi", "value": ""})
-                devPlayer.updateStatesOnServer(key_value_list)
+                self.deviceStatesWrite(devPlayer, key_value_list)
 
             self.deviceStateUpdate(True, devPlayer, STATE, "state", state)
 
@@ -1974,39 +2186,105 @@ class Plugin(indigo.PluginBase):
                 case _:
                     stateImage = indigo.kStateImageSel.PowerOff
 
-            indigo.devices[devPlayer.id].updateStateImageOnServer(stateImage)
+            self.deviceStateImageWrite(devPlayer.id, stateImage)
 
-            self.logger.debug("state image selector: " + str(indigo.devices[self.replyPlayerId].displayStateImageSel))
+            self.logger.debug("state image selector: " + str(indigo.devices[ctx.replyPlayerId].displayStateImageSel))
 
             if self.globals[ANNOUNCEMENT][STEP] == "initialise":
-                self.logger.debug(f"ACT=[initialise]: {indigo.devices[self.masterPlayerId].name}")
-                self.globals[PLAYERS][self.masterPlayerId][SAVED_MODE] = self.serverResponse[2]
-                if self.globals[PLAYERS][self.masterPlayerId][SAVED_MODE] == "play":
-                    self.globals[PLAYERS][self.masterPlayerId][ANNOUNCEMENT_PLAYLIST_NO_PLAY] = "0"
+                self.logger.debug(f"ACT=[initialise]: {indigo.devices[ctx.masterPlayerId].name}")
+                self.globals[PLAYERS][ctx.masterPlayerId][SAVED_MODE] = mode
+                if self.globals[PLAYERS][ctx.masterPlayerId][SAVED_MODE] == "play":
+                    self.globals[PLAYERS][ctx.masterPlayerId][ANNOUNCEMENT_PLAYLIST_NO_PLAY] = "0"
                 else:
-                    self.globals[PLAYERS][self.masterPlayerId][ANNOUNCEMENT_PLAYLIST_NO_PLAY] = "1"
+                    self.globals[PLAYERS][ctx.masterPlayerId][ANNOUNCEMENT_PLAYLIST_NO_PLAY] = "1"
 
+        except Exception as exception_error:
+                self.exception_handler(exception_error, True)  # Log error and display failing statement
 
+    def _handle_player_detail_time(self, ctx, devServer, devPlayer):
+        try:
+            self._playerUpdateTime(ctx, ctx.serverResponse[2])
 
         except Exception as exception_error:
                 self.exception_handler(exception_error, True)  # Log error and display failing statement
 
-    def _handle_player_detail_time(self, devServer, devPlayer):
+    def _playerUpdateTime(self, ctx, playerTime):
         try:
-            self.globals[PLAYERS][self.masterPlayerId][TIME] = self.serverResponse[2]
+            self.globals[PLAYERS][ctx.masterPlayerId][TIME] = playerTime
             if self.globals[ANNOUNCEMENT][STEP] == "initialise":
-                self.logger.debug(f"ACT=[initialise]: {indigo.devices[self.masterPlayerId].name}")
-                self.globals[PLAYERS][self.masterPlayerId][SAVED_TIME] = self.serverResponse[2].split(".")[0]
+                self.logger.debug(f"ACT=[initialise]: {indigo.devices[ctx.masterPlayerId].name}")
+                self.globals[PLAYERS][ctx.masterPlayerId][SAVED_TIME] = playerTime.split(".")[0]
 
         except Exception as exception_error:
                 self.exception_handler(exception_error, True)  # Log error and display failing statement
 
-    def _handle_player_detail_autologAnnouncementSaveState(self, devServer, devPlayer):
+    def _handle_player_detail_status(self, ctx, devServer, devPlayer):
+        try:
+            # e.g. "00:04:20:aa:bb:cc status - 1 tags:adglKu player_name:Kitchen power:1 mode:play mixer%20volume:50 ... playlist%20index:3 title:... artist:..."
+            # Each item is individually quoted, so keys containing spaces (e.g. "mixer volume") are only recognisable item by item (the event's args)
+
+            statusResponse = TaggedResponse(ctx.serverEvent.args, STATUS_RECORD_KEY)  # Each playlist track record starts with "playlist index"
+            playerStatus = dict(statusResponse)
+            currentTrack = statusResponse.find_record("playlist index", playerStatus.get("playlist_cur_index"))  # Later tracks aren't parsed
+
+            self._playerUpdateFromStatus(ctx, devServer, devPlayer, playerStatus, currentTrack)
+
+        except Exception as exception_error:
+            self.exception_handler(exception_error, True)  # Log error and display failing statement
+
+    def _playerUpdateFromStatus(self, ctx, devServer, devPlayer, playerStatus, currentTrack):
+        try:
+            # Applied in the same order as the individual queries previously issued for a full player refresh
+            if "player_connected" in playerStatus:
+                self.deviceStateUpdate(True, devPlayer, CONNECTED, "connected", playerStatus["player_connected"] == "1")
+            if "power" in playerStatus:
+                self._playerUpdatePower(ctx, devServer, devPlayer, playerStatus["power"], False)  # Status already includes everything a refresh would query
+            if "mode" in playerStatus:
+                self._playerUpdateMode(ctx, devPlayer, playerStatus["mode"])
+
+            self._playerUpdateTrackDetail(ctx, devPlayer, ARTIST, "artist", currentTrack.get("artist", ""))
+            self._playerUpdateTrackDetail(ctx, devPlayer, ALBUM, "album", currentTrack.get("album", ""))
+            self._playerUpdateTrackDetail(ctx, devPlayer, TITLE, "title", currentTrack.get("title", ""))
+            self._playerUpdateTrackDetail(ctx, devPlayer, GENRE, "genre", currentTrack.get("genre", ""))
+            self._playerUpdateDuration(ctx, devPlayer, currentTrack.get("duration", playerStatus.get("duration", "")))
+            self._playerUpdateRemote(ctx, devPlayer, playerStatus.get("remote", "0"))
+
+            if "mixer volume" in playerStatus:
+                self._playerUpdateVolume(ctx, devPlayer, playerStatus["mixer volume"])
+            if "playlist_cur_index" in playerStatus:
+                self._playerUpdatePlaylistIndex(ctx, playerStatus["playlist_cur_index"])
+            self._playerUpdatePlaylistTracks(ctx, playerStatus.get("playlist_tracks", "0"))
+            if "playlist repeat" in playerStatus:
+                self._playerUpdateRepeat(ctx, playerStatus["playlist repeat"])
+            if "playlist shuffle" in playerStatus:
+                self._playerUpdateShuffle(ctx, playerStatus["playlist shuffle"])
+            if "time" in playerStatus:
+                self._playerUpdateTime(ctx, playerStatus["time"])
+
+        except Exception as exception_error:
+            self.exception_handler(exception_error, True)  # Log error and display failing statement
+
+    def _playerQueueStatusRefresh(self, serverId, mac, ordered=False):
+        try:
+            # A single tagged status request replaces the separate power, mode, artist, album, title, genre, duration, remote,
+            # volume, playlist index / tracks / repeat / shuffle and time queries.
+            # It is sent over JSON-RPC if enabled for the server, unless the caller relies on the reply being handled
+            # in order with the CLI commands queued after it (ordered=True e.g. announcement initialise).
+            jsonRpcTransport = self.globals[SERVERS][serverId].get(JSON_RPC_TRANSPORT)
+            if jsonRpcTransport is not None and not ordered:
+                jsonRpcTransport.submit(mac, ["status", "-", "1", f"tags:{STATUS_REFRESH_TAGS}"])
+            else:
+                self.globals[QUEUES][COMMAND_TO_SEND][serverId].put([f"{mac} status - 1 tags:{STATUS_REFRESH_TAGS}"])
+
+        except Exception as exception_error:
+            self.exception_handler(exception_error, True)  # Log error and display failing statement
+
+    def _handle_player_detail_autologAnnouncementSaveState(self, ctx, devServer, devPlayer):
         try:
             self.globals[ANNOUNCEMENT][STEP] = "saveState"
-            self.logger.debug(f"NXT=[saveState]: {indigo.devices[self.masterPlayerId].name}")
+            self.logger.debug(f"NXT=[saveState]: {indigo.devices[ctx.masterPlayerId].name}")
 
-            for slavePlayerId in self.globals[PLAYERS][self.masterPlayerId][SLAVE_PLAYER_IDS]:
+            for slavePlayerId in self.globals[PLAYERS][ctx.masterPlayerId][SLAVE_PLAYER_IDS]:
                 # for each slave player
 
                 if self.globals[PLAYERS][slavePlayerId][SAVED_POWER] == "0":
@@ -2018,49 +2296,49 @@ class Plugin(indigo.PluginBase):
                 # if self.globals[PLAYERS][slavePlayerId][SAVED_VOLUME != "50":
                 #     self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][slavePlayerId][SERVER_ID]].put([self.globals[PLAYERS][slavePlayerId][MAC] + " mixer volume 50")  # FIX THIS !!!!!!
 
-            if self.globals[PLAYERS][self.masterPlayerId][SAVED_MAINTAIN_SYNC] != "0":
-                self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][self.masterPlayerId][SERVER_ID]].put([self.masterPlayerMAC + " playerpref maintainSync 0"])
+            if self.globals[PLAYERS][ctx.masterPlayerId][SAVED_MAINTAIN_SYNC] != "0":
+                self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][ctx.masterPlayerId][SERVER_ID]].put([ctx.masterPlayerMAC + " playerpref maintainSync 0"])
 
             # if saved repeat != 0
             #    turn repeat off
-            if self.globals[PLAYERS][self.masterPlayerId][SAVED_REPEAT] != "0":
-                self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][self.masterPlayerId][SERVER_ID]].put([self.masterPlayerMAC + " playlist repeat 0"])
+            if self.globals[PLAYERS][ctx.masterPlayerId][SAVED_REPEAT] != "0":
+                self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][ctx.masterPlayerId][SERVER_ID]].put([ctx.masterPlayerMAC + " playlist repeat 0"])
 
             # if saved shuffle != 0
             #     turn shuffle off
-            if self.globals[PLAYERS][self.masterPlayerId][SAVED_SHUFFLE] != "0":
-                self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][self.masterPlayerId][SERVER_ID]].put([self.masterPlayerMAC + " playlist shuffle 0"])
+            if self.globals[PLAYERS][ctx.masterPlayerId][SAVED_SHUFFLE] != "0":
+                self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][ctx.masterPlayerId][SERVER_ID]].put([ctx.masterPlayerMAC + " playlist shuffle 0"])
 
             #  save playlist
-            self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][self.masterPlayerId][SERVER_ID]].put(
-                [self.masterPlayerMAC + " playlist save autolog_" + str(self.masterPlayerId) + " silent:1"])
+            self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][ctx.masterPlayerId][SERVER_ID]].put(
+                [ctx.masterPlayerMAC + " playlist save autolog_" + str(ctx.masterPlayerId) + " silent:1"])
 
-            self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][self.masterPlayerId][SERVER_ID]].put([self.masterPlayerMAC + " autologAnnouncementPlay"])
+            self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][ctx.masterPlayerId][SERVER_ID]].put([ctx.masterPlayerMAC + " autologAnnouncementPlay"])
 
         except Exception as exception_error:
             self.exception_handler(exception_error, True)  # Log error and display failing statement
 
-    def _handle_player_detail_autologAnnouncementPlay(self, devServer, devPlayer):
+    def _handle_player_detail_autologAnnouncementPlay(self, ctx, devServer, devPlayer):
         try:
             self.globals[ANNOUNCEMENT][STEP] = "play"
-            self.logger.debug(f"NXT=[play]: {indigo.devices[self.masterPlayerId].name}")
+            self.logger.debug(f"NXT=[play]: {indigo.devices[ctx.masterPlayerId].name}")
 
-            announcementUniqueKey = self.globals[PLAYERS][self.masterPlayerId][ANNOUNCEMENT_UNIQUE_KEY]
+            announcementUniqueKey = self.globals[PLAYERS][ctx.masterPlayerId][ANNOUNCEMENT_UNIQUE_KEY]
 
             # Set Volume
-            playerIdsToProcess = self._playersToProcess(self.replyPlayerId, "autologAnnouncementPlay Volume")
+            playerIdsToProcess = self._playersToProcess(ctx.replyPlayerId, "autologAnnouncementPlay Volume")
             for playerIdToProcess in playerIdsToProcess:
                 mac = self._playerDeviceIdToMAC(playerIdToProcess)
                 self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][playerIdToProcess][SERVER_ID]].put([mac + " mixer volume " + self.globals[ANNOUNCEMENT][announcementUniqueKey][VOLUME]])
 
-            self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][self.masterPlayerId][SERVER_ID]].put([self.masterPlayerMAC + " playlist clear"])
+            self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][ctx.masterPlayerId][SERVER_ID]].put([ctx.masterPlayerMAC + " playlist clear"])
 
             if self.globals[ANNOUNCEMENT][announcementUniqueKey][OPTION] == "file":
                 announcementFile = self.globals[ANNOUNCEMENT][announcementUniqueKey][FILE]
             else:
                 try:
                     # Check if device folder exists and if not create it
-                    temporary_announcement_folder_for_device = str(f"{self.globals[ANNOUNCEMENT][TEMPORARY_FOLDER]}/{ANNOUNCEMENTS_SUB_FOLDER}/{str(indigo.devices[self.masterPlayerId].id)}")
+                    temporary_announcement_folder_for_device = str(f"{self.globals[ANNOUNCEMENT][TEMPORARY_FOLDER]}/{ANNOUNCEMENTS_SUB_FOLDER}/{str(indigo.devices[ctx.masterPlayerId].id)}")
                     if not os.path.exists(temporary_announcement_folder_for_device):
                         os.makedirs(temporary_announcement_folder_for_device)
                     announcementFile = str(f"{temporary_announcement_folder_for_device}/autologSpeech.aif")  # announcementFile = "autologSpeech.aiff"
@@ -2086,42 +2364,42 @@ class Plugin(indigo.PluginBase):
 
             if "prepend" in self.globals[ANNOUNCEMENT][announcementUniqueKey]:
                 self.logger.debug(f"announcementPrepend = '{self.globals[ANNOUNCEMENT][announcementUniqueKey][PREPEND]}'")
-                self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][self.masterPlayerId][SERVER_ID]].put(
-                    [self.masterPlayerMAC + " playlist add " + self.globals[ANNOUNCEMENT][announcementUniqueKey][PREPEND]])
+                self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][ctx.masterPlayerId][SERVER_ID]].put(
+                    [ctx.masterPlayerMAC + " playlist add " + self.globals[ANNOUNCEMENT][announcementUniqueKey][PREPEND]])
 
             self.logger.debug(f"announcementFile = '{announcementFile}'")
             announcementFile = urllib.parse.quote(announcementFile)
-            self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][self.masterPlayerId][SERVER_ID]].put([self.masterPlayerMAC + " playlist add " + announcementFile])
+            self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][ctx.masterPlayerId][SERVER_ID]].put([ctx.masterPlayerMAC + " playlist add " + announcementFile])
 
             if "append" in self.globals[ANNOUNCEMENT][announcementUniqueKey]:
                 self.logger.debug(f"announcementAppend = '{self.globals[ANNOUNCEMENT][announcementUniqueKey][APPEND]}'")
-                self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][self.masterPlayerId][SERVER_ID]].put(
-                    [self.masterPlayerMAC + " playlist add " + self.globals[ANNOUNCEMENT][announcementUniqueKey][APPEND]])
+                self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][ctx.masterPlayerId][SERVER_ID]].put(
+                    [ctx.masterPlayerMAC + " playlist add " + self.globals[ANNOUNCEMENT][announcementUniqueKey][APPEND]])
 
-            self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][self.masterPlayerId][SERVER_ID]].put([self.masterPlayerMAC + " play"])
+            self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][ctx.masterPlayerId][SERVER_ID]].put([ctx.masterPlayerMAC + " play"])
 
         except Exception as exception_error:
                 self.exception_handler(exception_error, True)  # Log error and display failing statement
 
-    def _handle_player_detail_autologAnnouncementRestartPlaying(self, devServer, devPlayer):
+    def _handle_player_detail_autologAnnouncementRestartPlaying(self, ctx, devServer, devPlayer):
         try:
             self.globals[ANNOUNCEMENT][STEP] = "autologAnnouncementRestartPlaying"
-            self.logger.debug(f"NXT=[autologAnnouncementRestartPlaying]: {indigo.devices[self.masterPlayerId].name}")
+            self.logger.debug(f"NXT=[autologAnnouncementRestartPlaying]: {indigo.devices[ctx.masterPlayerId].name}")
 
-            if self.globals[PLAYERS][self.masterPlayerId][ANNOUNCEMENT_PLAYLIST_NO_PLAY] == "0" and self.globals[PLAYERS][self.masterPlayerId][SAVED_POWER] != 0:
-                self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][self.masterPlayerId][SERVER_ID]].put([self.masterPlayerMAC + " play"])
-                # if self.globals[PLAYERS][self.masterPlayerId][SAVED_TIME] !=  "0":
-                #     self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][self.masterPlayerId][SERVER_ID]].put([self.masterPlayerMAC + " time " + self.globals[PLAYERS][self.masterPlayerId][SAVED_TIME])
-            self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][self.masterPlayerId][SERVER_ID]].put(self.masterPlayerMAC + " autologAnnouncementEnded")
+            if self.globals[PLAYERS][ctx.masterPlayerId][ANNOUNCEMENT_PLAYLIST_NO_PLAY] == "0" and self.globals[PLAYERS][ctx.masterPlayerId][SAVED_POWER] != 0:
+                self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][ctx.masterPlayerId][SERVER_ID]].put([ctx.masterPlayerMAC + " play"])
+                # if self.globals[PLAYERS][ctx.masterPlayerId][SAVED_TIME] !=  "0":
+                #     self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][ctx.masterPlayerId][SERVER_ID]].put([ctx.masterPlayerMAC + " time " + self.globals[PLAYERS][ctx.masterPlayerId][SAVED_TIME])
+            self.globals[QUEUES][COMMAND_TO_SEND][self.globals[PLAYERS][ctx.masterPlayerId][SERVER_ID]].put(ctx.masterPlayerMAC + " autologAnnouncementEnded")
 
 
         except Exception as exception_error:
                 self.exception_handler(exception_error, True)  # Log error and display failing statement
 
-    def _handle_player_detail_autologAnnouncementEnded(self, devServer, devPlayer):
+    def _handle_player_detail_autologAnnouncementEnded(self, ctx, devServer, devPlayer):
         try:
             self.globals[ANNOUNCEMENT][STEP] = "autologAnnouncementEnded"
-            self.logger.debug(f"LAST STEP [autologAnnouncementEnded]: {indigo.devices[self.masterPlayerId].name}")
+            self.logger.debug(f"LAST STEP [autologAnnouncementEnded]: {indigo.devices[ctx.masterPlayerId].name}")
             self.globals[ANNOUNCEMENT][ACTIVE] = NO
             self.globals[ANNOUNCEMENT][STEP] = ""
             self.logger.debug("Play Announcement Ended")
@@ -2131,15 +2409,15 @@ class Plugin(indigo.PluginBase):
             try:
                 pass
                 # pop next queued announcement (if any) otherwise an Empty exception is raised
-                self.queuedAnnouncement = self.globals[QUEUES][ANNOUNCEMENT].get(False)
+                queuedAnnouncement = self.globals[QUEUES][ANNOUNCEMENT].get(False)
 
-                self.logger.debug(f"self.queuedAnnouncement = ({self.queuedAnnouncement[0]},{self.queuedAnnouncement[1]})")
+                self.logger.debug(f"queuedAnnouncement = ({queuedAnnouncement[0]},{queuedAnnouncement[1]})")
 
                 self.globals[ANNOUNCEMENT][ACTIVE] = PENDING
-                self.globals[QUEUES][COMMAND_TO_SEND][self.queuedAnnouncement[0]].put([self.queuedAnnouncement[1]])
+                self.globals[QUEUES][COMMAND_TO_SEND][queuedAnnouncement[0]].put([queuedAnnouncement[1]])
 
             except queue.Empty:
-                self.logger.debug("self.queuedAnnouncement = EMPTY")
+                self.logger.debug("queuedAnnouncement = EMPTY")
                 pass
                 # handle queue empty
 
@@ -2148,18 +2426,11 @@ class Plugin(indigo.PluginBase):
 
     def _playersToProcess(self, devId, debugText):
         try:
-            playerIdsToProcess = []
-            if self.globals[PLAYERS][devId][MASTER_PLAYER_ID] != 0:
-                masterPlayerId = self.globals[PLAYERS][devId][MASTER_PLAYER_ID]
-                playerIdsToProcess.append(masterPlayerId)
-                for slaveId in self.globals[PLAYERS][masterPlayerId][SLAVE_PLAYER_IDS]:
-                    playerIdsToProcess.append(slaveId)
-            elif (SLAVE_PLAYER_IDS in self.globals[PLAYERS][devId]) and len(self.globals[PLAYERS][devId][SLAVE_PLAYER_IDS]) > 0:
-                    playerIdsToProcess.append(devId)
-                    for slaveId in self.globals[PLAYERS][devId][SLAVE_PLAYER_IDS]:
-                        playerIdsToProcess.append(slaveId)
+            syncMasterId = self.globals[SYNC_GROUPS].group_of(devId)
+            if syncMasterId != 0:
+                playerIdsToProcess = list(self.globals[SYNC_GROUPS].members(syncMasterId))  # The master followed by its slaves
             else:
-                playerIdsToProcess.append(devId)
+                playerIdsToProcess = [devId]
 
             self.logger.debug(f"_playersToProcess [{debugText}] = {playerIdsToProcess}")
 
@@ -2170,11 +2441,7 @@ class Plugin(indigo.PluginBase):
 
     def _playerMACToDeviceId(self, mac):
         try:
-            deviceId = 0
-
-            for playerDevId in self.globals[PLAYERS]:
-                if mac == self.globals[PLAYERS][playerDevId][MAC]:
-                    deviceId = playerDevId
+            deviceId = self.globals[PLAYER_INDEX].dev_id(mac)
 
             # self.logger.debug(f"PLAYER MAC ADDRESS [{mac}] IS DEVICE ID [{deviceId}]")
 
@@ -2185,77 +2452,65 @@ class Plugin(indigo.PluginBase):
 
     def _playerDeviceIdToMAC(self, devId):
         try:
-            mac = ""
-            for playerDevId in self.globals[PLAYERS]:
-                if playerDevId == devId:
-                    mac = self.globals[PLAYERS][playerDevId][MAC]
-
-            return mac
+            return self.globals[PLAYER_INDEX].mac(devId)
 
         except Exception as exception_error:
             self.exception_handler(exception_error, True)  # Log error and display failing statement
 
-    def _playerRemoveSyncMaster(self):
+    def _playerDeviceByAddress(self, address):
         try:
-            for playerDevId in self.globals[PLAYERS]:
-                self.globals[PLAYERS][playerDevId][MASTER_PLAYER_ADDRESS] = ""
-                self.globals[PLAYERS][playerDevId][MASTER_PLAYER_ID] = 0
-                self.globals[PLAYERS][playerDevId][SLAVE_PLAYER_IDS] = []
+            # The started player with this MAC address from the index; otherwise (rarely e.g. when discovering players)
+            # any player device with it, including one that isn't started, so that a device isn't created twice
+            playerDevId = self.globals[PLAYER_INDEX].dev_id(address)
+            if playerDevId != 0:
+                return indigo.devices[playerDevId]
+            for playerDev in indigo.devices.iter(filter="self.squeezeboxPlayer"):
+                if playerDev.address == address:
+                    return playerDev
+            return None
 
         except Exception as exception_error:
             self.exception_handler(exception_error, True)  # Log error and display failing statement
 
-    def _playerUpdateSync(self):
+    def _playerUpdateSync(self, playerDevIds):
         try:
-            for playerDevId in self.globals[PLAYERS]:
-                dev = indigo.devices[playerDevId]
+            # Only the players whose sync group has changed (see SyncGroupGraph.apply / remove) are updated
+            for playerDevId in playerDevIds:
+                if playerDevId not in self.globals[PLAYERS]:
+                    continue  # Stopped since
+                masterPlayerId = self.globals[SYNC_GROUPS].master_of(playerDevId)
+                slavePlayerIds = self.globals[SYNC_GROUPS].slaves_of(playerDevId)
+
+                self.globals[PLAYERS][playerDevId][MASTER_PLAYER_ID] = masterPlayerId
+                self.globals[PLAYERS][playerDevId][MASTER_PLAYER_ADDRESS] = self._playerDeviceIdToMAC(masterPlayerId) if masterPlayerId != 0 else ""
+                self.globals[PLAYERS][playerDevId][SLAVE_PLAYER_IDS] = list(slavePlayerIds)
+
                 key_value_list = list()
-                if len(self.globals[PLAYERS][playerDevId][SLAVE_PLAYER_IDS]) == 0:  # Check if the contains any entries and if not ...
-                    key_value_list.append({"key": "isSyncMaster", "value": False})
-                    key_value_list.append({"key": "syncMasterSlave_1_Id", "value": "None"})
-                    key_value_list.append({"key": "syncMasterSlave_1_Address", "value": "None"})
-                    key_value_list.append({"key": "syncMasterSlave_1_Name", "value": ""})
-                    key_value_list.append({"key": "syncMasterSlave_2_Id", "value": "None"})
-                    key_value_list.append({"key": "syncMasterSlave_2_Address", "value": "None"})
-                    key_value_list.append({"key": "syncMasterSlave_2_Name", "value": ""})
-                    key_value_list.append({"key": "syncMasterSlave_3_Id", "value": "None"})
-                    key_value_list.append({"key": "syncMasterSlave_3_Address", "value": "None"})
-                    key_value_list.append({"key": "syncMasterSlave_3_Name", "value": ""})
-                    key_value_list.append({"key": "syncMasterSlave_4_Id", "value": "None"})
-                    key_value_list.append({"key": "syncMasterSlave_4_Address", "value": "None"})
-                    key_value_list.append({"key": "syncMasterSlave_4_Name", "value": ""})
-                    key_value_list.append({"key": "syncMasterNumberOfSlaves", "value": "0"})
-                else:
-                    key_value_list.append({"key": "isSyncMaster", "value": True})
-                    slaveIds = ""
-                    slaveAddresses = ""
-                    slaveNames = ""
-                    slaveLoopCount = 0
-                    for slaveId in self.globals[PLAYERS][playerDevId][SLAVE_PLAYER_IDS]:
-                        slaveLoopCount += 1
-                        if slaveLoopCount < 5:  # Maximum number of 4 slaves to be recorded in master player devices (even though internally it handles more)
-                            syncMasterSlave_N_Id = f"syncMasterSlave_{slaveLoopCount:d}_Id"
-                            syncMasterSlave_N_Address = f"syncMasterSlave_{slaveLoopCount:d}_Address"
-                            syncMasterSlave_N_Name= f"syncMasterSlave_{slaveLoopCount:d}_Name"
-
-                            key_value_list.append({"key": syncMasterSlave_N_Id, "value": str(slaveId)})
-                            key_value_list.append({"key": syncMasterSlave_N_Address, "value": self.globals[PLAYERS][slaveId][MAC]})
-                            key_value_list.append({"key": syncMasterSlave_N_Name, "value": self.globals[PLAYERS][slaveId][NAME]})
- 
-                    key_value_list.append({"key": "syncMasterNumberOfSlaves", "value": str(slaveLoopCount)})
-
-                if  self.globals[PLAYERS][playerDevId][MASTER_PLAYER_ID] == 0:
+                key_value_list.append({"key": "isSyncMaster", "value": len(slavePlayerIds) > 0})
+                for slaveNumber in range(1, 5):  # Maximum number of 4 slaves to be recorded in master player devices (even though internally it handles more)
+                    if slaveNumber <= len(slavePlayerIds):
+                        slaveId = slavePlayerIds[slaveNumber - 1]
+                        key_value_list.append({"key": f"syncMasterSlave_{slaveNumber:d}_Id", "value": str(slaveId)})
+                        key_value_list.append({"key": f"syncMasterSlave_{slaveNumber:d}_Address", "value": self.globals[PLAYERS][slaveId][MAC]})
+                        key_value_list.append({"key": f"syncMasterSlave_{slaveNumber:d}_Name", "value": self.globals[PLAYERS][slaveId][NAME]})
+                    else:
+                        key_value_list.append({"key": f"syncMasterSlave_{slaveNumber:d}_Id", "value": "None"})
+                        key_value_list.append({"key": f"syncMasterSlave_{slaveNumber:d}_Address", "value": "None"})
+                        key_value_list.append({"key": f"syncMasterSlave_{slaveNumber:d}_Name", "value": ""})
+                key_value_list.append({"key": "syncMasterNumberOfSlaves", "value": str(len(slavePlayerIds))})
+
+                if masterPlayerId == 0:
                     key_value_list.append({"key": "isSyncSlave", "value": False})
                     key_value_list.append({"key": "masterPlayerId", "value": "None"})
                     key_value_list.append({"key": "masterPlayerAddress", "value": "None"})
                     key_value_list.append({"key": "masterPlayername", "value": ""})
                 else:
                     key_value_list.append({"key": "isSyncSlave", "value": True})
-                    key_value_list.append({"key": "masterPlayerId", "value": str(self.globals[PLAYERS][playerDevId][MASTER_PLAYER_ID])})
+                    key_value_list.append({"key": "masterPlayerId", "value": str(masterPlayerId)})
                     key_value_list.append({"key": "masterPlayerAddress", "value": self.globals[PLAYERS][playerDevId][MASTER_PLAYER_ADDRESS]})
-                    key_value_list.append({"key": "masterPlayername", "value": self.globals[PLAYERS][self.globals[PLAYERS][playerDevId][MASTER_PLAYER_ID]][NAME]})
+                    key_value_list.append({"key": "masterPlayername", "value": self.globals[PLAYERS][masterPlayerId][NAME]})
 
-                dev.updateStatesOnServer(key_value_list)
+                self.deviceStatesWrite(playerDevId, key_value_list)
 
         except Exception as exception_error:
             self.exception_handler(exception_error, True)  # Log error and display failing statement
@@ -2279,10 +2534,34 @@ class Plugin(indigo.PluginBase):
                         errorDict["ipAddress"] = "Specify the Squeezebox Server IP Address"
                         errorDict["showAlertText"] = "Please specify the IP Address of the Squeezebox Server."
                         return False, valuesDict, errorDict
+
+                    pipelineWindow = valuesDict.get("pipelineWindow", "8")
+                    if not pipelineWindow.isdigit() or not 1 <= int(pipelineWindow) <= 64:
+                        errorDict = indigo.Dict()
+                        errorDict["pipelineWindow"] = "The value of this field must be between 1 to 64 inclusive."
+                        errorDict["showAlertText"] = "Invalid Pipeline Window specified."
+                        return False, valuesDict, errorDict
+
+                    if valuesDict.get("listenMode", "listen") == "subscribe":
+                        subscribeCommands = valuesDict.get("subscribeCommands", SUBSCRIBE_COMMANDS_DEFAULT).replace(" ", "")
+                        if not SUBSCRIBE_COMMANDS_PATTERN.match(subscribeCommands):
+                            errorDict = indigo.Dict()
+                            errorDict["subscribeCommands"] = "Specify a comma separated list of CLI commands e.g. 'mixer,playlist,power'."
+                            errorDict["showAlertText"] = "Invalid Subscribe Commands specified."
+                            return False, valuesDict, errorDict
+                        valuesDict["subscribeCommands"] = subscribeCommands
+
+                    if valuesDict.get("useJsonRpc", False):
+                        httpPort = valuesDict.get("httpPort", "9000")
+                        if not httpPort.isdigit() or not 1 <= int(httpPort) <= 65535:
+                            errorDict = indigo.Dict()
+                            errorDict["httpPort"] = "Specify the Squeezebox Server web interface port (normally 9000)."
+                            errorDict["showAlertText"] = "Invalid HTTP Port specified."
+                            return False, valuesDict, errorDict
                 case "squeezeboxPlayer":
                     # Validate Squeezebox Player
                     mac = valuesDict.get("mac", "")
-                    if re.match("[0-9a-f]{2}([-:])[0-9a-f]{2}(\\1[0-9a-f]{2}){4}$", mac.lower()):
+                    if MAC_ADDRESS_PATTERN.match(mac.lower()):
                        valid = True
                     else:
                         valid = False
@@ -2299,21 +2578,42 @@ class Plugin(indigo.PluginBase):
             self.exception_handler(exception_error, True)  # Log error and display failing statement
 
     def deviceStartComm(self, dev):
+        serverLock = self._serverLock(self._deviceServerId(dev))
+        serverLock.acquire()  # The server's responses aren't handled while it, or one of its players, is started
         try:
             dev.stateListOrDisplayStateIdChanged()  # Ensure latest devices.xml is being used
             self.currentTime = indigo.server.getTime()
 
             devId = dev.id
+            self.globals[STATE_CACHE].forget(devId)  # States may have been changed while the device was stopped
 
             if dev.deviceTypeId == "squeezeboxServer":
-                self.globals[SERVERS][devId] = dict()
+                with self.globals[SHARED_STATE_LOCK]:
+                    self.globals[SERVERS][devId] = ServerState()
+                self.globals[SERVER_CONNECTIONS].forget(devId)
                 self.globals[SERVERS][devId][KEEP_THREAD_ALIVE] = True
                 self.globals[SERVERS][devId][DATE_TIME_STARTED] = self.currentTime
                 self.globals[SERVERS][devId][IP_ADDRESS] = dev.pluginProps["ipAddress"]
                 self.globals[SERVERS][devId][PORT] = dev.pluginProps["port"]
+                try:
+                    self.globals[SERVERS][devId][PIPELINE_WINDOW] = int(dev.pluginProps.get("pipelineWindow", "8"))
+                except ValueError:
+                    self.globals[SERVERS][devId][PIPELINE_WINDOW] = 8
+                if dev.pluginProps.get("listenMode", "listen") == "subscribe":
+                    # Only the notifications the plugin handles are sent by the server, rather than every notification for every player
+                    self.globals[SERVERS][devId][LISTEN_COMMAND] = f"subscribe {dev.pluginProps.get('subscribeCommands', SUBSCRIBE_COMMANDS_DEFAULT)}"
+                else:
+                    self.globals[SERVERS][devId][LISTEN_COMMAND] = "listen 1"
+                self.globals[SERVERS][devId][HTTP_PORT] = dev.pluginProps.get("httpPort", "9000")
+                if dev.pluginProps.get("useJsonRpc", False):
+                    self.globals[SERVERS][devId][JSON_RPC_TRANSPORT] = JsonRpcTransport(self.globals, devId, self.globals[SERVERS][devId][IP_ADDRESS], self.globals[SERVERS][devId][HTTP_PORT])
+                else:
+                    self.globals[SERVERS][devId][JSON_RPC_TRANSPORT] = None
                 self.globals[SERVERS][devId][IP_ADDRESS_PORT] = f"{self.globals[SERVERS][devId][IP_ADDRESS]}:{self.globals[SERVERS][devId][PORT]}"
                 self.globals[SERVERS][devId][IP_ADDRESS_PORT_NAME] = (self.globals[SERVERS][devId][IP_ADDRESS_PORT].replace(".", "-")).replace(":", "-")
                 self.globals[SERVERS][devId][STATUS] = "starting"
+                self.globals[SERVERS][devId][RESYNC_PLAYER_IDS] = set()  # Players to refresh when a lost connection is re-established
+                self.globals[SERVERS][devId][RESYNC_PENDING] = False
                 self.globals[SERVERS][devId][LAST_SCAN] = "?"
                 self.globals[SERVERS][devId][PLAYER_MAC] = ""  # Used to handle specific player as result of subscribe (normally empty but used on connect)
 
@@ -2323,44 +2623,50 @@ class Plugin(indigo.PluginBase):
                     self.props["address"] = self.globals[SERVERS][devId][IP_ADDRESS_PORT]
                     dev.replacePluginPropsOnServer(self.props)
 
-                self.globals[QUEUES][COMMAND_TO_SEND][devId] = queue.Queue()  # set-up queue for each individual server
-
-                self.signalWakeupQueues(self.globals[QUEUES][COMMAND_TO_SEND][devId])  # noqa
+                self.globals[QUEUES][COMMAND_TO_SEND][devId] = CoalescingCommandQueue()  # set-up queue for each individual server (duplicate queries are coalesced)
 
-                self.globals[THREADS][COMMUNICATE_WITH_SERVER][devId] = dict()
-                self.globals[THREADS][COMMUNICATE_WITH_SERVER][devId][EVENT] = threading.Event()
-                self.globals[THREADS][COMMUNICATE_WITH_SERVER][devId][THREAD] = ThreadCommunicateWithServer(self.globals, devId)
-                self.globals[THREADS][COMMUNICATE_WITH_SERVER][devId][THREAD].start()
+                if self.globals[THREADS][ASYNC_TRANSPORT] is not None:
+                    self.globals[THREADS][ASYNC_TRANSPORT].start_server(devId)  # Command and listen connections run on the shared event loop
+                else:
+                    self.globals[THREADS][COMMUNICATE_WITH_SERVER][devId] = dict()
+                    self.globals[THREADS][COMMUNICATE_WITH_SERVER][devId][EVENT] = threading.Event()
+                    self.globals[THREADS][COMMUNICATE_WITH_SERVER][devId][THREAD] = ThreadCommunicateWithServer(self.globals, devId)
+                    self.globals[THREADS][COMMUNICATE_WITH_SERVER][devId][THREAD].start()
 
-                self.globals[THREADS][LISTEN_TO_SERVER][devId] = dict()
-                self.globals[THREADS][LISTEN_TO_SERVER][devId][EVENT] = threading.Event()
-                self.globals[THREADS][LISTEN_TO_SERVER][devId][THREAD] = ThreadListenToServer(self.globals, devId)
-                self.globals[THREADS][LISTEN_TO_SERVER][devId][THREAD].start()
+                    self.globals[THREADS][LISTEN_TO_SERVER][devId] = dict()
+                    self.globals[THREADS][LISTEN_TO_SERVER][devId][EVENT] = threading.Event()
+                    self.globals[THREADS][LISTEN_TO_SERVER][devId][THREAD] = ThreadListenToServer(self.globals, devId)
+                    self.globals[THREADS][LISTEN_TO_SERVER][devId][THREAD].start()
 
-                dev.updateStateOnServer(key="status", value=self.globals[SERVERS][devId][STATUS])
-                dev.updateStateImageOnServer(indigo.kStateImageSel.PowerOff)
+                self.deviceStateWrite(dev, "status", self.globals[SERVERS][devId][STATUS])
+                self.deviceStateImageWrite(dev, indigo.kStateImageSel.PowerOff)
 
                 self.globals[QUEUES][COMMAND_TO_SEND][devId].put(["serverstatus 0 0 subscribe:-"])  # E.g. ["00:04:20:ab:cd:ef", ["playlist", "name", "?"]]
 
                 self.logger.info(f"Started '{dev.name}': '{self.globals[SERVERS][devId][IP_ADDRESS]}'")
-                self.logger.debug(f"SELF.SERVERS for '{dev.name}' = {self.globals[SERVERS][devId]}")
+                self.logger.debug(f"SELF.SERVERS for '{dev.name}' = {self.globals[SERVERS][devId].snapshot()}")
 
             elif dev.deviceTypeId == "squeezeboxPlayer":
-                if dev.id not in self.globals[PLAYERS]:
-                    self.globals[PLAYERS][dev.id] = dict()
-
-                self.globals[PLAYERS][devId][NAME] = dev.name
                 model = indigo.devices[dev.id].states["model"]
-                if model != "":
-                    self.globals[PLAYERS][dev.id][MODEL] = model
-                self.globals[PLAYERS][devId][MAC] = dev.address
                 server_id = indigo.devices[dev.id].states["serverId"]
-                if server_id != 0:
-                    self.globals[PLAYERS][dev.id][SERVER_ID] = server_id
                 server_name = indigo.devices[dev.id].states["serverName"]
-                if server_name != "":
-                    self.globals[PLAYERS][dev.id][SERVER_NAME] = server_name
 
+                with self.globals[SHARED_STATE_LOCK]:
+                    if dev.id not in self.globals[PLAYERS]:
+                        self.globals[PLAYERS][dev.id] = PlayerState()
+
+                    self.globals[PLAYERS][devId][NAME] = dev.name
+                    if model != "":
+                        self.globals[PLAYERS][dev.id][MODEL] = model
+                    self.globals[PLAYERS][devId][MAC] = dev.address
+                    if server_id != 0:
+                        self.globals[PLAYERS][dev.id][SERVER_ID] = server_id
+                    if server_name != "":
+                        self.globals[PLAYERS][dev.id][SERVER_NAME] = server_name
+
+                    self.globals[PLAYER_INDEX].add(devId, dev.address, self.globals[PLAYERS][devId].get(SERVER_ID, 0))
+                    self.globals[PLAYERS][devId][SLAVE_PLAYER_IDS] = list()
+                    self.globals[SYNC_GROUPS].invalidate(devId)  # Its sync states are rewritten by the next "syncgroups ?" reply
                 self.logger.debug(f"MAC [{dev.name}] = '{self.globals[PLAYERS][devId][MAC]}'")
 
                 key_value_list = list()
@@ -2422,9 +2728,9 @@ class Plugin(indigo.PluginBase):
                 self.deviceUpdateKeyValueList(True, dev, key_value_list, TITLE, "title", "")
                 self.deviceUpdateKeyValueList(True, dev, key_value_list, VOLUME, "volume", "0")
 
-                dev.updateStatesOnServer(key_value_list)
-                dev.updateStateImageOnServer(indigo.kStateImageSel.PowerOff)
-                
+                self.deviceStatesWrite(dev, key_value_list)
+                self.deviceStateImageWrite(dev, indigo.kStateImageSel.PowerOff)
+
                 try:
                     if self.globals[SERVERS][self.globals[PLAYERS][devId][SERVER_ID]]:
                         pass
@@ -2435,7 +2741,7 @@ class Plugin(indigo.PluginBase):
                     self.logger.debug(f"Server Starting after player '{dev.name}'")
 
                 self.logger.info(f"Started '{dev.name}': '{self.globals[PLAYERS][devId][MAC]}'")
-                self.logger.debug(f"self.globals[PLAYERS] for '{dev.name}' = {self.globals[PLAYERS][devId]}")
+                self.logger.debug(f"self.globals[PLAYERS] for '{dev.name}' = {self.globals[PLAYERS][devId].snapshot()}")
 
 
                 createCoverArtUrl = False
@@ -2475,11 +2781,21 @@ class Plugin(indigo.PluginBase):
 
         except Exception as exception_error:
             self.exception_handler(exception_error, True)  # Log error and display failing statement
+        finally:
+            serverLock.release()
+
+    def _deviceServerId(self, dev):
+        # The server device id of a server device or of a player device (0 if its server isn't known yet)
+        if dev.deviceTypeId == "squeezeboxServer":
+            return dev.id
+        return dev.states.get("serverId", 0)
 
     def deviceUpdateKeyValueList(self, update_key_value_list, dev, key_value_list, internal_key, state_key, state_value):
         try:
             # self.logger.warning(f"deviceUpdateKeyValueList: DevId={dev.id}, InternalKey={internal_key}, StateKey={state_key}, StateValue={state_value}")  # TODO: DEBUG
             self.globals[PLAYERS][dev.id][internal_key] = state_value
+            if internal_key == SERVER_ID:
+                self.globals[PLAYER_INDEX].set_server(dev.id, state_value)
             if update_key_value_list:
                 key_value_list.append({"key": state_key, "value": state_value})
 
@@ -2489,29 +2805,126 @@ class Plugin(indigo.PluginBase):
     def deviceStateUpdate(self, updateServer, dev, internalKey, stateKey, stateValue):
         try:
             self.globals[PLAYERS][dev.id][internalKey] = stateValue
+            if internalKey == SERVER_ID:
+                self.globals[PLAYER_INDEX].set_server(dev.id, stateValue)
             if updateServer:
-                dev.updateStateOnServer(key=stateKey, value=stateValue)
+                self.deviceStateWrite(dev, stateKey, stateValue)
+
+        except Exception as exception_error:
+            self.exception_handler(exception_error, True)  # Log error and display failing statement
+
+    def deviceStateWrite(self, dev, stateKey, stateValue):
+        # All device state writes go through deviceStateWrite / deviceStatesWrite / deviceStateImageWrite, which skip writing
+        # a value unchanged since it was last written (see stateCache.py). dev is a device or a device id: a device is only
+        # looked up (an Indigo server round trip) if the value has changed.
+        try:
+            devId = dev if isinstance(dev, int) else dev.id
+            key_value_list = [{"key": stateKey, "value": stateValue}]
+            if self.globals[STATE_CACHE].state_changed(dev, stateKey, stateValue):
+                if not self.globals[STATE_CACHE].defer(dev, key_value_list=key_value_list):
+                    (indigo.devices[dev] if isinstance(dev, int) else dev).updateStateOnServer(key=stateKey, value=stateValue)
+                    self.globals[STATE_CACHE].states_written(devId, key_value_list)
+
+        except Exception as exception_error:
+            self.exception_handler(exception_error, True)  # Log error and display failing statement
+
+    def deviceStatesWrite(self, dev, key_value_list):
+        try:
+            devId = dev if isinstance(dev, int) else dev.id
+            changed_key_value_list = self.globals[STATE_CACHE].changed_states(dev, key_value_list)
+            if len(changed_key_value_list) > 0 and not self.globals[STATE_CACHE].defer(dev, key_value_list=changed_key_value_list):
+                (indigo.devices[dev] if isinstance(dev, int) else dev).updateStatesOnServer(changed_key_value_list)
+                self.globals[STATE_CACHE].states_written(devId, changed_key_value_list)
+
+        except Exception as exception_error:
+            self.exception_handler(exception_error, True)  # Log error and display failing statement
+
+    def deviceStateImageWrite(self, dev, stateImage):
+        try:
+            devId = dev if isinstance(dev, int) else dev.id
+            if self.globals[STATE_CACHE].image_changed(dev, stateImage) and not self.globals[STATE_CACHE].defer(dev, image=stateImage):
+                (indigo.devices[dev] if isinstance(dev, int) else dev).updateStateImageOnServer(stateImage)
+                self.globals[STATE_CACHE].image_written(devId, stateImage)
 
         except Exception as exception_error:
             self.exception_handler(exception_error, True)  # Log error and display failing statement
 
+    def deviceStatesFlush(self, keepBatching=False):
+        # Writes the states batched while handling a response: one updateStatesOnServer (and state image update) per device.
+        # A handler about to read back states it has written flushes with keepBatching=True.
+        pending = self.globals[STATE_CACHE].end_batch()
+        if keepBatching:
+            self.globals[STATE_CACHE].begin_batch()
+        for devId, (dev, states, stateImage) in pending.items():
+            try:
+                if dev is None:
+                    dev = indigo.devices[devId]
+                if len(states) > 0:
+                    key_value_list = list(states.values())
+                    dev.updateStatesOnServer(key_value_list)
+                    self.globals[STATE_CACHE].states_written(devId, key_value_list)
+                    self.globals[STATE_CACHE].flush_count += 1
+                if stateImage is not NOT_CACHED:
+                    dev.updateStateImageOnServer(stateImage)
+                    self.globals[STATE_CACHE].image_written(devId, stateImage)
+                    self.globals[STATE_CACHE].flush_count += 1
+
+            except Exception as exception_error:
+                self.exception_handler(exception_error, True)  # Log error and display failing statement
+
     def deviceStateUpdateWithIcon(self, updateServer, dev, internalKey, stateKey, stateValue, icon):
         try:
             self.deviceStateUpdate(updateServer, dev, internalKey, stateKey, stateValue)
-            dev.updateStateImageOnServer(icon)
+            self.deviceStateImageWrite(dev, icon)
 
         except Exception as exception_error:
             self.exception_handler(exception_error, True)  # Log error and display failing statement
 
     def deviceStopComm(self, dev):
+        serverLock = self._serverLock(self._deviceServerId(dev))
+        serverLock.acquire()  # The server's responses aren't handled while it, or one of its players, is stopped
         try:
             if dev.deviceTypeId == "squeezeboxServer":
-                del self.globals[SERVERS][dev.id]
+                self.globals[SERVERS][dev.id][KEEP_THREAD_ALIVE] = False
+                if self.globals[THREADS][ASYNC_TRANSPORT] is not None:
+                    self.globals[THREADS][ASYNC_TRANSPORT].stop_server(dev.id)
+                else:
+                    # Stop the communicate and listen threads rather than leaving them to reconnect
+                    for threadType in (COMMUNICATE_WITH_SERVER, LISTEN_TO_SERVER):
+                        if dev.id in self.globals[THREADS][threadType]:
+                            self.globals[THREADS][threadType][dev.id][EVENT].set()
+                    self.globals[QUEUES][COMMAND_TO_SEND][dev.id].wakeup()  # Wake the communicate thread if waiting for a command
+                if self.globals[SERVERS][dev.id][JSON_RPC_TRANSPORT] is not None:
+                    self.globals[SERVERS][dev.id][JSON_RPC_TRANSPORT].close()
+                with self.globals[SHARED_STATE_LOCK]:
+                    del self.globals[SERVERS][dev.id]
+                self.globals[SERVER_CONNECTIONS].forget(dev.id)
             elif dev.deviceTypeId == "squeezeboxPlayer":
-                del self.globals[PLAYERS][dev.id]
-
+                with self.globals[SHARED_STATE_LOCK]:
+                    del self.globals[PLAYERS][dev.id]
+                    self.globals[PLAYER_INDEX].remove(dev.id)
+                    syncChangedPlayerIds = self.globals[SYNC_GROUPS].remove(dev.id)
+                self._playerUpdateSync(syncChangedPlayerIds)  # The rest of its sync group (if any)
+            self.globals[STATE_CACHE].forget(dev.id)
 
             self.logger.info(f"Stopping '{dev.name}'")
 
         except Exception as exception_error:
             self.exception_handler(exception_error, True)  # Log error and display failing statement
+        finally:
+            serverLock.release()
+
+    def deviceUpdated(self, origDev, newDev):
+        try:
+            indigo.PluginBase.deviceUpdated(self, origDev, newDev)
+
+            # Keep the player index in step with a started player's address (MAC) being changed
+            if newDev.pluginId == self.globals[PLUGIN_INFO][PLUGIN_ID] and newDev.deviceTypeId == "squeezeboxPlayer":
+                if origDev.address != newDev.address:
+                    with self._serverLock(self._deviceServerId(newDev)), self.globals[SHARED_STATE_LOCK]:
+                        if newDev.id in self.globals[PLAYERS]:
+                            self.globals[PLAYERS][newDev.id][MAC] = newDev.address
+                            self.globals[PLAYER_INDEX].add(newDev.id, newDev.address, self.globals[PLAYERS][newDev.id].get(SERVER_ID, 0))
+
+        except Exception as exception_error:
+            self.exception_handler(exception_error, True)  # Log error and display failing statement
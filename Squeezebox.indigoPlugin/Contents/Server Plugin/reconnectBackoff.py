@@ -0,0 +1,31 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Squeezebox Controller © Autolog 2023
+#
+
+# noinspection PyUnresolvedReferences
+# ============================== Native Imports ===============================
+import random
+
+
+# noinspection PyPep8Naming
+class ReconnectBackoff:
+
+    # This class provides the delays between attempts to reconnect to a Squeezebox server.
+    # The delay doubles on each failed attempt up to a maximum and is randomised ("jitter") between half and all of that value,
+    # so the command and listen connections (and several plugins / servers) don't retry in lock step.
+    # It is reset once a connection is working again i.e. when the first line has been received from the server.
+
+    def __init__(self, initial_delay=1.0, maximum_delay=60.0):
+        self.initial_delay = initial_delay
+        self.maximum_delay = maximum_delay
+        self.attempt = 0
+
+    def next_delay(self):
+        delay_ceiling = min(self.maximum_delay, self.initial_delay * (2 ** min(self.attempt, 16)))
+        self.attempt += 1
+        return random.uniform(delay_ceiling / 2, delay_ceiling)
+
+    def reset(self):
+        self.attempt = 0
@@ -0,0 +1,189 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Squeezebox Controller © Autolog 2023
+#
+
+# noinspection PyUnresolvedReferences
+# ============================== Native Imports ===============================
+import collections
+import pickle
+import queue
+import tempfile
+import threading
+import time
+
+# ============================== Plugin Imports ===============================
+from constants import *
+
+POLICY_BLOCK = "block"  # A full queue blocks the producer (back-pressure on the server connections)
+POLICY_DROP_OLDEST = "drop_oldest"  # A full queue discards its oldest droppable notification
+POLICY_SPILL = "spill"  # A full queue writes further responses to a temporary file until the consumer catches up
+
+# The only notifications that may be dropped: each reports the latest value of a state, so a dropped one is superseded by
+# the next one (e.g. "mixer volume 41" by "mixer volume 42"). Anything else (power, mode, pause, repeat, client, sync, ...)
+# isn't necessarily followed by another report of the same state, so losing it would leave a player's state wrong.
+DROPPABLE_PATHS = frozenset((("mixer", "volume"), ("playlist", "index"), ("playlist", "newsong"), ("time",)))
+
+
+# noinspection PyPep8Naming
+class BoundedResponseQueue:
+
+    # This class replaces a plain (unbounded) queue.Queue as the common "returned response" queue and the per server
+    # dispatcher queues (same put / get interface).
+    # If runConcurrentThread falls behind, at most 'maxsize' responses are held in memory and the overload policy applies:
+    #   - block: the producing thread waits for space (the asyncio engine's event loop waits too, pausing every server).
+    #   - drop_oldest: the oldest latest-value listen notification (see DROPPABLE_PATHS) is discarded to make room (never a
+    #     reply, any other notification or a message carrying a future). If there is nothing droppable the producer waits as for block.
+    #   - spill: responses are pickled to a temporary file and read back in order once the consumer has caught up.
+    #     Futures (which can't be pickled) stay in memory, keyed by the spilled record.
+    # High water mark and overload counters are kept for sizing the queue (see statistics).
+
+    def __init__(self, maxsize=10000, policy=POLICY_BLOCK, spill_folder=None):
+        self.maxsize = maxsize
+        self.policy = policy
+        self.spill_folder = spill_folder
+        self.mutex = threading.Lock()
+        self.not_empty = threading.Condition(self.mutex)
+        self.not_full = threading.Condition(self.mutex)
+        self.items = collections.deque()
+
+        self.spill_file = None
+        self.spill_read_offset = 0
+        self.spill_count = 0  # Responses currently in the spill file
+        self.spill_sequence = 0
+        self.spilled_futures = dict()  # spill sequence -> future
+
+        self.put_count = 0
+        self.high_water_mark = 0
+        self.blocked_count = 0
+        self.dropped_count = 0
+        self.spilled_count = 0
+        self.spill_high_water_mark = 0
+
+        self.recorder = None  # Set while a session is being recorded (see sessionRecorder.py)
+
+    @staticmethod
+    def is_droppable(item):
+        if item[1] != LISTEN_NOTIFICATION or (len(item) > 3 and item[3] is not None):
+            return False
+        return getattr(item[2], "path", None) in DROPPABLE_PATHS
+
+    def put(self, item, block=True, timeout=None):
+        if self.recorder is not None:
+            self.recorder.record(item)
+        with self.not_full:
+            self.put_count += 1
+            if self.spill_count > 0:
+                self._spill(item)  # Already spilling: newer responses follow the spilled ones so the order is kept
+            elif len(self.items) < self.maxsize:
+                self.items.append(item)
+            elif self.policy == POLICY_SPILL:
+                self._spill(item)
+            elif self.policy == POLICY_DROP_OLDEST and self._drop_oldest():
+                self.items.append(item)
+            else:
+                self._wait_not_full(block, timeout)
+                self.items.append(item)
+
+            depth = len(self.items) + self.spill_count
+            if depth > self.high_water_mark:
+                self.high_water_mark = depth
+            self.not_empty.notify()
+
+    def _wait_not_full(self, block, timeout):
+        # Called with the mutex held and the queue full
+        if not block:
+            raise queue.Full
+        self.blocked_count += 1
+        end_time = None if timeout is None else time.monotonic() + timeout
+        while len(self.items) >= self.maxsize:
+            if end_time is None:
+                self.not_full.wait()
+            else:
+                remaining = end_time - time.monotonic()
+                if remaining <= 0.0:
+                    raise queue.Full
+                self.not_full.wait(remaining)
+
+    def _drop_oldest(self):
+        for index, queued_item in enumerate(self.items):
+            if self.is_droppable(queued_item):
+                del self.items[index]
+                self.dropped_count += 1
+                return True
+        return False
+
+    def _spill(self, item):
+        if self.spill_file is None:
+            self.spill_file = tempfile.TemporaryFile(prefix="squeezebox_responses_", dir=self.spill_folder)
+        future_key = None
+        if len(item) > 3 and item[3] is not None:
+            self.spill_sequence += 1
+            future_key = self.spill_sequence
+            self.spilled_futures[future_key] = item[3]
+            item = item[:3]
+        self.spill_file.seek(0, 2)
+        pickle.dump((item, future_key), self.spill_file, pickle.HIGHEST_PROTOCOL)
+        self.spill_count += 1
+        self.spilled_count += 1
+        if self.spill_count > self.spill_high_water_mark:
+            self.spill_high_water_mark = self.spill_count
+
+    def _unspill(self):
+        # Called with the mutex held and memory empty: read back as many spilled responses as fit in memory, oldest first
+        self.spill_file.seek(self.spill_read_offset)
+        while self.spill_count > 0 and len(self.items) < self.maxsize:
+            item, future_key = pickle.load(self.spill_file)
+            if future_key is not None:
+                item = list(item) + [self.spilled_futures.pop(future_key)]
+            self.items.append(item)
+            self.spill_count -= 1
+        self.spill_read_offset = self.spill_file.tell()
+        if self.spill_count == 0:
+            self.spill_file.seek(0)
+            self.spill_file.truncate()
+            self.spill_read_offset = 0
+
+    def get(self, block=True, timeout=None):
+        with self.not_empty:
+            if not block:
+                if len(self.items) + self.spill_count == 0:
+                    raise queue.Empty
+            else:
+                end_time = None if timeout is None else time.monotonic() + timeout
+                while len(self.items) + self.spill_count == 0:
+                    if end_time is None:
+                        self.not_empty.wait()
+                    else:
+                        remaining = end_time - time.monotonic()
+                        if remaining <= 0.0:
+                            raise queue.Empty
+                        self.not_empty.wait(remaining)
+            if len(self.items) == 0:
+                self._unspill()
+            item = self.items.popleft()
+            self.not_full.notify()
+            return item
+
+    def get_nowait(self):
+        return self.get(block=False)
+
+    def qsize(self):
+        with self.mutex:
+            return len(self.items) + self.spill_count
+
+    def empty(self):
+        return self.qsize() == 0
+
+    def statistics(self):
+        with self.mutex:
+            return {"policy": self.policy,
+                    "maximum size": self.maxsize,
+                    "current depth": len(self.items) + self.spill_count,
+                    "high water mark": self.high_water_mark,
+                    "responses queued": self.put_count,
+                    "producer blocked": self.blocked_count,
+                    "notifications dropped": self.dropped_count,
+                    "responses spilled": self.spilled_count,
+                    "spill high water mark": self.spill_high_water_mark}
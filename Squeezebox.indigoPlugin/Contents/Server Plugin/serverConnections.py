@@ -0,0 +1,44 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Squeezebox Controller © Autolog 2023
+#
+
+# noinspection PyUnresolvedReferences
+# ============================== Native Imports ===============================
+import threading
+
+
+# noinspection PyPep8Naming
+class ServerConnections:
+
+    # This class tracks which of each server's connections (commands, listen) are down, so the transports post a single
+    # SERVER_CONNECTION_LOST when the first of a server's connections is lost and a single SERVER_RECONNECTED once all of
+    # them are working again, however many connections (and failed reconnection attempts) there are in between.
+    # The plugin state changes for both are made by the plugin when it handles the messages, not by the transports.
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.down = dict()  # server device id -> set of connection names currently down
+
+    def lost(self, dev_id, connection_name):
+        # Returns True if the server was fully connected until now i.e. SERVER_CONNECTION_LOST is to be posted
+        with self.lock:
+            connections_down = self.down.setdefault(dev_id, set())
+            first_lost = len(connections_down) == 0
+            connections_down.add(connection_name)
+            return first_lost
+
+    def restored(self, dev_id, connection_name):
+        # Returns True if this was the last connection down i.e. SERVER_RECONNECTED is to be posted
+        with self.lock:
+            connections_down = self.down.get(dev_id)
+            if connections_down is None or connection_name not in connections_down:
+                return False
+            connections_down.discard(connection_name)
+            return len(connections_down) == 0
+
+    def forget(self, dev_id):
+        # The server device has been started or stopped
+        with self.lock:
+            self.down.pop(dev_id, None)
@@ -0,0 +1,85 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Squeezebox Controller © Autolog 2023
+#
+
+# noinspection PyUnresolvedReferences
+# ============================== Native Imports ===============================
+import sys
+import threading
+import traceback
+
+# ============================== Plugin Imports ===============================
+from constants import *
+from responseQueue import BoundedResponseQueue
+
+
+# noinspection PyUnresolvedReferences,PyPep8Naming
+class ThreadServerDispatcher(threading.Thread):
+
+    # This class handles the responses of one server, in the order received, when the "per server" dispatcher mode is
+    # selected: runConcurrentThread routes each response (after coalescing) to the dispatcher of its server, so a slow
+    # handler for one server (e.g. downloading cover art) doesn't delay the responses of the others.
+    # 'dispatch' runs each handler holding its server's lock only (see Plugin._serverLock), so the dispatchers of different
+    # servers handle their responses concurrently and a large reply (e.g. players or serverstatus) only holds up its own server.
+    # Each dispatcher's queue is bounded by the same size and overload policy as the common returned response queue, so a
+    # slow server's backlog is limited here too: with the block policy the router (runConcurrentThread) waits for space,
+    # which in turn lets the common queue fill and hold back the server connections.
+
+    def __init__(self, plugin_globals, dev_id, dispatch):
+
+        threading.Thread.__init__(self)
+
+        self.globals = plugin_globals
+
+        self.dev_id = dev_id
+        self.dispatch = dispatch
+        self.responses = BoundedResponseQueue(self.globals[RESPONSE_QUEUE_SIZE], self.globals[RESPONSE_QUEUE_POLICY], self.globals[PLUGIN_PREFS_FOLDER])
+        self.unfinished = threading.Condition()
+        self.unfinished_count = 0  # Responses put but not yet handled (see drain)
+
+        self.name = f"Squeezebox Dispatcher [{dev_id}]"
+        self.daemon = True
+
+        self.dispatcherLogger = logging.getLogger("Plugin.squeezeboxServerDispatcher")
+
+    def exception_handler(self, exception_error_message, log_failing_statement):
+        filename, line_number, method, statement = traceback.extract_tb(sys.exc_info()[2])[-1]
+        module = filename.split("/")
+        log_message = f"'{exception_error_message}' in module '{module[-1]}', method '{method}'"
+        if log_failing_statement:
+            log_message = f"{log_message}\n   Failing statement [line {line_number}]: '{statement}'"
+        else:
+            log_message = f"{log_message} at line {line_number}"
+        self.dispatcherLogger.error(log_message)
+
+    def put(self, returned_response):
+        with self.unfinished:
+            self.unfinished_count += 1
+        self.responses.put(returned_response)
+
+    def drain(self):
+        # Wait until every response routed so far has been handled. Responses dropped by the overload policy are never
+        # handled, so they are discounted (only the router puts and so drops, and it is the caller of drain).
+        with self.unfinished:
+            while self.unfinished_count > self.responses.dropped_count:
+                self.unfinished.wait()
+
+    def stop(self):
+        self.responses.put([self.dev_id, None, None])  # A message type of None stops the dispatcher (a list, as it may be spilled)
+
+    def run(self):
+        while True:
+            returned_response = self.responses.get()
+            try:
+                if returned_response[1] is None:
+                    return  # Stopped
+                self.dispatch(returned_response)
+            except Exception as exception_error:
+                self.exception_handler(exception_error, True)  # Log error and display failing statement
+            finally:
+                if returned_response[1] is not None:
+                    with self.unfinished:
+                        self.unfinished_count -= 1
+                        self.unfinished.notify_all()
@@ -0,0 +1,161 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Squeezebox Controller © Autolog 2023
+#
+
+# noinspection PyUnresolvedReferences
+# ============================== Native Imports ===============================
+import collections
+import gzip
+import sys
+import threading
+import time
+import traceback
+
+# ============================== Plugin Imports ===============================
+from cliEvents import CliEvent
+from constants import *
+
+# A recorded session is a gzipped text file with one line per CLI line received:
+#   "<seconds since recording started>\t<server device id>\t<L (listen notification) | R (reply)>\t<line as received>"
+# CLI lines are quoted by the server so never contain a tab or a newline.
+MESSAGE_TYPE_CODES = {LISTEN_NOTIFICATION: "L", REPLY_TO_SEND: "R"}
+CODE_MESSAGE_TYPES = {code: message_type for message_type, code in MESSAGE_TYPE_CODES.items()}
+
+
+# noinspection PyPep8Naming
+class SessionRecorder:
+
+    # This class records the CLI traffic from every server (notifications and replies) with timestamps as it is put on
+    # the returned response queue (see BoundedResponseQueue.recorder), so a session can be replayed without a server.
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.session_file = gzip.open(path, "wt", encoding="utf-8")
+        self.start_time = time.monotonic()
+        self.recorded_count = 0
+
+    def record(self, returned_response):
+        message_code = MESSAGE_TYPE_CODES.get(returned_response[1])
+        if message_code is None:
+            return  # Not CLI traffic e.g. JSON-RPC results, reconnections
+        with self.lock:
+            if self.session_file is not None:
+                self.session_file.write(f"{time.monotonic() - self.start_time:.6f}\t{returned_response[0]}\t{message_code}\t{returned_response[2].line}\n")
+                self.recorded_count += 1
+
+    def close(self):
+        with self.lock:
+            if self.session_file is not None:
+                self.session_file.close()
+                self.session_file = None
+
+
+def read_session(path):
+    # Generator: yields (seconds since recording started, server device id, message type, line) for each recorded line
+    with gzip.open(path, "rt", encoding="utf-8") as session_file:
+        for session_line in session_file:
+            offset, dev_id, message_code, line = session_line.rstrip("\n").split("\t", 3)
+            yield float(offset), int(dev_id), CODE_MESSAGE_TYPES[message_code], line
+
+
+# noinspection PyPep8Naming
+class DispatchStatistics:
+
+    # This class accumulates the time runConcurrentThread spends handling each kind of response while a session is replayed
+
+    def __init__(self):
+        self.start_time = time.perf_counter()
+        self.message_count = 0
+        self.handler_times = collections.defaultdict(lambda: [0, 0.0, 0.0])  # handler key -> [count, total seconds, maximum seconds]
+        self.queue_depth_total = 0
+        self.queue_depth_maximum = 0
+        self.queue_depth_samples = 0
+
+    @staticmethod
+    def handler_key(returned_response):
+        event = returned_response[2]
+        if isinstance(event, CliEvent):
+            return f"{event.kind} {' '.join(event.path)}"
+        return f"message type {returned_response[1]}"
+
+    def record_dispatch(self, returned_response, seconds):
+        self.message_count += 1
+        handler_time = self.handler_times[self.handler_key(returned_response)]
+        handler_time[0] += 1
+        handler_time[1] += seconds
+        handler_time[2] = max(handler_time[2], seconds)
+
+    def record_queue_depth(self, depth):
+        self.queue_depth_total += depth
+        self.queue_depth_samples += 1
+        self.queue_depth_maximum = max(self.queue_depth_maximum, depth)
+
+    def report(self):
+        elapsed = time.perf_counter() - self.start_time
+        report_ui = "Session Replay Statistics:\n"
+        report_ui += f"{'':={'^'}100}\n"
+        report_ui += f"{'Messages dispatched:':<40} {self.message_count}\n"
+        report_ui += f"{'Elapsed seconds:':<40} {elapsed:.3f}\n"
+        report_ui += f"{'Messages / second:':<40} {self.message_count / elapsed if elapsed > 0 else 0.0:.1f}\n"
+        if self.queue_depth_samples > 0:
+            report_ui += f"{'Queue depth (mean / maximum):':<40} {self.queue_depth_total / self.queue_depth_samples:.1f} / {self.queue_depth_maximum}\n"
+        report_ui += f"{'':-{'^'}100}\n"
+        report_ui += f"{'Handler':<40} {'Count':>10} {'Total ms':>12} {'Mean ms':>10} {'Max ms':>10}\n"
+        for key, (count, total, maximum) in sorted(self.handler_times.items(), key=lambda item: item[1][1], reverse=True):
+            report_ui += f"{key[:40]:<40} {count:>10} {total * 1000:>12.1f} {total * 1000 / count:>10.3f} {maximum * 1000:>10.3f}\n"
+        report_ui += f"{'':={'^'}100}\n"
+        return report_ui
+
+
+# noinspection PyUnresolvedReferences,PyPep8Naming
+class ThreadSessionReplay(threading.Thread):
+
+    # This class feeds a recorded session into the returned response queue, so it is dispatched by runConcurrentThread
+    # exactly as live traffic would be. speed is 1.0 for the original timing, e.g. 10.0 for ten times faster or 0 for
+    # as fast as possible. A REPLAY_FINISHED message is queued last so the statistics are reported once all is dispatched.
+
+    def __init__(self, plugin_globals, path, speed, dispatch_statistics, server_dev_id=None):
+
+        threading.Thread.__init__(self)
+
+        self.globals = plugin_globals
+
+        self.name = "Squeezebox Session Replay"
+        self.daemon = True
+
+        self.replayLogger = logging.getLogger("Plugin.squeezeboxSessionReplay")
+
+        self.path = path
+        self.speed = speed
+        self.dispatch_statistics = dispatch_statistics
+        self.server_dev_id = server_dev_id  # If set, every recorded line is replayed as if received from this server
+
+    def exception_handler(self, exception_error_message, log_failing_statement):
+        filename, line_number, method, statement = traceback.extract_tb(sys.exc_info()[2])[-1]
+        module = filename.split("/")
+        log_message = f"'{exception_error_message}' in module '{module[-1]}', method '{method}'"
+        if log_failing_statement:
+            log_message = f"{log_message}\n   Failing statement [line {line_number}]: '{statement}'"
+        else:
+            log_message = f"{log_message} at line {line_number}"
+        self.replayLogger.error(log_message)
+
+    def run(self):
+        try:
+            returned_response_queue = self.globals[QUEUES][RETURNED_RESPONSE]
+            start_time = time.monotonic()
+            for offset, dev_id, message_type, line in read_session(self.path):
+                if self.speed > 0:
+                    delay = start_time + offset / self.speed - time.monotonic()
+                    if delay > 0:
+                        time.sleep(delay)
+                returned_response_queue.put([self.server_dev_id if self.server_dev_id is not None else dev_id, message_type, CliEvent(line)])
+                self.dispatch_statistics.record_queue_depth(returned_response_queue.qsize())
+
+        except Exception as exception_error:
+            self.exception_handler(exception_error, True)  # Log error and display failing statement
+
+        self.globals[QUEUES][RETURNED_RESPONSE].put([0, REPLAY_FINISHED, self.dispatch_statistics])
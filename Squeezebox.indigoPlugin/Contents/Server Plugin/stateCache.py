@@ -0,0 +1,111 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Squeezebox Controller © Autolog 2023
+#
+
+# noinspection PyUnresolvedReferences
+# ============================== Native Imports ===============================
+import threading
+
+NOT_CACHED = object()  # Nothing written yet: the first write of a state always goes to the Indigo server
+
+
+# noinspection PyPep8Naming
+class StateCache:
+
+    # This class remembers the last value written to the Indigo server for each device state (and the last state image),
+    # so a write of an unchanged value (e.g. the replies to "mode ?", "power ?" or "mixer volume ?" echoing the current
+    # value) can be skipped instead of costing a round trip to the Indigo server. A state not written by the plugin since
+    # the device was (re)started is compared with the device's own states (dev.states / dev.displayStateImageSel) when the
+    # caller has the device, as its states may have been changed elsewhere e.g. by a device edit.
+    # A value is only remembered once it has been written (states_written / image_written), so a failed write is retried.
+    #
+    # While a response is handled, changed values are also batched (write-behind): begin_batch / end_batch bracket the
+    # handling and the plugin then writes each device's changes with one updateStatesOnServer (plus one state image write)
+    # instead of a call per state. Batches are per thread, so writes from other threads (e.g. actions) aren't deferred.
+
+    def __init__(self):
+        self.lock = threading.Lock()  # Handlers may write from several dispatcher threads
+        self.states = dict()  # dev id -> {state key: (value, ui value)}
+        self.images = dict()  # dev id -> state image
+        self.written_count = 0
+        self.suppressed_count = 0
+
+        self.batch = threading.local()  # batch.pending: dev id -> [device or None, {state key: key / value entry}, state image]
+        self.batched_count = 0  # Changed values deferred to a batch
+        self.flush_count = 0  # Indigo server calls made to write batches
+
+    def state_changed(self, dev, state_key, value, ui_value=None):
+        # Returns True if the state must be written (dev is a device or a device id); call states_written once it has been
+        with self.lock:
+            if isinstance(dev, int):
+                current = self.states.get(dev, dict()).get(state_key, NOT_CACHED)
+            else:
+                current = self.states.get(dev.id, dict()).get(state_key, NOT_CACHED)
+                if current is NOT_CACHED and state_key in dev.states:
+                    current = (dev.states[state_key], None if ui_value is None else dev.states.get(f"{state_key}.ui"))
+            if current == (value, ui_value):
+                self.suppressed_count += 1
+                return False
+            return True
+
+    def changed_states(self, dev, key_value_list):
+        # Returns the entries of an updateStatesOnServer key / value list that must be written
+        return [state for state in key_value_list if self.state_changed(dev, state["key"], state["value"], state.get("uiValue"))]
+
+    def states_written(self, dev_id, key_value_list):
+        # The entries of a key / value list have been written to the Indigo server
+        with self.lock:
+            device_states = self.states.setdefault(dev_id, dict())
+            for state in key_value_list:
+                device_states[state["key"]] = (state["value"], state.get("uiValue"))
+            self.written_count += len(key_value_list)
+
+    def image_changed(self, dev, image):
+        with self.lock:
+            if isinstance(dev, int):
+                current = self.images.get(dev, NOT_CACHED)
+            else:
+                current = self.images.get(dev.id, dev.displayStateImageSel)
+            if current == image:
+                self.suppressed_count += 1
+                return False
+            return True
+
+    def image_written(self, dev_id, image):
+        with self.lock:
+            self.images[dev_id] = image
+            self.written_count += 1
+
+    def begin_batch(self):
+        self.batch.pending = dict()
+
+    def end_batch(self):
+        # Returns the pending changes {dev id: [device or None, {state key: key / value entry}, state image]} and stops batching
+        pending = getattr(self.batch, "pending", None)
+        self.batch.pending = None
+        return pending if pending is not None else dict()
+
+    def defer(self, dev, key_value_list=(), image=NOT_CACHED):
+        # Adds changed states / state image of a device (or device id) to this thread's batch.
+        # Returns False if this thread isn't batching, in which case the caller writes them now.
+        pending = getattr(self.batch, "pending", None)
+        if pending is None:
+            return False
+        dev_id = dev if isinstance(dev, int) else dev.id
+        device_batch = pending.setdefault(dev_id, [None, dict(), NOT_CACHED])
+        if not isinstance(dev, int):
+            device_batch[0] = dev  # Saves looking the device up when the batch is written
+        for state in key_value_list:
+            device_batch[1][state["key"]] = state  # A later value of the same state replaces the earlier one
+            self.batched_count += 1
+        if image is not NOT_CACHED:
+            device_batch[2] = image
+            self.batched_count += 1
+        return True
+
+    def forget(self, dev_id):
+        with self.lock:
+            self.states.pop(dev_id, None)
+            self.images.pop(dev_id, None)
@@ -0,0 +1,160 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Squeezebox Controller © Autolog 2023
+#
+
+# noinspection PyUnresolvedReferences
+# ============================== Plugin Imports ===============================
+from constants import *
+
+# Fields of the records: (internal key constant, attribute name, default). A default of list / set is a new empty one per record.
+PLAYER_FIELDS = (
+    (ALBUM, "album", ""),
+    (ANNOUNCEMENT_PLAY_ACTIVE, "announcement_play_active", "NO"),
+    (ANNOUNCEMENT_PLAY_INITIALISED, "announcement_play_initialised", False),
+    (ANNOUNCEMENT_PLAYLIST_NO_PLAY, "announcement_playlist_no_play", "0"),
+    (ANNOUNCEMENT_UNIQUE_KEY, "announcement_unique_key", ""),
+    (ARTIST, "artist", ""),
+    (CONNECTED, "connected", False),
+    (COVER_ART_FILE, "cover_art_file", ""),
+    (COVER_ART_FOLDER, "cover_art_folder", ""),
+    (COVER_ART_URL, "cover_art_url", ""),
+    (DATE_TIME_STARTED, "date_time_started", None),
+    (DURATION, "duration", ""),
+    (DURATION_UI, "duration_ui", ""),
+    (GENRE, "genre", ""),
+    (IP_ADDRESS, "ip_address", "Unknown"),
+    (IS_SYNC_MASTER, "is_sync_master", False),
+    (IS_SYNC_SLAVE, "is_sync_slave", False),
+    (MAC, "mac", ""),
+    (MAINTAIN_SYNC, "maintain_sync", "0"),
+    (MASTER_PLAYER_ADDRESS, "master_player_address", ""),
+    (MASTER_PLAYER_ID, "master_player_id", 0),
+    (MASTER_PLAYER_NAME, "master_player_name", ""),
+    (MODE, "mode", "?"),
+    (MODEL, "model", ""),
+    (NAME, "name", ""),
+    (PLAYLIST_TRACK_NUMBER, "playlist_track_number", "?"),
+    (PLAYLIST_TRACKS_TOTAL, "playlist_tracks_total", "?"),
+    (PLAYLIST_TRACKS_UI, "playlist_tracks_ui", "?"),
+    (PORT, "port", "Unknown"),
+    (POWER, "power", "0"),
+    (POWER_UI, "power_ui", "disconnected"),
+    (REMOTE_STREAM, "remote_stream", ""),
+    (REPEAT, "repeat", ""),
+    (SAVED_MAINTAIN_SYNC, "saved_maintain_sync", "?"),
+    (SAVED_MODE, "saved_mode", "?"),
+    (SAVED_POWER, "saved_power", "?"),
+    (SAVED_REPEAT, "saved_repeat", "?"),
+    (SAVED_SHUFFLE, "saved_shuffle", "?"),
+    (SAVED_TIME, "saved_time", "0"),
+    (SAVED_VOLUME, "saved_volume", "?"),
+    (SERVER_ID, "server_id", 0),
+    (SERVER_NAME, "server_name", ""),
+    (SHUFFLE, "shuffle", ""),
+    (SLAVE_PLAYER_IDS, "slave_player_ids", list),
+    (SONG_URL, "song_url", ""),
+    (STATE, "state", "disconnected"),
+    (SYNC_MASTER_NUMBER_OF_SLAVES, "sync_master_number_of_slaves", "0"),
+    (SYNC_MASTER_SLAVE_1_ADDRESS, "sync_master_slave_1_address", "None"),
+    (SYNC_MASTER_SLAVE_1_ID, "sync_master_slave_1_id", "None"),
+    (SYNC_MASTER_SLAVE_1_NAME, "sync_master_slave_1_name", ""),
+    (SYNC_MASTER_SLAVE_2_ADDRESS, "sync_master_slave_2_address", "None"),
+    (SYNC_MASTER_SLAVE_2_ID, "sync_master_slave_2_id", "None"),
+    (SYNC_MASTER_SLAVE_2_NAME, "sync_master_slave_2_name", ""),
+    (SYNC_MASTER_SLAVE_3_ADDRESS, "sync_master_slave_3_address", "None"),
+    (SYNC_MASTER_SLAVE_3_ID, "sync_master_slave_3_id", "None"),
+    (SYNC_MASTER_SLAVE_3_NAME, "sync_master_slave_3_name", ""),
+    (SYNC_MASTER_SLAVE_4_ADDRESS, "sync_master_slave_4_address", "None"),
+    (SYNC_MASTER_SLAVE_4_ID, "sync_master_slave_4_id", "None"),
+    (SYNC_MASTER_SLAVE_4_NAME, "sync_master_slave_4_name", ""),
+    (TIME, "time", "0"),
+    (TITLE, "title", ""),
+    (VOLUME, "volume", "0"),
+)
+
+SERVER_FIELDS = (
+    (DATE_TIME_STARTED, "date_time_started", None),
+    (HTTP_PORT, "http_port", "9000"),
+    (IP_ADDRESS, "ip_address", ""),
+    (IP_ADDRESS_PORT, "ip_address_port", ""),
+    (IP_ADDRESS_PORT_NAME, "ip_address_port_name", ""),
+    (JSON_RPC_TRANSPORT, "json_rpc_transport", None),
+    (KEEP_THREAD_ALIVE, "keep_thread_alive", False),
+    (LAST_SCAN, "last_scan", "?"),
+    (LISTEN_COMMAND, "listen_command", "listen 1"),
+    (PIPELINE_WINDOW, "pipeline_window", 8),
+    (PLAYER_COUNT, "player_count", None),
+    (PLAYER_MAC, "player_mac", ""),
+    (PORT, "port", ""),
+    (RESYNC_PENDING, "resync_pending", False),
+    (RESYNC_PLAYER_IDS, "resync_player_ids", set),
+    (STATUS, "status", "starting"),
+    (TOTAL_ALBUMS, "total_albums", "0"),
+    (TOTAL_ARTISTS, "total_artists", "0"),
+    (TOTAL_GENRES, "total_genres", "0"),
+    (TOTAL_SONGS, "total_songs", "0"),
+    (VERSION, "version", ""),
+)
+
+
+# noinspection PyPep8Naming
+class StateRecord:
+
+    # Base class of the records held in globals[PLAYERS] / globals[SERVERS]: one slot per field (no per-instance dict)
+    # and every field has a default, so a record is created complete. Fields are read and written as attributes
+    # (e.g. player.power_ui) or, as the handlers do, by internal key (e.g. player[POWER_UI]). An internal key that isn't
+    # a field raises KeyError on write as well as on read, so a mistyped key can't silently create a new entry.
+
+    __slots__ = ()
+    FIELDS = ()
+    KEYS = dict()  # internal key -> attribute name
+
+    def __init__(self):
+        for _, name, default in self.FIELDS:
+            object.__setattr__(self, name, default() if default in (list, set) else default)
+
+    def __getitem__(self, key):
+        return getattr(self, self.KEYS[key])
+
+    def __setitem__(self, key, value):
+        setattr(self, self.KEYS[key], value)
+
+    def __contains__(self, key):
+        return key in self.KEYS
+
+    def get(self, key, default=None):
+        name = self.KEYS.get(key)
+        return default if name is None else getattr(self, name)
+
+    def snapshot(self):
+        # A point in time copy of the fields as a dict (attribute name -> value) e.g. for logging; lists / sets are copied
+        values = dict()
+        for _, name, _ in self.FIELDS:
+            value = getattr(self, name)
+            values[name] = value.copy() if isinstance(value, (list, set)) else value
+        return values
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.snapshot()!r})"
+
+
+# noinspection PyPep8Naming
+class PlayerState(StateRecord):
+
+    # The plugin's view of a started player device (globals[PLAYERS][dev_id])
+
+    __slots__ = tuple(name for _, name, _ in PLAYER_FIELDS)
+    FIELDS = PLAYER_FIELDS
+    KEYS = {key: name for key, name, _ in PLAYER_FIELDS}
+
+
+# noinspection PyPep8Naming
+class ServerState(StateRecord):
+
+    # The plugin's view of a started server device (globals[SERVERS][dev_id])
+
+    __slots__ = tuple(name for _, name, _ in SERVER_FIELDS)
+    FIELDS = SERVER_FIELDS
+    KEYS = {key: name for key, name, _ in SERVER_FIELDS}
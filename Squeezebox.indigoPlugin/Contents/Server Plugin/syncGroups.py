@@ -0,0 +1,115 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Squeezebox Controller © Autolog 2023
+#
+
+# noinspection PyUnresolvedReferences
+# ============================== Native Imports ===============================
+import threading
+
+NOT_SYNCED = (0, ())  # Sync view of a player that isn't in a sync group: (master id, slave ids)
+
+
+# noinspection PyPep8Naming
+class SyncGroupGraph:
+
+    # This class holds the sync groups of each server as reported by "syncgroups ?" (a group is identified by the device
+    # id of its master and its members are the master followed by the slaves, in the order reported by the server).
+    # apply replaces a server's groups with the latest reply and returns only the players whose sync view (their master,
+    # or their slaves if a master) has changed, so just those player devices have their sync states updated.
+    # group_of / members are dict lookups, used by _playersToProcess for every playlist / mixer notification.
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.group_members = dict()  # master device id -> (master device id, slave device id, ...)
+        self.player_group = dict()  # player device id -> master device id (for masters and slaves)
+        self.server_groups = dict()  # server device id -> set of master device ids
+        self.invalidated = set()  # Players to be reported as changed by the next apply e.g. just started
+
+    def apply(self, server_id, groups):
+        # groups is an iterable of member tuples (master device id first). Returns the ids of the players whose sync view changed.
+        with self.lock:
+            new_groups = {members[0]: tuple(members) for members in groups if len(members) > 1}
+
+            # Players that may be affected: those in the server's current groups and in the new groups, plus the other
+            # members of any group a newly grouped player is leaving (e.g. it was grouped on another server until now)
+            affected = set(self.invalidated)
+            for master_id in self.server_groups.get(server_id, ()):
+                affected.update(self.group_members[master_id])
+            for members in new_groups.values():
+                for player_id in members:
+                    affected.update(self.group_members.get(self.player_group.get(player_id, 0), (player_id,)))
+            previous_views = {player_id: self._view(player_id) for player_id in affected}
+
+            for master_id in list(self.server_groups.get(server_id, ())):
+                self._remove_group(master_id)
+            for members in new_groups.values():
+                for player_id in members:
+                    self._remove_player(player_id)
+            for master_id, members in new_groups.items():
+                self.group_members[master_id] = members
+                for player_id in members:
+                    self.player_group[player_id] = master_id
+            self.server_groups[server_id] = set(new_groups)
+
+            changed = [player_id for player_id in affected if player_id in self.invalidated or self._view(player_id) != previous_views[player_id]]
+            self.invalidated.clear()
+            return sorted(changed)
+
+    def remove(self, player_id):
+        # Drop a player that has been stopped (a master's group is dissolved). Returns the ids of the other players whose sync view changed.
+        with self.lock:
+            self.invalidated.discard(player_id)
+            affected = [member for member in self.group_members.get(self.player_group.get(player_id, 0), ()) if member != player_id]
+            previous_views = {member: self._view(member) for member in affected}
+            self._remove_player(player_id)
+            return [member for member in affected if self._view(member) != previous_views[member]]
+
+    def invalidate(self, player_id):
+        # The player's sync states may be stale (e.g. restored when the device was started): report it as changed on the next apply
+        with self.lock:
+            self.invalidated.add(player_id)
+
+    def _remove_group(self, master_id):
+        # Called with the lock held
+        for player_id in self.group_members.pop(master_id, ()):
+            self.player_group.pop(player_id, None)
+        for server_masters in self.server_groups.values():
+            server_masters.discard(master_id)
+
+    def _remove_player(self, player_id):
+        # Called with the lock held: removes the player from its group, dissolving the group if it was the master or is the last slave
+        master_id = self.player_group.get(player_id, 0)
+        if master_id == 0:
+            return
+        remaining = tuple(member for member in self.group_members[master_id] if member != player_id)
+        if player_id == master_id or len(remaining) < 2:
+            self._remove_group(master_id)
+        else:
+            del self.player_group[player_id]
+            self.group_members[master_id] = remaining
+
+    def _view(self, player_id):
+        # Called with the lock held: (master device id, slave device ids) as shown in the player's sync states
+        master_id = self.player_group.get(player_id, 0)
+        if master_id == 0:
+            return NOT_SYNCED
+        if master_id == player_id:
+            return 0, self.group_members[master_id][1:]
+        return master_id, ()
+
+    def group_of(self, player_id):
+        return self.player_group.get(player_id, 0)  # The master device id of the player's group, 0 if not synced
+
+    def members(self, master_id):
+        return self.group_members.get(master_id, ())  # (master device id, slave device id, ...), () if not a group
+
+    def master_of(self, player_id):
+        master_id = self.player_group.get(player_id, 0)
+        return 0 if master_id == player_id else master_id  # 0 if the player isn't a slave
+
+    def slaves_of(self, player_id):
+        if self.player_group.get(player_id, 0) != player_id:
+            return ()
+        return self.group_members.get(player_id, (player_id,))[1:]  # () if the player isn't a master
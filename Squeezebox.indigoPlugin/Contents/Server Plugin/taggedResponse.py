@@ -0,0 +1,97 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Squeezebox Controller © Autolog 2023
+#
+
+# noinspection PyUnresolvedReferences
+# ============================== Native Imports ===============================
+import collections.abc
+
+# Key of the first field of each record in multi-record replies
+SERVERSTATUS_RECORD_KEY = "playerindex"  # "serverstatus 0 99 ... player count:2 playerindex:0 playerid:... name:... playerindex:1 ..."
+PLAYERS_RECORD_KEY = "playerindex"  # "players 0 1 count:2 playerindex:0 playerid:... ip:... name:... model:... connected:1"
+STATUS_RECORD_KEY = "playlist index"  # "<mac> status - 1 tags:... mode:play ... playlist index:3 id:... title:... artist:..."
+
+
+# noinspection PyPep8Naming
+class TaggedResponse(collections.abc.Mapping):
+
+    # This class reads the tagged "key:value" items of an LMS CLI reply e.g. of serverstatus, players or status.
+    # The items must already be unquoted one by one (as CliEvent.args are): LMS quotes each item separately, so a key
+    # containing a space ("info total albums", "playlist index") or a value containing a space or ":" ("ip:10.0.1.5:3483")
+    # is unambiguous. Items without a ":" (e.g. the "0 1" of "players 0 1") are skipped.
+    #
+    # A multi-record reply is a header followed by records, each record starting with record_key. The mapping interface
+    # reads the header; records() yields one dict per record (player, track). Parsing is lazy: the header is only scanned as
+    # far as needed to find the keys read, and records are only parsed as they are iterated, so reading a few fields of a
+    # large reply doesn't materialise all of it. Without a record_key the whole reply is the header (first occurrence wins).
+
+    def __init__(self, items, record_key=None):
+        self.items = items
+        self.record_key = record_key
+        self.header = dict()
+        self.scan_index = 0  # Next item to scan into the header
+        self.records_index = None  # Index of the first record's item, once the header has been fully scanned
+
+    def _scan_header(self, wanted_key=None):
+        # Scans the header until wanted_key is found (or to the end of the header if None)
+        items = self.items
+        while self.records_index is None:
+            if self.scan_index >= len(items):
+                self.records_index = len(items)
+                break
+            key, separator, value = items[self.scan_index].partition(":")
+            if separator != "":
+                if key == self.record_key:
+                    self.records_index = self.scan_index
+                    break
+                if key not in self.header:
+                    self.header[key] = value
+            self.scan_index += 1
+            if wanted_key is not None and key == wanted_key:
+                break
+
+    def __getitem__(self, key):
+        if key not in self.header:
+            self._scan_header(key)
+        return self.header[key]
+
+    def __contains__(self, key):
+        if key not in self.header:
+            self._scan_header(key)
+        return key in self.header
+
+    def __iter__(self):
+        self._scan_header()
+        return iter(self.header)
+
+    def __len__(self):
+        self._scan_header()
+        return len(self.header)
+
+    def records(self):
+        # Generator: yields a dict for each record, in order
+        self._scan_header()
+        record = None
+        for item in self.items[self.records_index:]:
+            key, separator, value = item.partition(":")
+            if separator == "":
+                continue
+            if key == self.record_key:
+                if record is not None:
+                    yield record
+                record = dict()
+            record[key] = value
+        if record is not None:
+            yield record
+
+    def find_record(self, key, value):
+        # Returns the first record whose key has the value (records after it are not parsed), otherwise an empty dict
+        for record in self.records():
+            if record.get(key) == value:
+                return record
+        return dict()
+
+    def __repr__(self):
+        return f"TaggedResponse({len(self.items)} items, record_key={self.record_key!r})"
@@ -0,0 +1,13 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Squeezebox Controller © Autolog 2023
+#
+
+# noinspection PyUnresolvedReferences
+# ============================== Native Imports ===============================
+import os
+import sys
+
+# The plugin's modules import each other by name from the "Server Plugin" folder (as Indigo runs them)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Squeezebox.indigoPlugin", "Contents", "Server Plugin"))
@@ -0,0 +1,59 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Squeezebox Controller © Autolog 2023
+#
+
+# noinspection PyUnresolvedReferences
+# ============================== Native Imports ===============================
+import pickle
+import timeit
+
+import pytest
+
+# ============================== Plugin Imports ===============================
+from cliEvents import CliEvent, PLAYER_EVENT, SERVER_EVENT, cli_events
+
+
+def test_player_notification_is_tokenized_once():
+    event = CliEvent("00%3A04%3A20%3Aaa%3Abb%3Acc mixer volume 40")
+    assert event.kind == PLAYER_EVENT
+    assert event.mac == "00:04:20:aa:bb:cc"
+    assert event.path == ("mixer", "volume")
+    assert event.args == ("40",)
+    assert event.words == ("00:04:20:aa:bb:cc", "mixer", "volume", "40")
+
+
+def test_server_reply_items_are_unquoted_one_by_one():
+    event = CliEvent("players 0 1 count%3A1 playerindex%3A0 playerid%3A00%3A04%3A20%3Aaa%3Abb%3Acc name%3AKitchen%20Radio")
+    assert event.kind == SERVER_EVENT
+    assert event.mac == ""
+    assert event.path == ("players",)
+    assert event.args[-1] == "name:Kitchen Radio"  # The space in the value doesn't split the item
+    assert event.tagged["count"] == "1"
+
+
+def test_events_are_immutable():
+    event = CliEvent("00%3A04%3A20%3Aaa%3Abb%3Acc power 1")
+    with pytest.raises(AttributeError):
+        event.path = ("power",)
+    with pytest.raises(AttributeError):
+        del event.line
+
+
+def test_events_pickle_as_their_line():
+    event = CliEvent("00%3A04%3A20%3Aaa%3Abb%3Acc playlist newsong Title%20One 3")
+    restored = pickle.loads(pickle.dumps(event))
+    assert restored.line == event.line
+    assert restored.args == ("Title One", "3")
+
+
+def test_cli_events_skips_empty_lines():
+    assert [event.path for event in cli_events(["syncgroups", "", "  ", "version 8.3.1"])] == [("syncgroups",), ("version",)]
+
+
+def test_tokenizing_a_notification_is_cheap():
+    # Microbenchmark: a typical notification is tokenized in well under a millisecond (tens of microseconds when measured)
+    line = "00%3A04%3A20%3Aaa%3Abb%3Acc playlist newsong Some%20Track%20Title 12"
+    seconds = min(timeit.repeat(lambda: CliEvent(line), number=1000, repeat=3)) / 1000
+    assert seconds < 0.001
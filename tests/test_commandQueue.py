@@ -0,0 +1,86 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Squeezebox Controller © Autolog 2023
+#
+
+# noinspection PyUnresolvedReferences
+# ============================== Plugin Imports ===============================
+from commandQueue import CoalescingCommandQueue
+
+PLAYER_A = "00:04:20:aa:bb:cc"
+PLAYER_B = "00:04:20:dd:ee:ff"
+
+
+def drain(command_queue):
+    commands = list()
+    while not command_queue.empty():
+        commands.append(command_queue.get_nowait())
+    return commands
+
+
+def test_identical_pending_query_is_coalesced():
+    command_queue = CoalescingCommandQueue()
+    command_queue.put([f"{PLAYER_A} mode ?"])
+    command_queue.put([f"{PLAYER_A} mode ?"])
+    assert drain(command_queue) == [[f"{PLAYER_A} mode ?"]]
+    assert command_queue.coalesced_count == 1
+
+
+def test_query_after_state_change_is_sent_again():
+    command_queue = CoalescingCommandQueue()
+    command_queue.put([f"{PLAYER_A} mode ?"])
+    command_queue.put([f"{PLAYER_A} pause"])
+    command_queue.put([f"{PLAYER_A} mode ?"])
+    assert drain(command_queue) == [[f"{PLAYER_A} mode ?"], [f"{PLAYER_A} pause"], [f"{PLAYER_A} mode ?"]]
+    assert command_queue.coalesced_count == 0
+
+
+def test_state_change_only_affects_its_own_player():
+    command_queue = CoalescingCommandQueue()
+    command_queue.put([f"{PLAYER_B} mode ?"])
+    command_queue.put([f"{PLAYER_A} pause"])
+    command_queue.put([f"{PLAYER_B} mode ?"])
+    assert drain(command_queue).count([f"{PLAYER_B} mode ?"]) == 1
+
+
+def test_interactive_command_overtakes_other_players_only():
+    command_queue = CoalescingCommandQueue()
+    command_queue.put([f"{PLAYER_A} status - 1 tags:a"])
+    command_queue.put([f"{PLAYER_B} status - 1 tags:a"])
+    command_queue.put([f"{PLAYER_B} mixer volume 40"], interactive=True)
+    assert drain(command_queue) == [[f"{PLAYER_B} status - 1 tags:a"], [f"{PLAYER_B} mixer volume 40"], [f"{PLAYER_A} status - 1 tags:a"]]
+
+
+def test_interactive_command_waits_for_barrier():
+    command_queue = CoalescingCommandQueue()
+    command_queue.put([f"{PLAYER_A} mode ?"])
+    command_queue.put([f"{PLAYER_A} autologAnnouncementSaveState"])
+    command_queue.put([f"{PLAYER_A} power 1"], interactive=True)
+    assert drain(command_queue) == [[f"{PLAYER_A} mode ?"], [f"{PLAYER_A} autologAnnouncementSaveState"], [f"{PLAYER_A} power 1"]]
+
+
+def test_server_command_follows_earlier_player_commands():
+    command_queue = CoalescingCommandQueue()
+    command_queue.put([f"{PLAYER_A} stop"])
+    command_queue.put([f"{PLAYER_A} sync {PLAYER_B}"])
+    command_queue.put(["syncgroups ?"])
+    command_queue.put([f"{PLAYER_B} mode ?"])
+    commands = drain(command_queue)
+    assert commands.index(["syncgroups ?"]) > commands.index([f"{PLAYER_A} sync {PLAYER_B}"])
+
+
+def test_interactive_latency_during_background_burst():
+    # A background burst for many players (e.g. a refresh after reconnection) is pending when a user action is queued:
+    # the action is the next command sent, however long the burst
+    command_queue = CoalescingCommandQueue()
+    players = [f"00:04:20:00:{index // 256:02x}:{index % 256:02x}" for index in range(200)]
+    for query in ("mode ?", "power ?", "mixer volume ?", "status - 1 tags:a"):
+        for player in players:
+            command_queue.put([f"{player} {query}"])
+    command_queue.put(["syncgroups ?"])
+    for _ in range(10):
+        command_queue.get_nowait()  # Sending is under way
+    command_queue.put([f"{PLAYER_A} pause 1"], interactive=True)
+    assert command_queue.get_nowait() == [f"{PLAYER_A} pause 1"]
+    assert len(drain(command_queue)) == 4 * len(players) + 1 - 10
@@ -0,0 +1,103 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Squeezebox Controller © Autolog 2023
+#
+
+# noinspection PyUnresolvedReferences
+# ============================== Native Imports ===============================
+import http.server
+import json
+import queue
+import threading
+
+import pytest
+
+# ============================== Plugin Imports ===============================
+from constants import *
+from jsonRpcTransport import JSON_RPC_PATH, JsonRpcTransport
+
+SERVER_ID = 1
+PLAYER_MAC = "00:04:20:aa:bb:cc"
+
+
+class SlimRequestHandler(http.server.BaseHTTPRequestHandler):
+
+    # Stand-in for the server's HTTP interface: replies to slim.request with the canned result for the command
+    protocol_version = "HTTP/1.1"  # Keep-alive, as the server
+    results = {"status": {"mode": "play", "power": 1, "playlist_tracks": 2}, "serverstatus": {"player count": 1}}
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if self.path != JSON_RPC_PATH:
+            self.send_response(404)
+            body = b""
+        else:
+            self.send_response(200)
+            self.server.requests.append(request["params"])
+            body = json.dumps({"id": request["id"], "method": "slim.request", "params": request["params"], "result": self.results[request["params"][1][0]]}).encode("utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    http_server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), SlimRequestHandler)
+    http_server.requests = list()
+    thread = threading.Thread(target=http_server.serve_forever, daemon=True)
+    thread.start()
+    yield http_server
+    http_server.shutdown()
+    http_server.server_close()
+
+
+def plugin_globals():
+    return {QUEUES: {RETURNED_RESPONSE: queue.Queue(), COMMAND_TO_SEND: {SERVER_ID: queue.Queue()}}}
+
+
+def test_slim_request_returns_the_structured_result(server):
+    transport = JsonRpcTransport(plugin_globals(), SERVER_ID, "127.0.0.1", server.server_address[1])
+    try:
+        assert transport.slim_request(PLAYER_MAC, ["status", "-", "1", "tags:adg"]) == {"mode": "play", "power": 1, "playlist_tracks": 2}
+        assert server.requests == [[PLAYER_MAC, ["status", "-", "1", "tags:adg"]]]
+    finally:
+        transport.close()
+
+
+def test_batch_results_keep_request_order_over_pooled_connections(server):
+    transport = JsonRpcTransport(plugin_globals(), SERVER_ID, "127.0.0.1", server.server_address[1])
+    try:
+        results = transport.slim_request_batch([(PLAYER_MAC, ["status"]), ("-", ["serverstatus", "0", "0"])] * 5)
+        assert results == [SlimRequestHandler.results["status"], SlimRequestHandler.results["serverstatus"]] * 5
+        assert transport.connection_count <= transport.pool_size
+    finally:
+        transport.close()
+
+
+def test_submitted_result_is_posted_as_json_rpc_result(server):
+    transport_globals = plugin_globals()
+    transport = JsonRpcTransport(transport_globals, SERVER_ID, "127.0.0.1", server.server_address[1])
+    try:
+        transport.submit(PLAYER_MAC, ["status", "-", "1"]).result(timeout=5)
+        assert transport_globals[QUEUES][RETURNED_RESPONSE].get_nowait() == [SERVER_ID, JSON_RPC_RESULT, [PLAYER_MAC, ["status", "-", "1"], SlimRequestHandler.results["status"]]]
+        assert transport_globals[QUEUES][COMMAND_TO_SEND][SERVER_ID].empty()
+    finally:
+        transport.close()
+
+
+def test_failed_submit_falls_back_to_the_cli(server):
+    transport_globals = plugin_globals()
+    port = server.server_address[1]
+    server.shutdown()
+    server.server_close()  # Nothing listening: the request fails to connect
+    transport = JsonRpcTransport(transport_globals, SERVER_ID, "127.0.0.1", port)
+    try:
+        transport.submit(PLAYER_MAC, ["status", "-", "1", "tags:adg"]).result(timeout=5)
+        assert transport_globals[QUEUES][RETURNED_RESPONSE].empty()
+        assert transport_globals[QUEUES][COMMAND_TO_SEND][SERVER_ID].get_nowait() == ["00:04:20:aa:bb:cc status - 1 tags:adg"]
+    finally:
+        transport.close()
@@ -0,0 +1,56 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Squeezebox Controller © Autolog 2023
+#
+
+# noinspection PyUnresolvedReferences
+# ============================== Native Imports ===============================
+import pytest
+
+# ============================== Plugin Imports ===============================
+from lineFraming import LineFramer
+
+
+class ChunkSocket:
+    # Stands in for a connected socket: recv returns the given chunks in turn, then b"" (connection closed)
+    def __init__(self, chunks):
+        self.chunks = list(chunks)
+
+    def recv(self, size):
+        return self.chunks.pop(0) if len(self.chunks) > 0 else b""
+
+
+def test_several_lines_in_one_chunk_are_all_returned():
+    framer = LineFramer()
+    framer.feed(b"00%3A04%3A20%3Aaa%3Abb%3Acc mode play\nsyncgroups\r\nplayers 0 1 count%3A1\n")
+    assert framer.complete_lines() == ["00%3A04%3A20%3Aaa%3Abb%3Acc mode play", "syncgroups", "players 0 1 count%3A1"]
+
+
+def test_partial_line_is_kept_for_the_next_receive():
+    framer = LineFramer(ChunkSocket([b"serversta", b"tus 0 0\nversion", b" ?\n"]))
+    assert framer.read_lines() == ["serverstatus 0 0"]
+    assert framer.read_lines() == ["version ?"]
+
+
+def test_line_split_inside_a_multibyte_character_is_decoded_once_complete():
+    line = "playlist title Café".encode("utf-8")
+    framer = LineFramer(ChunkSocket([line[:-1], line[-1:] + b"\n"]))
+    assert framer.read_lines() == ["playlist title Café"]
+
+
+def test_closed_connection_raises():
+    framer = LineFramer(ChunkSocket([b"no line end"]))
+    with pytest.raises(ConnectionError):
+        framer.read_lines()
+
+
+def test_burst_of_lines_split_across_receives_is_framed_in_order():
+    lines = [f"00%3A04%3A20%3Aaa%3Abb%3Acc time {index}.5" for index in range(20000)]
+    data = ("\n".join(lines) + "\npartial").encode("utf-8")
+    framer = LineFramer(ChunkSocket([data[index:index + 65536] for index in range(0, len(data), 65536)]))
+    received = list()
+    while len(received) < len(lines):
+        received.extend(framer.read_lines())
+    assert received == lines
+    assert bytes(framer.buffer) == b"partial"
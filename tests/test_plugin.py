@@ -0,0 +1,102 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Squeezebox Controller © Autolog 2023
+#
+
+# noinspection PyUnresolvedReferences
+# ============================== Native Imports ===============================
+import logging
+import threading
+import types
+
+import pytest
+
+# The plugin module can only be imported where Indigo (and macOS's AppKit) is available
+pytest.importorskip("indigo")
+pytest.importorskip("AppKit")
+
+# ============================== Plugin Imports ===============================
+from cliEvents import CliEvent
+from commandQueue import CoalescingCommandQueue
+from constants import *
+from handlerContext import HandlerContext
+from plugin import Plugin
+from serverDispatcher import ThreadServerDispatcher
+from stateCache import StateCache
+from stateRecords import PlayerState
+
+SERVER_DEV_ID = 101
+PLAYER_DEV_ID = 201
+PLAYER_MAC = "00:04:20:aa:bb:cc"
+
+
+def fake_plugin(player_started):
+    # Just enough of a Plugin for _handle_player_id when the player device already exists
+    plugin_globals = {QUEUES: {COMMAND_TO_SEND: {SERVER_DEV_ID: CoalescingCommandQueue()}}, PLAYERS: dict()}
+    if player_started:
+        plugin_globals[PLAYERS][PLAYER_DEV_ID] = PlayerState()
+        plugin_globals[PLAYERS][PLAYER_DEV_ID][SERVER_ID] = SERVER_DEV_ID
+    errors = list()
+    return types.SimpleNamespace(globals=plugin_globals,
+                                 logger=logging.getLogger("test"),
+                                 _playerDeviceByAddress=lambda address: types.SimpleNamespace(id=PLAYER_DEV_ID, address=address),
+                                 exception_handler=lambda exception_error, log_failing_statement: errors.append(exception_error),
+                                 errors=errors)
+
+
+@pytest.mark.parametrize("player_started", [True, False])
+def test_player_id_queries_the_player_status_via_its_server(player_started):
+    plugin = fake_plugin(player_started)
+    server = types.SimpleNamespace(id=SERVER_DEV_ID, name="LMS")
+    ctx = HandlerContext(CliEvent("player id 0 00%3A04%3A20%3Aaa%3Abb%3Acc"))
+
+    Plugin._handle_player_id(plugin, ctx, server)
+
+    assert plugin.errors == []
+    assert plugin.globals[QUEUES][COMMAND_TO_SEND][SERVER_DEV_ID].get_nowait() == [f"{PLAYER_MAC} status 0 999 tags:"]
+
+
+def dispatching_plugin(tmp_path, handle):
+    # Just enough of a Plugin for _dispatchReturnedResponse, with handle standing in for _handleReturnedResponse
+    plugin = types.SimpleNamespace(globals={SERVER_LOCKS: dict(), SHARED_STATE_LOCK: threading.Lock(), STATE_CACHE: StateCache(),
+                                            DISPATCH_STATISTICS: None, RESPONSE_QUEUE_SIZE: 10000, RESPONSE_QUEUE_POLICY: "block",
+                                            PLUGIN_PREFS_FOLDER: str(tmp_path)},
+                                   _handleReturnedResponse=handle,
+                                   deviceStatesFlush=lambda: None)
+    plugin._serverLock = lambda serverId: Plugin._serverLock(plugin, serverId)
+    return plugin
+
+
+def test_slow_server_response_does_not_delay_another_server(tmp_path):
+    slow_server_handling = threading.Event()
+    slow_server_released = threading.Event()
+    handled = list()
+
+    def handle(returned_response):
+        if returned_response[0] == SERVER_DEV_ID:
+            slow_server_handling.set()
+            assert slow_server_released.wait(10)  # e.g. a large players reply
+        handled.append(returned_response[0])
+
+    plugin = dispatching_plugin(tmp_path, handle)
+    dispatch = lambda returned_response: Plugin._dispatchReturnedResponse(plugin, returned_response)
+    slowDispatcher = ThreadServerDispatcher(plugin.globals, SERVER_DEV_ID, dispatch)
+    fastDispatcher = ThreadServerDispatcher(plugin.globals, SERVER_DEV_ID + 1, dispatch)
+    slowDispatcher.start()
+    fastDispatcher.start()
+    try:
+        slowDispatcher.put([SERVER_DEV_ID, LISTEN_NOTIFICATION, None])
+        assert slow_server_handling.wait(10)
+        for _ in range(100):
+            fastDispatcher.put([SERVER_DEV_ID + 1, LISTEN_NOTIFICATION, None])
+        fastDispatcher.drain()
+        assert handled == [SERVER_DEV_ID + 1] * 100
+        assert plugin.globals[SERVER_LOCKS][SERVER_DEV_ID].locked()
+        slow_server_released.set()
+        slowDispatcher.drain()
+        assert handled[-1] == SERVER_DEV_ID
+    finally:
+        slow_server_released.set()
+        slowDispatcher.stop()
+        fastDispatcher.stop()
@@ -0,0 +1,50 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Squeezebox Controller © Autolog 2023
+#
+
+# noinspection PyUnresolvedReferences
+# ============================== Native Imports ===============================
+import queue
+
+import pytest
+
+# ============================== Plugin Imports ===============================
+from cliEvents import CliEvent
+from constants import *
+from responseQueue import POLICY_DROP_OLDEST, BoundedResponseQueue
+
+SERVER_ID = 1
+PLAYER = "00%3A04%3A20%3Aaa%3Abb%3Acc"
+
+
+def notification(line):
+    return [SERVER_ID, LISTEN_NOTIFICATION, CliEvent(line)]
+
+
+def drain(response_queue):
+    lines = list()
+    while not response_queue.empty():
+        lines.append(response_queue.get_nowait()[2].line)
+    return lines
+
+
+def test_power_and_mode_notifications_survive_overload():
+    response_queue = BoundedResponseQueue(maxsize=3, policy=POLICY_DROP_OLDEST)
+    response_queue.put(notification(f"{PLAYER} power 1"))
+    response_queue.put(notification(f"{PLAYER} mixer volume 40"))
+    response_queue.put(notification(f"{PLAYER} mode play"))
+    response_queue.put(notification(f"{PLAYER} mixer volume 41"))  # Overload: the older volume is dropped
+    assert drain(response_queue) == [f"{PLAYER} power 1", f"{PLAYER} mode play", f"{PLAYER} mixer volume 41"]
+    assert response_queue.dropped_count == 1
+
+
+def test_full_of_undroppable_notifications_waits_rather_than_drops():
+    response_queue = BoundedResponseQueue(maxsize=2, policy=POLICY_DROP_OLDEST)
+    response_queue.put(notification(f"{PLAYER} power 1"))
+    response_queue.put(notification(f"{PLAYER} mode stop"))
+    with pytest.raises(queue.Full):
+        response_queue.put(notification(f"{PLAYER} time 12.5"), timeout=0.01)
+    assert drain(response_queue) == [f"{PLAYER} power 1", f"{PLAYER} mode stop"]
+    assert response_queue.dropped_count == 0
@@ -0,0 +1,26 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Squeezebox Controller © Autolog 2023
+#
+
+# noinspection PyUnresolvedReferences
+# ============================== Plugin Imports ===============================
+from serverConnections import ServerConnections
+
+SERVER_DEV_ID = 101
+
+
+def test_one_lost_and_one_reconnected_per_outage():
+    server_connections = ServerConnections()
+    assert server_connections.lost(SERVER_DEV_ID, "commands")
+    assert not server_connections.lost(SERVER_DEV_ID, "listen")
+    assert not server_connections.lost(SERVER_DEV_ID, "commands")  # A failed reconnection attempt
+    assert not server_connections.restored(SERVER_DEV_ID, "commands")  # Listen connection still down
+    assert server_connections.restored(SERVER_DEV_ID, "listen")
+    assert server_connections.lost(SERVER_DEV_ID, "listen")  # The next outage
+
+
+def test_restored_without_outage_posts_nothing():
+    server_connections = ServerConnections()
+    assert not server_connections.restored(SERVER_DEV_ID, "commands")
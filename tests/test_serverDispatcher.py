@@ -0,0 +1,58 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Squeezebox Controller © Autolog 2023
+#
+
+# noinspection PyUnresolvedReferences
+# ============================== Native Imports ===============================
+import threading
+import time
+
+# ============================== Plugin Imports ===============================
+from constants import *
+from serverDispatcher import ThreadServerDispatcher
+
+SLOW_SERVER_ID = 101
+FAST_SERVER_ID = 102
+RESPONSE_COUNT = 2000
+
+
+def dispatcher_globals(tmp_path):
+    return {RESPONSE_QUEUE_SIZE: 10000, RESPONSE_QUEUE_POLICY: "block", PLUGIN_PREFS_FOLDER: str(tmp_path)}
+
+
+def test_slow_server_does_not_delay_another(tmp_path):
+    # The slow server's first response takes until released (e.g. a large players reply or a cover art download);
+    # meanwhile a burst of responses from the other server is handled in full.
+    server_locks = dict()
+    slow_server_released = threading.Event()
+    handled = {SLOW_SERVER_ID: list(), FAST_SERVER_ID: list()}
+
+    def dispatch(returned_response):
+        with server_locks.setdefault(returned_response[0], threading.Lock()):  # As Plugin._dispatchReturnedResponse
+            if returned_response[0] == SLOW_SERVER_ID and returned_response[2] == 0:
+                assert slow_server_released.wait(10)
+            handled[returned_response[0]].append(returned_response[2])
+
+    dispatchers = {server_id: ThreadServerDispatcher(dispatcher_globals(tmp_path), server_id, dispatch) for server_id in handled}
+    for dispatcher in dispatchers.values():
+        dispatcher.start()
+    try:
+        for sequence in range(RESPONSE_COUNT):
+            dispatchers[SLOW_SERVER_ID].put([SLOW_SERVER_ID, LISTEN_NOTIFICATION, sequence])
+            dispatchers[FAST_SERVER_ID].put([FAST_SERVER_ID, LISTEN_NOTIFICATION, sequence])
+
+        start_time = time.monotonic()
+        dispatchers[FAST_SERVER_ID].drain()
+        assert time.monotonic() - start_time < 5.0
+        assert handled[FAST_SERVER_ID] == list(range(RESPONSE_COUNT))
+        assert handled[SLOW_SERVER_ID] == []  # Still handling its first response
+
+        slow_server_released.set()
+        dispatchers[SLOW_SERVER_ID].drain()
+        assert handled[SLOW_SERVER_ID] == list(range(RESPONSE_COUNT))  # In the order received
+    finally:
+        slow_server_released.set()
+        for dispatcher in dispatchers.values():
+            dispatcher.stop()
@@ -0,0 +1,66 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Squeezebox Controller © Autolog 2023
+#
+
+# noinspection PyUnresolvedReferences
+# ============================== Native Imports ===============================
+
+# ============================== Plugin Imports ===============================
+from stateCache import StateCache
+
+DEV_ID = 1
+
+
+class Device:
+
+    # Stand-in for an indigo device: just what the cache reads
+    def __init__(self, states, image="PowerOff"):
+        self.id = DEV_ID
+        self.states = states
+        self.displayStateImageSel = image
+
+
+def test_unchanged_writes_are_suppressed_and_counted():
+    cache = StateCache()
+    assert cache.state_changed(DEV_ID, "volume", "40")
+    cache.states_written(DEV_ID, [{"key": "volume", "value": "40"}])
+    for _ in range(3):
+        assert not cache.state_changed(DEV_ID, "volume", "40")
+    assert cache.state_changed(DEV_ID, "volume", "41")
+    assert (cache.written_count, cache.suppressed_count) == (1, 3)
+
+
+def test_a_value_is_only_cached_once_written():
+    cache = StateCache()
+    assert cache.state_changed(DEV_ID, "power", "1")
+    # The write failed (states_written not called), so the value is written again next time
+    assert cache.state_changed(DEV_ID, "power", "1")
+    assert cache.image_changed(DEV_ID, "PowerOn")
+    assert cache.image_changed(DEV_ID, "PowerOn")
+    assert (cache.written_count, cache.suppressed_count) == (0, 0)
+
+
+def test_uncached_states_are_compared_with_the_device():
+    cache = StateCache()
+    dev = Device({"volume": "40", "mode": "stop"})
+    assert not cache.state_changed(dev, "volume", "40")
+    assert cache.state_changed(dev, "mode", "play")
+    assert cache.state_changed(dev, "title", "")  # Not a state of the device
+    assert cache.changed_states(dev, [{"key": "volume", "value": "40"}, {"key": "mode", "value": "play"}]) == [{"key": "mode", "value": "play"}]
+    assert not cache.image_changed(dev, "PowerOff")
+    assert cache.image_changed(dev, "PowerOn")
+    assert cache.suppressed_count == 3
+
+
+def test_written_values_take_precedence_over_a_stale_device():
+    cache = StateCache()
+    dev = Device({"volume": "40"})
+    cache.states_written(DEV_ID, [{"key": "volume", "value": "50"}])
+    cache.image_written(DEV_ID, "PowerOn")
+    assert cache.state_changed(dev, "volume", "40")
+    assert not cache.state_changed(dev, "volume", "50")
+    assert not cache.image_changed(dev, "PowerOn")
+    cache.forget(DEV_ID)
+    assert not cache.state_changed(dev, "volume", "40")
@@ -0,0 +1,63 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Squeezebox Controller © Autolog 2023
+#
+
+# noinspection PyUnresolvedReferences
+# ============================== Native Imports ===============================
+import tracemalloc
+
+import pytest
+
+# ============================== Plugin Imports ===============================
+from constants import *
+from stateRecords import PLAYER_FIELDS, PlayerState, ServerState
+
+PLAYER_COUNT = 500
+
+
+def test_records_are_complete_and_reject_unknown_keys():
+    player = PlayerState()
+    assert player[POWER_UI] == "disconnected"
+    assert player.power_ui == "disconnected"
+    with pytest.raises(KeyError):
+        player[HTTP_PORT] = "9000"  # A server field
+    with pytest.raises(KeyError):
+        player[HTTP_PORT]
+    assert player.get(HTTP_PORT, "?") == "?"
+    assert HTTP_PORT in ServerState() and HTTP_PORT not in player
+
+
+def test_mutable_defaults_and_snapshots_are_not_shared():
+    first, second = PlayerState(), PlayerState()
+    first[SLAVE_PLAYER_IDS].append(2)
+    assert second[SLAVE_PLAYER_IDS] == []
+    snapshot = first.snapshot()
+    first[SLAVE_PLAYER_IDS].append(3)
+    assert snapshot["slave_player_ids"] == [2]
+    server = ServerState()
+    server[RESYNC_PLAYER_IDS].add(1)
+    assert ServerState()[RESYNC_PLAYER_IDS] == set()
+
+
+def allocated(factory):
+    tracemalloc.start()
+    try:
+        records = [factory() for _ in range(PLAYER_COUNT)]
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert len(records) == PLAYER_COUNT
+    return size
+
+
+def test_many_players_take_less_memory_than_dicts():
+    # The same fields held as a dict per player, as before the records were introduced
+    def player_dict():
+        return {key: default() if default in (list, set) else default for key, _, default in PLAYER_FIELDS}
+
+    record_size = allocated(PlayerState)
+    dict_size = allocated(player_dict)
+    assert record_size < dict_size / 2  # Measured at about a quarter
+    assert record_size / PLAYER_COUNT < 1024  # Bytes per player